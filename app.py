@@ -11,7 +11,9 @@ import googleapiclient.discovery
 import requests
 import os
 import json
+import numpy as np
 import pandas as pd
+import random
 import re
 from html import unescape
 from urllib.parse import unquote
@@ -20,12 +22,21 @@ from dotenv import load_dotenv
 from typing import Any, Dict, List, Tuple
 from qa_module import handle_question, generate_unique_id
 import base64
+import csv
+import decimal
+import io
+import threading
+import time
+import types
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+import orjson
+from flask.json.provider import JSONProvider
 from db_manager import DBManager
 from file_engine import file_engine
 from google.analytics.data_v1beta import BetaAnalyticsDataClient
 from google.analytics.data_v1beta.types import RunReportRequest, DateRange, Dimension, Metric
 DBManager.init_db()
-import math
 from semantic_matcher import SemanticMatcher
 from ga4_metadata import GA4_METRICS, GA4_DIMENSIONS
 from marketing_intelligence import MarketingIntelligenceEngine, SIGNAL_TYPES
@@ -38,11 +49,21 @@ semantic.build_dimension_index(GA4_DIMENSIONS)
 marketing_engine = MarketingIntelligenceEngine()
 
 
+_TRUTHY_STRINGS = frozenset({"1", "true", "yes", "on", "y"})
+
+
 def _env_bool(name: str, default: bool = False) -> bool:
     value = os.getenv(name)
     if value is None:
         return default
-    return str(value).strip().lower() in {"1", "true", "yes", "on", "y"}
+    return str(value).strip().lower() in _TRUTHY_STRINGS
+
+
+def _is_true_flag(value) -> bool:
+    """요청 JSON 플래그 판정: True 또는 명시적 참 문자열만 인정 ("false"/"0" 등은 False)"""
+    if isinstance(value, str):
+        return value.strip().lower() in _TRUTHY_STRINGS
+    return value is True
 
 
 def _load_google_web_creds() -> dict:
@@ -80,14 +101,40 @@ def _require_admin_token() -> bool:
         return provided == expected
     return False
 
-def sanitize(obj):
-    if isinstance(obj, float) and (math.isnan(obj) or math.isinf(obj)):
+def _orjson_default(obj):
+    """orjson이 기본 지원하지 않는 타입 직렬화 (Decimal, Markup, pandas/numpy 스칼라 등).
+    그 외 타입은 Flask 기본 provider처럼 TypeError (문자열로 조용히 바꾸지 않음)"""
+    if hasattr(obj, "__html__"):
+        return str(obj.__html__())
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    # pd.NaT / pd.NA / np.datetime64("NaT") 등 결측 스칼라는 null
+    if pd.api.types.is_scalar(obj) and pd.isna(obj):
         return None
-    if isinstance(obj, dict):
-        return {k: sanitize(v) for k, v in obj.items()}
-    if isinstance(obj, list):
-        return [sanitize(v) for v in obj]
-    return obj
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class ORJSONProvider(JSONProvider):
+    """
+    Flask JSON provider backed by orjson.
+    NaN/inf는 null로, numpy 배열/스칼라는 네이티브로 직렬화한다.
+    """
+    option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=_orjson_default, option=self.option).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        # object_hook 등 옵션이 필요한 호출(세션 TaggedJSONSerializer)은 표준 json으로 처리
+        if kwargs:
+            return json.loads(s, **kwargs)
+        return orjson.loads(s)
 
 
 def _is_negative_feedback_text(text: str) -> bool:
@@ -3238,6 +3285,7 @@ def _build_jandi_export_payload(title: str, html_content: str) -> Dict[str, Any]
     }
 
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 app.wsgi_app = ProxyFix(app.wsgi_app, x_for=1, x_proto=1, x_host=1)
 flask_env = os.getenv("FLASK_ENV", "development").lower()
 secret_key = os.getenv("FLASK_SECRET_KEY", "").strip()
@@ -3249,8 +3297,15 @@ app.config["SESSION_COOKIE_SECURE"] = _env_bool("SESSION_COOKIE_SECURE", flask_e
 app.config["SESSION_COOKIE_SAMESITE"] = os.getenv("SESSION_COOKIE_SAMESITE", "Lax")
 app.config["PERMANENT_SESSION_LIFETIME"] = timedelta(hours=int(os.getenv("SESSION_LIFETIME_HOURS", "24")))
 app.config["MAX_CONTENT_LENGTH"] = int(os.getenv("MAX_CONTENT_LENGTH_MB", "50")) * 1024 * 1024
+# static/ 파일명에 해시가 없으므로 1년 캐시 대신 환경변수로 조정 가능한 기본값 사용
+app.config["SEND_FILE_MAX_AGE_DEFAULT"] = int(os.getenv("STATIC_MAX_AGE_SECONDS", "3600"))
 UPLOAD_FOLDER = os.getenv("UPLOAD_FOLDER", "uploaded_files")
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+_UPLOAD_DIR = os.path.join(BASE_DIR, UPLOAD_FOLDER)
+
+# conversations 레코드 생성은 응답/라우팅에 쓰이지 않으므로 요청 경로 밖에서 처리한다.
+# 컨텍스트(conversation_context)는 다음 요청이 곧바로 읽어 라우팅하므로 반드시 동기로 저장할 것.
+writer_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+os.makedirs(_UPLOAD_DIR, exist_ok=True)
 try:
     retention_days = int(os.getenv("LEARNING_RETENTION_DAYS", "180"))
     deleted = DBManager.prune_old_interactions(retention_days=max(1, retention_days))
@@ -3282,7 +3337,7 @@ def upload_file():
         return jsonify({"error": "No selected file"}), 400
 
     filename = secure_filename(file.filename)
-    filepath = os.path.join(UPLOAD_FOLDER, filename)
+    filepath = os.path.join(_UPLOAD_DIR, filename)
     file.save(filepath)
     session['uploaded_file_path'] = filepath  # 세션에 저장
     selected = session.get('selected_datasets') or []
@@ -3345,7 +3400,8 @@ def fetch_properties(analytics, account_id):
 @app.route("/")
 def index():
     app.logger.info("Serving index page.")
-    return send_from_directory('static', 'index.html')
+    # ETag/Last-Modified 조건부 응답(304) + 짧은 캐시로 로그인 리다이렉트마다 재전송하지 않음
+    return send_from_directory('static', 'index.html', conditional=True, etag=True, max_age=300)
 
 @app.route("/login")
 def login():
@@ -3415,18 +3471,25 @@ def callback():
     if 'conversation_id' not in session:
         import uuid
         session['conversation_id'] = str(uuid.uuid4())
-        # DB에 초기 레코드 생성
-        from db_manager import DBManager
-        DBManager.save_conversation_record(
-            session['conversation_id'], 
-            session['user_id'], 
-            session.get("property_id"), 
+        # DB에 초기 레코드 생성 (컨텍스트는 동기 저장)
+        writer_pool.submit(DBManager.save_conversation_record, session['conversation_id'], session['user_id'])
+        _save_initial_context(
+            session['conversation_id'],
+            session.get("property_id"),
             session.get("preprocessed_data_path") or session.get("uploaded_file_path")
         )
 
     app.logger.info(f"User {session['user_id']} logged in. Session: {session['conversation_id']}")
     return redirect(url_for("index"))
 
+def _save_initial_context(conversation_id, property_id, file_path):
+    """save_conversation_record가 하던 초기 컨텍스트 저장을 요청 경로에서 동기로 수행"""
+    if property_id or file_path:
+        DBManager.save_conversation_context(conversation_id, {
+            "property_id": property_id,
+            "file_path": file_path
+        })
+
 def ensure_new_conversation():
     """데이터 구성이 바뀌면 새 대화 세션 발급"""
     import uuid
@@ -3456,7 +3519,8 @@ def ensure_new_conversation():
     property_id = session.get("property_id")
     file_path = session.get("preprocessed_data_path") or session.get("uploaded_file_path")
     
-    DBManager.save_conversation_record(new_id, session.get('user_id'), property_id, file_path)
+    writer_pool.submit(DBManager.save_conversation_record, new_id, session.get('user_id'))
+    _save_initial_context(new_id, property_id, file_path)
     app.logger.info(f"Conversation rotated: {old_id} -> {new_id}")
 
 
@@ -4302,21 +4366,25 @@ def autocomplete():
     suggestions = get_suggestions(query)
     return jsonify(suggestions)
 
+ALL_QUESTIONS = [
+    "총 사용자 수가 얼마나 되나요?",
+    "활성 사용자는 얼마인가요?",
+    "사용자는 얼마나 들어오나요?",
+    "페이지뷰가 얼마나 되나요?",
+    "조회수는 얼마나 되나요?",
+    "평균 세션시간은 어떻게 되나요?",
+    "이탈률이 어떻게 되나요?",
+    "가장 인기 있는 페이지는 무엇인가요?",
+    "신규 사용자가 몇 명인가요?",
+    "가장 많은 트래픽을 보내는 소스는 무엇인가요?",
+    "디바이스별 사용자 수는 얼마나 되나요?"
+]
+# 후보 질문은 import 시 한 번만 소문자화
+ALL_QUESTIONS_LC = [(q.lower(), q) for q in ALL_QUESTIONS]
+
 def get_suggestions(query):
-    all_questions = [
-        "총 사용자 수가 얼마나 되나요?",
-        "활성 사용자는 얼마인가요?",
-        "사용자는 얼마나 들어오나요?",
-        "페이지뷰가 얼마나 되나요?",
-        "조회수는 얼마나 되나요?",
-        "평균 세션시간은 어떻게 되나요?",
-        "이탈률이 어떻게 되나요?",
-        "가장 인기 있는 페이지는 무엇인가요?",
-        "신규 사용자가 몇 명인가요?",
-        "가장 많은 트래픽을 보내는 소스는 무엇인가요?",
-        "디바이스별 사용자 수는 얼마나 되나요?"
-    ]
-    return [q for q in all_questions if query.lower() in q.lower()]
+    q_lc = query.lower()
+    return [q for lc, q in ALL_QUESTIONS_LC if q_lc in lc]
 
 #GET요청용 API엔드포인트이다. 브라우저나 프론트에서 GET요청을 보내면 이 함수가 실행된다.
 @app.route("/traffic")
@@ -4339,9 +4407,7 @@ def traffic():
             semantic=semantic
         )
 
-
-        # [P0] Sanitize
-        return jsonify(sanitize(response))
+        return jsonify(response)
     except Exception as e:
         logging.error(f"Error occurred: {e}")
         return jsonify({"error": f"Failed to process traffic request: {e}"}), 500
@@ -4374,17 +4440,9 @@ def visualize():
             if last_response['response'].get("status") == "clarify":
                 return jsonify({"error": "Clarify 상태에서는 시각화할 수 없습니다."}), 400
 
-        # [Fix] Sanitize before sanitize
-        data = sanitize(data)
-        
-        # Ensure list wrapping if dict (for client compatibility if needed, safely)
-        # If client expects list, wrap it. ApexCharts often handles both but list is safer for series.
-        # But 'data' here might be the full config object or just series?
-        # Usually it's the full config {type:..., labels:..., series:...}
-        # If it's a dict, sanitize is done.
-        
         logging.debug(f"[Visualize] Data: {str(data)[:200]}...") # Log summary
-        plot_data = base64.b64encode(json.dumps(data).encode()).decode()
+        # app.json(orjson)이 NaN/inf -> null 변환을 처리한다.
+        plot_data = base64.b64encode(app.json.dumps(data).encode()).decode()
         return jsonify({"plot_data": plot_data})
     except Exception as e:
         logging.error(f"Error occurred: {e}")
@@ -4392,13 +4450,22 @@ def visualize():
 
 
 
+def _read_csv(src):
+    """업로드/전처리 CSV 파싱. 타입 추론을 pandas 기본(C) 파서에 그대로 맡긴다.
+
+    pyarrow 파서는 20자리 ID를 float로, 0x10을 16으로 바꾸는 등 값 자체가 달라지므로 쓰지 않는다.
+    반복 파싱 비용은 _load_preprocessed_json 캐시가 줄인다.
+    """
+    return pd.read_csv(src)
+
+
 @app.route("/upload_data", methods=["POST"])
 def upload_data():
     file = request.files['file']
     if not file:
         return jsonify({"error": "No file uploaded"}), 400
 
-    df = pd.read_csv(file)
+    df = _read_csv(file)
     session['uploaded_data'] = df.to_dict(orient='records')
     return jsonify({"success": True, "data": df.head().to_dict(orient='records')})
 @app.route('/preprocess_data_preview', methods=['POST'])
@@ -4413,7 +4480,7 @@ def preprocess_data_preview():
         if file_path.endswith('.xlsx'):
             df = pd.read_excel(file_path)
         elif file_path.endswith('.csv'):
-            df = pd.read_csv(file_path)
+            df = _read_csv(file_path)
         else:
             return jsonify({"error": "Unsupported file type"}), 400
 
@@ -4429,7 +4496,9 @@ def preprocess_data_preview():
                 else:
                     return jsonify({"error": "'old_name' and 'new_name' are required for renaming columns"}), 400
             elif action['type'] == 'filter_rows':
-                df = df[df[action['column']].astype(str).str.contains(action['value'], na=False)]
+                # 기본은 단순 부분 문자열 매칭, action에 regex=true가 있을 때만 정규식으로 처리
+                use_regex = _is_true_flag(action.get('regex', False))
+                df = df[df[action['column']].astype(str).str.contains(action['value'], na=False, regex=use_regex)]
 
         df.fillna('', inplace=True)
         columns = df.columns.tolist()
@@ -4452,7 +4521,7 @@ def preprocess_data():
         if file_path.endswith('.xlsx'):
             df = pd.read_excel(file_path)
         elif file_path.endswith('.csv'):
-            df = pd.read_csv(file_path)
+            df = _read_csv(file_path)
         else:
             return jsonify({"error": "Unsupported file type"}), 400
 
@@ -4465,14 +4534,16 @@ def preprocess_data():
                 else:
                     return jsonify({"error": "'old_name' and 'new_name' are required for renaming columns"}), 400
             elif action['type'] == 'filter_rows':
-                df = df[df[action['column']].astype(str).str.contains(action['value'], na=False)]
+                # 기본은 단순 부분 문자열 매칭, action에 regex=true가 있을 때만 정규식으로 처리
+                use_regex = _is_true_flag(action.get('regex', False))
+                df = df[df[action['column']].astype(str).str.contains(action['value'], na=False, regex=use_regex)]
 
         df.fillna('', inplace=True)
         columns = df.columns.tolist()
         data = df.to_dict(orient='records')
 
         # 전처리된 데이터를 파일에 저장하고 파일 경로를 세션에 저장
-        preprocessed_file_path = os.path.join(UPLOAD_FOLDER, f'preprocessed_{generate_unique_id()}.csv')
+        preprocessed_file_path = os.path.join(_UPLOAD_DIR, f'preprocessed_{generate_unique_id()}.csv')
         df.to_csv(preprocessed_file_path, index=False)
         # [Fix] Key Consistency: Use 'preprocessed_data_path'
         session['preprocessed_data_path'] = preprocessed_file_path
@@ -4496,7 +4567,7 @@ def save_preprocessed_data():
     if not data:
         return jsonify({"error": "No data to save"}), 400
 
-    preprocessed_file_path = os.path.join(UPLOAD_FOLDER, f'{dataset_name}.csv')
+    preprocessed_file_path = os.path.join(_UPLOAD_DIR, f'{dataset_name}.csv')
 
     try:
         df = pd.DataFrame(data)
@@ -4527,7 +4598,7 @@ def list_datasets():
                     datasets.append({'type': 'GA4', 'name': f"{account['displayName']} - {prop['displayName']}", 'id': prop['name'].split('/')[1]})
 
         # 업로드한 파일 목록 추가
-        uploaded_files = [f for f in os.listdir(UPLOAD_FOLDER) if os.path.isfile(os.path.join(UPLOAD_FOLDER, f))]
+        uploaded_files = [f for f in os.listdir(_UPLOAD_DIR) if os.path.isfile(os.path.join(_UPLOAD_DIR, f))]
         for file in uploaded_files:
             datasets.append({'type': 'File', 'name': file, 'id': file})
 
@@ -4595,7 +4666,7 @@ def get_uploaded_data():
         if file_path.endswith('.xlsx'):
             df = pd.read_excel(file_path)
         elif file_path.endswith('.csv'):
-            df = pd.read_csv(file_path)
+            df = _read_csv(file_path)
         else:
             return jsonify({"error": "Unsupported file type"}), 400
 
@@ -4607,6 +4678,17 @@ def get_uploaded_data():
         logging.error(f"Error reading uploaded data: {e}", exc_info=True)
         return jsonify({"error": str(e)}), 500
 
+@lru_cache(maxsize=4)
+def _load_preprocessed_json(dataset_path: str, mtime: float) -> bytes:
+    """(경로, mtime) 단위로 {"data": records} 응답 본문(JSON bytes)을 캐시. 파일이 바뀌면 mtime이 달라져 다시 읽는다.
+    record dict 목록 대신 직렬화된 bytes를 보관해 캐시 메모리와 요청마다의 재직렬화를 줄인다."""
+    df = _read_csv(dataset_path)
+    df = df.where(pd.notnull(df), None)  # NaN -> None
+    return orjson.dumps(
+        {"data": df.to_dict(orient="records")}, default=_orjson_default, option=ORJSONProvider.option
+    ) + b"\n"
+
+
 @app.route('/get_preprocessed_data', methods=['GET'])
 def get_preprocessed_data():
     dataset_name = request.args.get('dataset_name')
@@ -4616,14 +4698,12 @@ def get_preprocessed_data():
 
     try:
         dataset_name = unquote(dataset_name)
-        dataset_path = os.path.join(UPLOAD_FOLDER, dataset_name)
+        dataset_path = os.path.join(_UPLOAD_DIR, dataset_name)
 
         if not os.path.isfile(dataset_path):
             return jsonify({'error': 'Dataset not found'}), 404
 
-        df = pd.read_csv(dataset_path)
-        df = df.where(pd.notnull(df), None)  # NaN -> None
-        data = df.to_dict(orient="records")
+        body = _load_preprocessed_json(dataset_path, os.path.getmtime(dataset_path))
 
         # ✅ 세션에 파일 경로 저장
         old_path = session.get('preprocessed_data_path')
@@ -4644,7 +4724,7 @@ def get_preprocessed_data():
             "file_path": dataset_path
         })
 
-        return jsonify({'data': data})
+        return Response(body, mimetype="application/json")
 
     except Exception as e:
         app.logger.error(f'Unexpected error: {e}')
@@ -5190,13 +5270,14 @@ def ask_question():
         session["last_response"] = response
         session["last_intent_model"] = intent_model
 
-        # [P0] Sanitize Response (NaN -> None)
-        sanitized_response = sanitize(response)
+        # NaN -> null 변환은 app.json(orjson)이 처리한다.
+        # 세션에 저장된 last_response가 변형되지 않도록 보강 대상 dict만 복사한다.
+        response_payload = dict(response) if isinstance(response, dict) else response
         # 응답에 데이터 소스 라벨 보강 (복수 연결 시에도 어떤 소스를 썼는지 표시)
         try:
-            if isinstance(sanitized_response, dict) and isinstance(sanitized_response.get("response"), dict):
-                body = sanitized_response["response"]
-                r = str(sanitized_response.get("route") or "").lower()
+            if isinstance(response_payload, dict) and isinstance(response_payload.get("response"), dict):
+                body = dict(response_payload["response"])
+                r = str(response_payload.get("route") or "").lower()
                 if not body.get("data_label"):
                     if r == "file":
                         fp = file_path or session.get("preprocessed_data_path") or session.get("uploaded_file_path")
@@ -5213,13 +5294,13 @@ def ask_question():
                     period_from_state = str(((analysis_state or {}).get("period") or {}).get("current") or "").strip()
                     if period_from_state:
                         body["period"] = period_from_state
-                sanitized_response["response"] = body
+                response_payload["response"] = body
         except Exception:
             pass
-        if isinstance(sanitized_response, dict):
-            sanitized_response["interaction_id"] = interaction_id
-            sanitized_response["intent_model"] = intent_model
-        return jsonify(sanitized_response)
+        if isinstance(response_payload, dict):
+            response_payload["interaction_id"] = interaction_id
+            response_payload["intent_model"] = intent_model
+        return jsonify(response_payload)
 
     except Exception as e:
         logging.error(f"Error processing question: {e}", exc_info=True)
@@ -5965,6 +6046,101 @@ def admin_prune_learning_data():
         return jsonify({"error": str(e)}), 500
 
 # [PHASE 2] Block Editing API
+# 블록 편집 LLM 호출 동시성 상한 (스레드 워커 간 공유)
+_EDIT_LLM_SEMAPHORE = threading.BoundedSemaphore(int(os.getenv("EDIT_LLM_MAX_CONCURRENCY", "20")))
+_EDIT_LLM_TIMEOUT = 30
+_EDIT_LLM_MAX_RETRIES = 2
+_EDIT_LLM_BACKOFF_BASE = 0.5
+_EDIT_LLM_BACKOFF_MAX = 8.0
+
+
+def _edit_llm_backoff(attempt):
+    """재시도 전 지수 백오프 + full jitter 대기 (429 상황에서 동시 재시도가 몰리지 않도록).
+    호출부의 except 블록은 `with _EDIT_LLM_SEMAPHORE` 밖이라 슬롯을 반납한 뒤에 대기한다."""
+    time.sleep(random.uniform(0, min(_EDIT_LLM_BACKOFF_MAX, _EDIT_LLM_BACKOFF_BASE * (2 ** attempt))))
+
+
+def _edit_chat_completion(messages, temperature):
+    """블록 편집용 ChatCompletion 호출 (세마포어로 동시 호출 제한 + 타임아웃/재시도로 tail latency 제한)"""
+    import openai
+    attempt = 0
+    while True:
+        try:
+            with _EDIT_LLM_SEMAPHORE:
+                return openai.ChatCompletion.create(
+                    model="gpt-4o-mini",
+                    messages=messages,
+                    temperature=temperature,
+                    request_timeout=_EDIT_LLM_TIMEOUT
+                )
+        except (openai.error.Timeout, openai.error.APIConnectionError, openai.error.RateLimitError) as e:
+            attempt += 1
+            if attempt > _EDIT_LLM_MAX_RETRIES:
+                raise
+            logging.warning(f"[edit_block] LLM retry {attempt}/{_EDIT_LLM_MAX_RETRIES}: {e}")
+            _edit_llm_backoff(attempt)
+
+
+_STREAM_PREFIX_CHECK_CHARS = 64
+
+
+def _edit_chat_stream(messages, temperature, is_valid_prefix):
+    """
+    스트리밍 ChatCompletion 호출. 응답 앞부분(_STREAM_PREFIX_CHECK_CHARS)이 기대 형식이 아니면
+    즉시 스트림을 닫아 남은 출력 토큰 비용/대기 시간을 줄인다.
+    """
+    import openai
+    attempt = 0
+    while True:
+        try:
+            with _EDIT_LLM_SEMAPHORE:
+                stream = openai.ChatCompletion.create(
+                    model="gpt-4o-mini",
+                    messages=messages,
+                    temperature=temperature,
+                    request_timeout=_EDIT_LLM_TIMEOUT,
+                    stream=True
+                )
+                parts = []
+                size = 0
+                checked = False
+                try:
+                    for chunk in stream:
+                        choice = chunk["choices"][0]
+                        piece = choice.get("delta", {}).get("content")
+                        if piece:
+                            parts.append(piece)
+                            size += len(piece)
+                            if not checked and size >= _STREAM_PREFIX_CHECK_CHARS:
+                                checked = True
+                                if not is_valid_prefix("".join(parts)):
+                                    raise ValueError("LLM output does not match the expected format (aborted)")
+                        if choice.get("finish_reason"):
+                            break
+                finally:
+                    stream.close()
+
+                text = "".join(parts)
+                if not checked and not is_valid_prefix(text):
+                    raise ValueError("LLM output does not match the expected format")
+                return text
+        except (openai.error.Timeout, openai.error.APIConnectionError, openai.error.RateLimitError) as e:
+            attempt += 1
+            if attempt > _EDIT_LLM_MAX_RETRIES:
+                raise
+            logging.warning(f"[edit_report] LLM stream retry {attempt}/{_EDIT_LLM_MAX_RETRIES}: {e}")
+            _edit_llm_backoff(attempt)
+
+
+# 블록 편집 모드별 프롬프트 (요청마다 재생성하지 않도록 모듈 상수로 유지)
+MODE_PROMPTS = types.MappingProxyType({
+    "concise": "다음 텍스트를 간결하게 재작성하세요. 핵심만 남기고 불필요한 문장은 제거하세요. 2-3줄 이내로 작성하세요.",
+    "executive": "다음 텍스트를 임원 보고용으로 재작성하세요. 비즈니스 임팩트와 핵심 수치를 강조하세요. 전문적이고 간결하게 작성하세요.",
+    "marketing": "다음 텍스트를 마케팅 자료용으로 재작성하세요. 긍정적이고 설득력 있게 작성하세요. 성과를 강조하세요.",
+    "data-focused": "다음 텍스트를 데이터 중심으로 재작성하세요. 구체적인 수치와 통계를 강조하세요. 객관적으로 작성하세요."
+})
+
+
 @app.route('/edit_block', methods=['POST'])
 def edit_block():
     """Edit a report block using AI with different modes"""
@@ -5976,20 +6152,10 @@ def edit_block():
         if not text:
             return jsonify({"error": "Text is required"}), 400
         
-        # Define mode-specific prompts
-        mode_prompts = {
-            "concise": "다음 텍스트를 간결하게 재작성하세요. 핵심만 남기고 불필요한 문장은 제거하세요. 2-3줄 이내로 작성하세요.",
-            "executive": "다음 텍스트를 임원 보고용으로 재작성하세요. 비즈니스 임팩트와 핵심 수치를 강조하세요. 전문적이고 간결하게 작성하세요.",
-            "marketing": "다음 텍스트를 마케팅 자료용으로 재작성하세요. 긍정적이고 설득력 있게 작성하세요. 성과를 강조하세요.",
-            "data-focused": "다음 텍스트를 데이터 중심으로 재작성하세요. 구체적인 수치와 통계를 강조하세요. 객관적으로 작성하세요."
-        }
-        
-        prompt = mode_prompts.get(mode, mode_prompts["concise"])
+        prompt = MODE_PROMPTS.get(mode, MODE_PROMPTS["concise"])
         
         # Call LLM
-        import openai
-        res = openai.ChatCompletion.create(
-            model="gpt-4o-mini",
+        res = _edit_chat_completion(
             messages=[
                 {"role": "system", "content": "You are a professional content editor. Follow the instructions precisely."},
                 {"role": "user", "content": f"{prompt}\n\n원본 텍스트:\n{text}"}
@@ -6013,14 +6179,115 @@ def edit_block():
 
 
 # [PHASE 3] Report-level Editing API
+_TOON_HEADER_RE = re.compile(r"^\s*blocks\[\d+\]\{id,html\}:\s*$", re.M)
+_HTML_COMMENT_RE = re.compile(r"<!--.*?-->", re.S)
+_HTML_MULTISPACE_RE = re.compile(r"[ \t\n\r]+")
+_HTML_PREFORMATTED_RE = re.compile(r"<(?:pre|textarea)\b", re.I)
+# script/style 본문은 // 주석, white-space: pre* 규칙 등 공백·주석 축약이 의미를 바꿀 수 있음
+_HTML_RAW_TEXT_RE = re.compile(r"<(?:script|style)\b", re.I)
+
+
+def _compress_html(s):
+    """LLM 입력용 html 축약: 주석 제거 + 공백 런을 공백 1개로 축소 (렌더링 결과는 동일)"""
+    if not s or _HTML_RAW_TEXT_RE.search(s):
+        return s
+    s = _HTML_COMMENT_RE.sub("", s)
+    # pre/textarea는 공백이 의미를 가지므로 주석만 제거
+    if _HTML_PREFORMATTED_RE.search(s):
+        return s
+    return _HTML_MULTISPACE_RE.sub(" ", s).strip()
+
+
+def _toon_encode(blocks):
+    """id/html 블록 배열을 TOON 표 형식으로 인코딩 (키 반복 없이 헤더 1줄 + CSV 행)"""
+    buf = io.StringIO()
+    buf.write(f"blocks[{len(blocks)}]{{id,html}}:\n")
+    writer = csv.writer(buf, lineterminator="\n")
+    for b in blocks:
+        writer.writerow([b["id"], b["html"]])
+    return buf.getvalue()
+
+
+def _toon_decode(text):
+    """TOON 표 형식 응답을 [{"id", "html"}] 로 디코딩. 헤더가 없고 JSON 배열이면 JSON으로 처리"""
+    m = _TOON_HEADER_RE.search(text)
+    if not m:
+        if text.lstrip().startswith("["):
+            return orjson.loads(text)
+        raise ValueError("LLM output is not in the expected blocks[N]{id,html}: format")
+
+    items = []
+    for row in csv.reader(io.StringIO(text[m.end():].lstrip("\r\n"))):
+        if len(row) < 2:
+            continue
+        # html 안의 쉼표를 인용하지 않은 경우를 대비해 나머지 필드를 다시 합침
+        items.append({"id": row[0].strip(), "html": ",".join(row[1:])})
+    return items
+
+
+_TOON_PREFIX_FENCE_RE = re.compile(r"^\s*(?:```(?:json|csv|toon)?\s*)?")
+
+
+def _is_toon_prefix(text):
+    """응답 앞부분이 TOON 헤더(또는 JSON 배열)로 시작하는지 확인 (설명 문장으로 시작하면 False)"""
+    head = _TOON_PREFIX_FENCE_RE.sub("", text, count=1)
+    return head.startswith("blocks[") or head.startswith("[")
+
+
+_MAX_BLOCKS_PER_CALL = 20
+_edit_report_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="edit-report")
+
+
+def _edit_report_chunk(blocks, instruction):
+    """블록 묶음 하나를 LLM으로 수정해 [{"id", "html"}] 목록으로 반환"""
+    context_toon = _toon_encode(blocks)
+
+    prompt = f"""
+다음은 데이터 분석 리포트 블록들입니다. (TOON 표 형식: 첫 줄은 헤더, 각 행은 id,html 순서의 CSV)
+
+{context_toon}
+
+사용자 요청:
+{instruction}
+
+요청에 따라 각 블록의 html만 수정하세요.
+
+반드시 같은 헤더(blocks[N]{{id,html}}:)와 id,html 순서의 CSV 행으로 반환하세요.
+html에 쉼표, 큰따옴표, 줄바꿈이 있으면 CSV 규칙대로 큰따옴표로 감싸세요.
+
+주의:
+- id는 절대 변경하지 마세요.
+- 블록을 삭제하거나 새로 추가하지 마세요.
+"""
+
+    response_text = _edit_chat_stream(
+        messages=[
+            {
+                "role": "system",
+                "content": "You are a professional report editor. Return ONLY the blocks[N]{id,html}: header followed by CSV rows. Do not add explanations."
+            },
+            {"role": "user", "content": prompt}
+        ],
+        temperature=0.2,
+        is_valid_prefix=_is_toon_prefix
+    ).strip()
+
+    # Remove markdown fences if exists
+    if "```" in response_text:
+        response_text = re.sub(r"```(?:json|csv|toon)?", "", response_text).strip()
+
+    edited_minimal = _toon_decode(response_text)
+
+    if not isinstance(edited_minimal, list):
+        raise ValueError("LLM output is not a block list")
+    return edited_minimal
+
+
 @app.route('/edit_report', methods=['POST'])
 def edit_report():
     """Edit entire report using AI with structured block format (SAFE JSON MERGE VERSION)"""
     try:
-        import json
-        import re
         import uuid
-        import openai
 
         data = request.get_json()
         blocks = data.get("blocks", [])
@@ -6040,6 +6307,8 @@ def edit_report():
             block_id = b.get("id")
             if not block_id:
                 block_id = str(uuid.uuid4())
+            # TOON 디코더는 id를 문자열로 돌려주므로 숫자 id도 문자열로 맞춰야 병합 조회가 맞는다
+            block_id = str(block_id)
 
             normalized_blocks.append({
                 "id": block_id,
@@ -6056,67 +6325,29 @@ def edit_report():
         # ------------------------------------------------------------------
         # 2) LLM Input should NOT include plotData (token waste + corruption risk)
         #    Only pass id + html to rewrite safely
+        #    html은 주석/공백을 축약해서 전달 (LLM이 손대지 않은 블록은 5)에서 원본 html 유지)
         # ------------------------------------------------------------------
         llm_context = [
             {
                 "id": b["id"],
-                "html": b["html"]
+                "html": _compress_html(b["html"])
             }
             for b in normalized_blocks
         ]
 
-        context_json = json.dumps(llm_context, ensure_ascii=False, indent=2)
-
-        prompt = f"""
-다음은 데이터 분석 리포트 블록들입니다. (JSON 배열)
-
-{context_json}
-
-사용자 요청:
-{instruction}
-
-요청에 따라 각 블록의 "html"만 수정하세요.
-
-반드시 아래 JSON 형식 그대로 반환하세요:
-
-[
-  {{
-    "id": "...원본 id 그대로...",
-    "html": "...수정된 html..."
-  }}
-]
-
-주의:
-- id는 절대 변경하지 마세요.
-- 블록을 삭제하거나 새로 추가하지 마세요.
-- JSON 배열만 반환하세요.
-- 설명 문장 없이 JSON만 반환하세요.
-"""
-
-        res = openai.ChatCompletion.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a professional report editor. Return ONLY valid JSON array. Do not add explanations."
-                },
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.2
-        )
-
-        response_text = res["choices"][0]["message"]["content"].strip()
-
         # ------------------------------------------------------------------
-        # 3) Remove markdown fences if exists
+        # 3) LLM call: 블록이 많으면 _MAX_BLOCKS_PER_CALL 단위로 나눠 병렬 호출
         # ------------------------------------------------------------------
-        if "```" in response_text:
-            response_text = re.sub(r"```json|```", "", response_text).strip()
-
-        edited_minimal = json.loads(response_text)
+        chunks = [
+            llm_context[i:i + _MAX_BLOCKS_PER_CALL]
+            for i in range(0, len(llm_context), _MAX_BLOCKS_PER_CALL)
+        ]
+        if len(chunks) == 1:
+            chunk_results = [_edit_report_chunk(chunks[0], instruction)]
+        else:
+            chunk_results = list(_edit_report_pool.map(lambda c: _edit_report_chunk(c, instruction), chunks))
 
-        if not isinstance(edited_minimal, list):
-            return jsonify({"error": "LLM output is not a JSON array"}), 500
+        edited_minimal = [item for items in chunk_results for item in items]
 
         # ------------------------------------------------------------------
         # 4) Build edited html map (id -> html)
@@ -6127,7 +6358,8 @@ def edit_report():
                 continue
             if "id" not in item or "html" not in item:
                 continue
-            edited_html_map[item["id"]] = item["html"]
+            edited_html_map[str(item["id"]).strip()] = item["html"]
+        sent_html_map = {c["id"]: c["html"] for c in llm_context}
 
         # ------------------------------------------------------------------
         # 5) Merge: preserve plotData/chartId/source/created_at
@@ -6135,10 +6367,14 @@ def edit_report():
         merged_blocks = []
         for b in normalized_blocks:
             block_id = b["id"]
+            html = edited_html_map.get(block_id.strip())
+            # 응답 html이 보낸 축약본과 같으면(공백 차이 포함) 수정되지 않은 블록 -> 원본 서식 유지
+            if not isinstance(html, str) or _compress_html(html) == sent_html_map.get(block_id):
+                html = b.get("html", "")
 
             merged_blocks.append({
                 "id": block_id,
-                "html": edited_html_map.get(block_id, b.get("html", "")),
+                "html": html,
                 "plotData": b.get("plotData"),
                 "chartId": b.get("chartId"),
                 "source": b.get("source"),
@@ -6165,16 +6401,21 @@ def ask_csv():
     if not question or not dataset_name:
         return jsonify({"error": "question and dataset_name required"}), 400
 
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    file_path = os.path.join(base_dir, UPLOAD_FOLDER, dataset_name)
+    file_path = os.path.join(_UPLOAD_DIR, dataset_name)
     response = file_engine.process(question, file_path)
 
     return jsonify({"response": response, "route": "file"})
 
 
+@lru_cache(maxsize=1)
+def _listdir_cached(path: str, ts_bucket: int) -> Tuple[str, ...]:
+    """폴링 요청마다 listdir 하지 않도록 2초 단위(ts_bucket)로 디렉터리 목록 캐시"""
+    return tuple(os.listdir(path))
+
+
 @app.route('/list_preprocessed_data', methods=['GET'])
 def list_preprocessed_data():
-    files = os.listdir('uploaded_files')
+    files = list(_listdir_cached(_UPLOAD_DIR, int(time.time() // 2)))
     return jsonify(files)
 
 if __name__ == "__main__":
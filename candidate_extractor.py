@@ -12,9 +12,19 @@
 
 import re
 import os
+import copy
+import types
 import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from heapq import nlargest
+from operator import attrgetter, itemgetter
 from datetime import date, datetime, timedelta
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple, FrozenSet
+
+import ahocorasick
 
 from ga4_metadata import GA4_METRICS, GA4_DIMENSIONS
 from ml_module import parse_dates
@@ -29,13 +39,233 @@ KNOWN_CUSTOM_PARAM_TOKENS = {
     "domestic_children_count", "overseas_children_count"
 }
 
-
+# 요청마다 실행되는 정규식은 import 시 한 번만 컴파일
+_NORMALIZE_RE = re.compile(r"[\s\-_/]+")
+
+# _extract_entity_terms
+_QUOTED_RE = re.compile(r"[\"']([^\"']{2,40})[\"']")
+_ENTITY_SUFFIX_GATE_RE = re.compile("대해|관련|기준|만|비중|추이|원인|정보")
+_ENTITY_SUFFIX_RE = re.compile(r"([가-힣A-Za-z0-9_\-/\[\] ]{2,40})\s*(?:에\s*대해|에\s*대해서|관련|기준|만|비중|추이|원인|정보)")
+_AND_RE = re.compile(r"([가-힣A-Za-z0-9_\-/\[\]]{2,30})\s*[와과]\s*([가-힣A-Za-z0-9_\-/\[\]]{2,30})")
+_COMMA_LIKE_RE = re.compile(r"([가-힣A-Za-z0-9_\-/\[\] ]{2,30})\s*,\s*([가-힣A-Za-z0-9_\-/\[\] ]{2,30})\s*같은")
+_COUNTRY_RE = re.compile(r"([가-힣A-Za-z0-9_\-/\[\] ]{2,40})\s*국가별")
+_OF_RE = re.compile(r"([가-힣A-Za-z0-9_\-/\[\]]{2,40})\s*의\s*")
+_DONATION_RE = re.compile(r"([가-힣A-Za-z0-9_]+후원)")
+
+# _extract_entity_terms._clean_term
+_WS_RE = re.compile(r"\s+")
+_BY_SUFFIX_RE = re.compile(r"[A-Za-z0-9_가-힣]+\s*별.*$")
+_RANK_PREFIX_RE = re.compile(r"^(가장|최고|최저|상위|하위)\s*")
+_RANK_TOKEN_RE = re.compile(r"(top\s*\d+|상위\s*\d+|\d+\s*위|\d+\s*[-~]\s*\d+)\s*", re.IGNORECASE)
+# 접미어(관련/기준/...) 1개 + 그 앞의 조사(은/는/...) 1개를 한 번에 제거
+# (기존 "접미어 sub -> 조사 sub" 한 차례와 같은 결과)
+_TRAILING_NOISE_RE = re.compile(
+    r"(?:(?:은|는|이|가|을|를|에|의|중|중에|쪽|쪽에)?\s*(?:관련|기준|정보|상세|매출|전환|추이|원인|분석|채널|캠페인)"
+    r"|(?:은|는|이|가|을|를|에|의|중|중에|쪽|쪽에))$"
+)
+_QUESTION_PREFIX_RE = re.compile(r"^(어떤|무슨|무엇)\s*")
+
+# _extract_event_name_token
+_ASCII_ALNUM_RE = re.compile(r"[a-z0-9]")
+_SNAKE_RE = re.compile(r"[a-z][a-z0-9]*(?:_[a-z0-9]+)+")
+_CLICK_RE = re.compile(r"\b([a-z0-9]+)\s*클릭\b")
+_EVENT_RE = re.compile(r"이벤트\s*([a-z][a-z0-9_\-]{2,40})")
+
+# IntentClassifier / MetricCandidateExtractor / ModifierExtractor
+_TOPN_RE = re.compile(r'(top\s*\d+|상위\s*\d+|\d+\s*위|1\s*[-~]\s*\d+|\d+개)')
+_RANKING_RE = re.compile(r'(top\s*\d+|상위\s*\d+|\d+위|1-\d+|\d+개)')
+_LIMIT_RE = re.compile(r'(top\s*(\d+)|상위\s*(\d+)|(\d+)\s*위|1\s*[-~]\s*(\d+)|(\d+)\s*개)')
+_DONATION_ENTITY_RE = re.compile(r"[가-힣A-Za-z0-9_]+후원")
+
+# DateParser 기간 표현 (서로 겹쳐 나타날 수 없는 표현들이라 findall 결과로 포함 여부를 판정할 수 있음)
+_PERIOD_RE = re.compile("그 전주|지난주|이번주|지난달|이번달|어제|오늘|전주")
+_PERIOD_PRIORITY = ("지난주", "이번주", "지난달", "이번달", "어제", "오늘")
+
+# parse_dates의 규칙이 하나라도 걸릴 수 있는 질문인지 (모든 규칙이 숫자 또는 아래 표현 중 하나를 요구)
+_DATE_HINT_RE = re.compile(r"\d|주|달|어제|오늘")
+
+# 추출기 공용 키워드 묶음 (any(k in q ...) 루프 대신 단일 정규식 스캔)
+# "상품별/아이템별/제품별"은 "상품/아이템/제품"에 포함되므로 별도 항목 불필요
+_ITEM_KW_RE = re.compile("상품|아이템|제품|항목|브랜드")
+_ITEM_RANK_KW_RE = re.compile("항목|상품|아이템|제품")
+_ITEM_HINT_RE = re.compile("상품|아이템|제품|항목|후원|브랜드")
+
+# 한 단어 비교 요청 ("비교", "증감" 등)
+_SHORT_COMPARE = frozenset({"비교", "비교해", "비교해서", "대비", "증감"})
+
+# 점수 조정 대상 지표 묶음
+_ITEM_REVENUE_METRICS = frozenset({"itemRevenue", "grossItemRevenue"})
+_REVENUE_METRICS = frozenset({"purchaseRevenue", "itemRevenue", "grossItemRevenue"})
+_REVENUE_METRICS_WITH_TOTAL = _REVENUE_METRICS | {"totalRevenue"}
+_PAGE_VIEW_METRICS = frozenset({"screenPageViews", "views"})
+
+# 드릴다운 후속 질의 키워드
+_DRILLDOWN_FOLLOWUP_RE = re.compile(
+    "더 내려|세분|드릴다운|상세|깊게|나눠서|기준으로|원인|이유|왜"
+    "|채널|소스|매체|경로|국가|디바이스|상품|카테고리|후원명|donation_name"
+)
+_DRILL_DEEPER_RE = re.compile("더 내려|세분|드릴다운|상세|깊게")
+_CAUSE_RE = re.compile("원인|이유|왜|해석")
+_DRILL_SOURCE_MEDIUM_RE = re.compile("소스/매체|source/medium")
+_DRILL_SOURCE_RE = re.compile("소스|source")
+_DRILL_MEDIUM_RE = re.compile("매체|medium|경로|유입")
+_DRILL_CAMPAIGN_RE = re.compile("캠페인|campaign")
+_DRILL_COUNTRY_RE = re.compile("국가|country")
+_DRILL_DEVICE_RE = re.compile("디바이스|기기|device")
+_DRILL_ITEM_RE = re.compile("상품|카테고리")
+_DRILL_DONATION_NAME_RE = re.compile("후원명|donation_name")
+
+# IntentClassifier 키워드 그룹 (모든 그룹을 하나의 Aho-Corasick 오토마톤으로 한 번에 스캔)
+_INTENT_KIND = frozenset({"종류"})
+_INTENT_KIND_TARGET = frozenset({"이벤트", "event", "목록"})
+_INTENT_EVENT_QUESTION = frozenset({"무슨 이벤트", "어떤 이벤트"})
+_INTENT_SUPERLATIVE = frozenset({"가장", "최고", "최저", "높은", "낮은"})
+_INTENT_TOPN_ENTITY = frozenset({"상품", "매출", "이벤트", "후원"})
+_INTENT_FULL_LIST = frozenset({
+    "전체 항목", "전체 목록", "전체 프로그램", "모든 항목", "전부 보여", "다 보여",
+    "전체 보여", "전체 보여줘", "이것 전체", "이거 전체"
+})
+_INTENT_SHARE = frozenset({"비중", "구성비", "비율", "점유율"})
+_INTENT_HOW_ABOUT = frozenset({"어때", "어떤게", "무엇이"})
+_INTENT_CONJ = frozenset({"와", "과", "중"})
+_INTENT_TYPE = frozenset({"유형", "타입", "종류"})
+_INTENT_TYPE_QUALIFIER = frozenset({"어떤", "많이", "가장", "상위"})
+_INTENT_DETAIL = frozenset({"어떤 것을 더 알 수", "무엇을 더 알 수", "상세", "정보", "매개변수", "파라미터"})
+_INTENT_DONATION = frozenset({"donation"})
+_INTENT_DONATION_PARAM = frozenset({"donation_click", "donation_name"})
+_INTENT_DONATION_PARAM_QUALIFIER = frozenset({"클릭", "click", "주로 어떤", "순위", "많이"})
+_INTENT_CLICK = frozenset({"클릭", "click"})
+_INTENT_CLICK_QUALIFIER = frozenset({"어떤", "주로", "순위", "top", "상위"})
+_INTENT_TREND = frozenset({"추이", "흐름", "일별", "변화", "trend", "daily"})
+_INTENT_COMPARISON = frozenset({"전주 대비", "비교", "차이", "증감", "compare", "vs"})
+_INTENT_BREAKDOWN = frozenset({"별", "기준", "따라", "by "})
+_INTENT_DIMENSION_AXIS = frozenset({
+    "채널", "소스", "매체", "디바이스", "기기", "랜딩", "국가", "카테고리", "유형", "타입", "종류",
+    "메뉴명", "후원명", "광고", "paid", "display"
+})
+_INTENT_NAME = frozenset({"name", "이름", "네임"})
+_INTENT_LIST_SEP = frozenset({"와", "과", ","})
+_INTENT_USER = frozenset({"사용자", "유저"})
+_INTENT_BUYER = frozenset({"구매한", "구매자", "후원자", "구매"})
+_INTENT_PURCHASE_COUNT = frozenset({"구매수", "구매 건수", "구매건수", "트랜잭션"})
+_INTENT_BUYER_TOTAL = frozenset({"전체 구매자", "구매자", "후원자"})
+
+
+def _build_keyword_automaton(keywords) -> "ahocorasick.Automaton":
+    """키워드 집합 -> 부분 문자열 매칭 오토마톤 (값은 키워드 자신)"""
+    automaton = ahocorasick.Automaton()
+    for keyword in keywords:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
+
+_INTENT_AC = _build_keyword_automaton(frozenset().union(
+    _INTENT_KIND, _INTENT_KIND_TARGET, _INTENT_EVENT_QUESTION,
+    _INTENT_SUPERLATIVE, _INTENT_TOPN_ENTITY, _INTENT_FULL_LIST, _INTENT_SHARE, _INTENT_HOW_ABOUT,
+    _INTENT_CONJ, _INTENT_TYPE, _INTENT_TYPE_QUALIFIER, _INTENT_DETAIL, _INTENT_DONATION,
+    _INTENT_DONATION_PARAM, _INTENT_DONATION_PARAM_QUALIFIER, _INTENT_CLICK, _INTENT_CLICK_QUALIFIER,
+    _INTENT_TREND, _INTENT_COMPARISON, _INTENT_BREAKDOWN, _INTENT_DIMENSION_AXIS, _INTENT_NAME,
+    _INTENT_LIST_SEP, _INTENT_USER, _INTENT_BUYER, _INTENT_PURCHASE_COUNT, _INTENT_BUYER_TOTAL,
+))
+
+
+def _keyword_hits(automaton: "ahocorasick.Automaton", q: str) -> set:
+    """q에 부분 문자열로 등장하는 키워드 집합 (겹치는 매칭 포함, 한 번의 선형 스캔)"""
+    return {keyword for _, keyword in automaton.iter(q)}
+
+
+# 키워드가 아닌 조건은 표식 토큰으로 hits에 추가해 규칙 테이블에서 함께 평가한다
+_TOPN_NUM_MARK = "<topn_num>"
+_SHORT_COMPARE_MARK = "<short_compare>"
+_SHORT_QUESTION_MARK = "<short_question>"
+_INTENT_TOPN_NUM = frozenset({_TOPN_NUM_MARK})
+_INTENT_SHORT_COMPARE = frozenset({_SHORT_COMPARE_MARK})
+_INTENT_SHORT_QUESTION = frozenset({_SHORT_QUESTION_MARK})
+
+# (모두 hits와 겹쳐야 하는 그룹들, intent) - 위에서부터 처음 만족하는 규칙이 채택된다
+_INTENT_RULES = (
+    # 1. Category List (최우선)
+    ((_INTENT_KIND, _INTENT_KIND_TARGET), "category_list"),
+    ((_INTENT_EVENT_QUESTION,), "category_list"),
+    # 2. TopN (명시적 숫자)
+    ((_INTENT_TOPN_NUM,), "topn"),
+    ((_INTENT_SUPERLATIVE, _INTENT_TOPN_ENTITY), "topn"),
+    # 2.1 전체 항목/목록 후속 조회는 breakdown
+    ((_INTENT_FULL_LIST,), "breakdown"),
+    # 2.5 비중/구성비/비율 -> breakdown
+    ((_INTENT_SHARE,), "breakdown"),
+    # 2.55 비교형 자연어 ("A와 B는 어때?")
+    ((_INTENT_HOW_ABOUT, _INTENT_CONJ), "breakdown"),
+    ((_INTENT_TYPE, _INTENT_TYPE_QUALIFIER), "breakdown"),
+    # 2.6 탐색형 상세질문 -> breakdown
+    ((_INTENT_DETAIL,), "breakdown"),
+    # donation_click / donation_name 클릭 분포 질문은 breakdown 우선
+    ((_INTENT_DONATION, _INTENT_DONATION_PARAM, _INTENT_DONATION_PARAM_QUALIFIER), "breakdown"),
+    ((_INTENT_DONATION, _INTENT_CLICK, _INTENT_CLICK_QUALIFIER), "breakdown"),
+    # 3. Trend
+    ((_INTENT_TREND,), "trend"),
+    # 4. Comparison
+    ((_INTENT_COMPARISON,), "comparison"),
+    ((_INTENT_SHORT_COMPARE,), "comparison"),
+    # 5. Breakdown
+    ((_INTENT_BREAKDOWN,), "breakdown"),
+    # 5.1 차원 축(채널/소스/매체 등) 언급은 breakdown
+    ((_INTENT_DIMENSION_AXIS,), "breakdown"),
+    ((_INTENT_SHORT_QUESTION, _INTENT_NAME), "breakdown"),
+    # 6. Multi-metric (여러 지표 언급)
+    ((_INTENT_LIST_SEP, _INTENT_USER, _INTENT_BUYER), "metric_multi"),
+    ((_INTENT_LIST_SEP, _INTENT_PURCHASE_COUNT, _INTENT_BUYER_TOTAL), "metric_multi"),
+)
+
+
+# 한 요청에서 분류기/추출기/드릴다운 판정이 같은 질문을 각자 소문자화하지 않도록 공유 캐시
+# (한글은 대소문자가 없어 실제로 바뀌는 건 ASCII 부분뿐이지만 str.lower 의미는 그대로 유지)
+_lower_question = lru_cache(maxsize=4096)(str.lower)
+
+
+@dataclass(frozen=True)
+class QuestionFeatures:
+    """질문 1건의 공용 스캔 결과 (DateParser / IntentClassifier가 함께 사용)"""
+    q: str                  # 소문자화된 질문
+    hits: frozenset         # IntentClassifier 키워드 + 표식 토큰
+    periods: frozenset      # DateParser 기간 표현
+    week_compare: bool      # "지난주" + "전주/그 전주" (지난주 vs 전주 비교)
+    relative_shift: bool    # 직전 기간 기준 1주 이동 ("그 전주", 또는 지난주/이번주 없는 "전주")
+
+
+@lru_cache(maxsize=4096)
+def _question_features(question: str) -> QuestionFeatures:
+    """소문자화와 키워드/기간 스캔을 질문당 한 번만 수행 (같은 질문은 캐시에서 재사용)"""
+    q = _lower_question(question)
+    hits = _keyword_hits(_INTENT_AC, q)
+    if _TOPN_RE.search(q):
+        hits.add(_TOPN_NUM_MARK)
+    stripped = q.strip()
+    if stripped in _SHORT_COMPARE:
+        hits.add(_SHORT_COMPARE_MARK)
+    if len(stripped) <= 20:
+        hits.add(_SHORT_QUESTION_MARK)
+    periods = frozenset(_PERIOD_RE.findall(q))
+    # "그 전주"도 "전주"가 포함된 것으로 취급
+    has_prev_week = "전주" in periods or "그 전주" in periods
+    has_last_week = "지난주" in periods
+    return QuestionFeatures(
+        q=q,
+        hits=frozenset(hits),
+        periods=periods,
+        week_compare=has_last_week and has_prev_week,
+        relative_shift="그 전주" in periods or (has_prev_week and not has_last_week and "이번주" not in periods),
+    )
+
+
+@lru_cache(maxsize=4096)
 def _normalize_text(text: str) -> str:
     """공백/구두점 변형을 흡수한 비교용 문자열"""
     if not text:
         return ""
     lowered = text.lower()
-    return re.sub(r"[\s\-_/]+", "", lowered)
+    return _NORMALIZE_RE.sub("", lowered)
 
 
 def _is_too_short_term(term: str) -> bool:
@@ -43,23 +273,48 @@ def _is_too_short_term(term: str) -> bool:
     return len(_normalize_text(term or "")) <= 1
 
 
+_CATEGORY_TO_SCOPE = types.MappingProxyType({
+    "ecommerce": "item",
+    "time": "event",
+    "event": "event",
+    "page": "event",
+    "device": "event",
+    "geo": "event",
+    "traffic": "event",
+    "user": "event",
+    "ads": "event",
+})
+
+
+def _infer_scope(category: str) -> str:
+    """Category에서 scope 추론"""
+    return _CATEGORY_TO_SCOPE.get(category, "event")
+
+
+def _build_norm_index(catalog: Dict[str, Dict]) -> Dict[str, str]:
+    """정규화된 이름/UI name/alias -> 카탈로그 이름 (앞선 항목 우선, 기존 선형 탐색 순서와 동일)"""
+    index: Dict[str, str] = {}
+    for name, meta in catalog.items():
+        index.setdefault(_normalize_text(name), name)
+        ui_name = meta.get("ui_name", "")
+        if ui_name:
+            index.setdefault(_normalize_text(ui_name), name)
+        for alias in meta.get("aliases", []):
+            index.setdefault(_normalize_text(alias), name)
+    return index
+
+
+_METRIC_NORM_INDEX = _build_norm_index(GA4_METRICS)
+_DIM_NORM_INDEX = _build_norm_index(GA4_DIMENSIONS)
+
+
 def _resolve_metric_name(name: str) -> Optional[str]:
     if not name:
         return None
     key = str(name).strip()
     if key in GA4_METRICS:
         return key
-    key_norm = _normalize_text(key)
-    for metric_name, meta in GA4_METRICS.items():
-        if _normalize_text(metric_name) == key_norm:
-            return metric_name
-        ui_name = meta.get("ui_name", "")
-        if ui_name and _normalize_text(ui_name) == key_norm:
-            return metric_name
-        for alias in meta.get("aliases", []):
-            if _normalize_text(alias) == key_norm:
-                return metric_name
-    return None
+    return _METRIC_NORM_INDEX.get(_normalize_text(key))
 
 
 def _resolve_dimension_name(name: str) -> Optional[str]:
@@ -68,37 +323,997 @@ def _resolve_dimension_name(name: str) -> Optional[str]:
     key = str(name).strip()
     if key in GA4_DIMENSIONS:
         return key
-    key_norm = _normalize_text(key)
-    for dim_name, meta in GA4_DIMENSIONS.items():
-        if _normalize_text(dim_name) == key_norm:
-            return dim_name
-        ui_name = meta.get("ui_name", "")
-        if ui_name and _normalize_text(ui_name) == key_norm:
-            return dim_name
+    return _DIM_NORM_INDEX.get(_normalize_text(key))
+
+
+_EXPLICIT_MAX_SCORE = 0.95
+
+
+def _build_explicit_automaton(catalog: Dict[str, Dict]) -> "ahocorasick.Automaton":
+    """
+    카탈로그(GA4_METRICS/GA4_DIMENSIONS)의 매칭 용어를 정규화해 하나의 Aho-Corasick 오토마톤으로 구성.
+    각 용어는 (이름, 점수) 목록에 매핑된다: API key 0.85 / UI name 0.95 / alias 0.90 / kr_semantics 0.70
+    """
+    term_scores: Dict[str, Dict[str, float]] = {}
+
+    def _add(term: str, name: str, score: float):
+        key = _normalize_text(term)
+        if not key:
+            return
+        by_name = term_scores.setdefault(key, {})
+        if score > by_name.get(name, 0.0):
+            by_name[name] = score
+
+    for name, meta in catalog.items():
+        _add(name, name, 0.85)
+        ui_name = meta.get("ui_name", "").lower()
+        if ui_name and not _is_too_short_term(ui_name):
+            _add(ui_name, name, 0.95)
         for alias in meta.get("aliases", []):
-            if _normalize_text(alias) == key_norm:
-                return dim_name
-    return None
+            if not _is_too_short_term(alias):
+                _add(alias, name, 0.90)
+        for sem in meta.get("kr_semantics", []):
+            if not _is_too_short_term(sem):
+                _add(sem, name, 0.70)
 
+    automaton = ahocorasick.Automaton()
+    for term_id, (key, by_name) in enumerate(term_scores.items()):
+        automaton.add_word(key, (term_id, tuple(by_name.items())))
+    automaton.make_automaton()
+    return automaton
 
-def _extract_entity_terms(question: str) -> List[str]:
+
+def _explicit_scores(automaton: "ahocorasick.Automaton", q: str) -> Dict[str, float]:
+    """
+    질문(정규화)을 한 번 스캔해 이름별 최고 명시적 매칭 점수를 반환.
+    원문 substring 매칭은 정규화 substring 매칭에 포함되므로 정규화 문자열만 검사한다.
+    """
+    scores: Dict[str, float] = {}
+    matched_terms = set()
+    for _, (term_id, hits) in automaton.iter(_normalize_text(q)):
+        # 같은 용어가 여러 위치에서 매칭돼도 한 번만 반영
+        if term_id in matched_terms:
+            continue
+        matched_terms.add(term_id)
+        for name, score in hits:
+            prev = scores.get(name, 0.0)
+            # UI name 최고점(0.95)에 도달한 이름은 이후 비교 생략
+            if prev >= _EXPLICIT_MAX_SCORE or score <= prev:
+                continue
+            scores[name] = score
+    return scores
+
+
+_METRIC_AC = _build_explicit_automaton(GA4_METRICS)
+_DIM_AC = _build_explicit_automaton(GA4_DIMENSIONS)
+# 질문마다 메타데이터를 .lower() 하지 않도록 import 시 한 번만 소문자화
+_METRIC_UI_NAMES_LOWER = tuple(meta.get("ui_name", "").lower() for meta in GA4_METRICS.values())
+
+
+def _build_ui_name_automaton(ui_names) -> "ahocorasick.Automaton":
+    """소문자 UI name -> (용어 id, 해당 UI name을 쓰는 지표 수) 오토마톤"""
+    counts: Dict[str, int] = {}
+    for ui_name in ui_names:
+        counts[ui_name] = counts.get(ui_name, 0) + 1
+    automaton = ahocorasick.Automaton()
+    for term_id, (ui_name, count) in enumerate(counts.items()):
+        automaton.add_word(ui_name, (term_id, count))
+    automaton.make_automaton()
+    return automaton
+
+
+_METRIC_UI_AC = _build_ui_name_automaton(_METRIC_UI_NAMES_LOWER)
+
+
+def _count_metric_mentions(q: str) -> int:
+    """질문(소문자)에 UI name이 포함된 지표 수 (단일 스캔)"""
+    matched_terms = {}
+    for _, (term_id, count) in _METRIC_UI_AC.iter(q):
+        matched_terms[term_id] = count
+    return sum(matched_terms.values())
+
+
+_SCORE_KEY = itemgetter("score")
+_METRIC_SCORE_ATTR = attrgetter("score")
+# 후보 순서를 카탈로그 정의 순서로 유지하기 위한 인덱스
+_METRIC_ORDER = {name: i for i, name in enumerate(GA4_METRICS)}
+_DIM_ORDER = {name: i for i, name in enumerate(GA4_DIMENSIONS)}
+
+# MetricCandidateExtractor 규칙 키워드 그룹 (모든 그룹을 하나의 Aho-Corasick 오토마톤으로 한 번에 스캔)
+_METRIC_KW_DONATION = frozenset({"후원", "정기후원", "일시후원"})
+_METRIC_KW_RATIO = frozenset({"비중", "구성비", "점유율", "나눠줘", "나눠", "비교"})
+_METRIC_KW_VOLUME = frozenset({"많이", "가장", "어떤", "상위", "top"})
+_METRIC_KW_SALES = frozenset({"판매", "팔리", "매출", "수익"})
+_METRIC_KW_ACQ_AXIS = frozenset({"소스", "매체", "채널", "유입", "source", "medium"})
+_METRIC_KW_PURCHASE_INTENT = frozenset({"구매", "매출", "수익", "후원"})
+_METRIC_KW_DONATION_TYPE = frozenset({"후원 유형", "후원유형"})
+_METRIC_KW_REVENUE = frozenset({"매출", "수익", "금액", "revenue"})
+_METRIC_KW_EVENT_LIST = frozenset({"이벤트 종류", "이벤트 목록", "무슨 이벤트", "어떤 이벤트"})
+_METRIC_KW_PURCHASE = frozenset({"purchase", "구매"})
+_METRIC_KW_CLICK_TERM = frozenset({"클릭", "눌", "tap", "click"})
+_METRIC_KW_ITEM_PROBE = frozenset({"항목", "무엇", "뭐", "어떤", "많이", "상위"})
+_METRIC_KW_CLICK = frozenset({"클릭수", "클릭", "click"})
+_METRIC_KW_MENU_AREA = frozenset({"메뉴", "gnb", "lnb", "footer"})
+_METRIC_KW_SCROLL = frozenset({"스크롤", "scroll"})
+_METRIC_KW_PARAM_PROBE = frozenset({
+    "파라미터", "매개변수", "네임", "이름", "name", "값", "없어", "있어",
+    "menu_name", "menu name", "메뉴명", "메뉴 네임"
+})
+_METRIC_KW_VOLUME_PROBE = frozenset({"얼마나", "몇", "건수", "횟수", "일어났", "발생"})
+_METRIC_KW_CUSTOM_PARAM = frozenset(KNOWN_CUSTOM_PARAM_TOKENS)
+_METRIC_KW_COUNT = frozenset({"수", "개수", "횟수"})
+_METRIC_KW_GROUP_BY = frozenset({"묶어서", "묶어", "group by"})
+_METRIC_KW_REACTION = frozenset({"반응", "효과", "성과"})
+_METRIC_KW_REACTION_TARGET = frozenset({"프로그램", "항목", "상품", "후원"})
+_METRIC_KW_PROGRAM_EVENT = frozenset({"프로그램", "노블클럽", "천원의 힘", "donation_name"})
+_METRIC_KW_COUNTRY = frozenset({"국가", "country"})
+_METRIC_KW_SHARE = frozenset({"비율", "비중", "구성비", "점유율"})
+_METRIC_KW_CLICK_VIEW = frozenset({"클릭", "조회"})
+_METRIC_KW_PURCHASE_DONATION = frozenset({"구매", "후원"})
+_METRIC_KW_CONVERSION_WORD = frozenset({"전환", "비율", "율"})
+_METRIC_KW_CONVERSION_RATE = frozenset({"전환율", "conversion rate", "전환 비율"})
+_METRIC_KW_PREV_WEEK = frozenset({"그 전주", "전주"})
+_METRIC_KW_USER = frozenset({"사용자", "유저"})
+_METRIC_KW_PARAM = frozenset({"매개변수", "파라미터", "parameter"})
+_METRIC_KW_PURCHASE_PARAM_ALIAS = frozenset({
+    "is_regular_donation", "country_name", "domestic_children_count",
+    "overseas_children_count", "letter_translation", "donation_name"
+})
+_METRIC_KW_PURCHASE_CONTEXT = frozenset({"purchase", "구매", "후원"})
+_METRIC_KW_DONATION_NAME = frozenset({"후원 이름", "후원명", "donation_name"})
+_METRIC_KW_PROGRAM_NAME = frozenset({"프로그램", "노블클럽", "천원의 힘", "그린노블클럽", "추모기부"})
+_METRIC_KW_AMOUNT_PROBE = frozenset({"얼마나", "몇", "후원했", "규모"})
+_METRIC_KW_NEW = frozenset({"신규", "새로운", "최초", "첫", "처음"})
+_METRIC_KW_BUYER = frozenset({"구매자", "구매", "후원자", "후원"})
+_METRIC_KW_PERCENT = frozenset({"퍼센트", "percent", "%", "비율", "율"})
+_METRIC_KW_USER_COUNT = frozenset({"사용자수", "사용자 수", "활성 사용자", "사용자"})
+_METRIC_KW_PURCHASER = frozenset({"구매한 사용자", "구매 사용자", "구매자", "후원자", "구매한"})
+_METRIC_KW_ACQ_PATH = frozenset({"채널", "소스", "매체", "유입", "경로"})
+_METRIC_KW_BUYER_COUNT = frozenset({"구매자수", "구매자 수", "구매자", "후원자"})
+_METRIC_KW_REVENUE_CAUSE = frozenset({"매출 일으킨", "구매를 일으킨", "구매 일으킨"})
+_METRIC_KW_PERSON = frozenset({"사용자", "유저", "사람"})
+_METRIC_KW_LIST_SEP = frozenset({"와", "과", ","})
+_METRIC_KW_PURCHASE_COUNT = frozenset({"구매수", "구매 건수", "구매건수", "트랜잭션"})
+_METRIC_KW_BUYER_TOTAL = frozenset({"전체 구매자", "구매자", "후원자"})
+_METRIC_KW_LIST_QUERY = frozenset({
+    "전체 항목", "전체 목록", "전체 프로그램", "프로그램 전체",
+    "메뉴 전체", "전체 보여", "전부 보여", "다 보여"
+})
+_METRIC_KW_ANY_USER = frozenset({"사용자", "유저", "user"})
+_METRIC_KW_LIST_EVENT = frozenset({"클릭", "click", "메뉴", "프로그램", "이벤트"})
+_METRIC_KW_DONATION_CLICK = frozenset({"donation_click"})
+_METRIC_KW_LAST_WEEK = frozenset({"지난주"})
+_METRIC_KW_NEW_WORD = frozenset({"신규"})
+
+_METRIC_RULE_AC = _build_keyword_automaton(frozenset().union(
+    _METRIC_KW_DONATION, _METRIC_KW_RATIO, _METRIC_KW_VOLUME, _METRIC_KW_SALES, _METRIC_KW_ACQ_AXIS,
+    _METRIC_KW_PURCHASE_INTENT, _METRIC_KW_DONATION_TYPE, _METRIC_KW_REVENUE, _METRIC_KW_EVENT_LIST,
+    _METRIC_KW_PURCHASE, _METRIC_KW_CLICK_TERM, _METRIC_KW_ITEM_PROBE, _METRIC_KW_CLICK,
+    _METRIC_KW_MENU_AREA, _METRIC_KW_SCROLL, _METRIC_KW_PARAM_PROBE, _METRIC_KW_VOLUME_PROBE,
+    _METRIC_KW_CUSTOM_PARAM, _METRIC_KW_COUNT, _METRIC_KW_GROUP_BY, _METRIC_KW_REACTION,
+    _METRIC_KW_REACTION_TARGET, _METRIC_KW_PROGRAM_EVENT, _METRIC_KW_COUNTRY, _METRIC_KW_SHARE,
+    _METRIC_KW_CLICK_VIEW, _METRIC_KW_PURCHASE_DONATION, _METRIC_KW_CONVERSION_WORD,
+    _METRIC_KW_CONVERSION_RATE, _METRIC_KW_PREV_WEEK, _METRIC_KW_USER, _METRIC_KW_PARAM,
+    _METRIC_KW_PURCHASE_PARAM_ALIAS, _METRIC_KW_PURCHASE_CONTEXT, _METRIC_KW_DONATION_NAME,
+    _METRIC_KW_PROGRAM_NAME, _METRIC_KW_AMOUNT_PROBE, _METRIC_KW_NEW, _METRIC_KW_BUYER,
+    _METRIC_KW_PERCENT, _METRIC_KW_USER_COUNT, _METRIC_KW_PURCHASER, _METRIC_KW_ACQ_PATH,
+    _METRIC_KW_BUYER_COUNT, _METRIC_KW_REVENUE_CAUSE, _METRIC_KW_PERSON, _METRIC_KW_LIST_SEP,
+    _METRIC_KW_PURCHASE_COUNT, _METRIC_KW_BUYER_TOTAL, _METRIC_KW_LIST_QUERY, _METRIC_KW_ANY_USER,
+    _METRIC_KW_LIST_EVENT, _METRIC_KW_DONATION_CLICK, _METRIC_KW_LAST_WEEK, _METRIC_KW_NEW_WORD,
+))
+
+# 규칙 조건 flag: (flag 이름, 원문 question 기준 여부, 키워드 그룹) - 그룹 키워드가 하나라도 있으면 flag가 켜진다
+_METRIC_KEYWORD_FLAGS = (
+    ("donation", True, _METRIC_KW_DONATION),
+    ("ratio", True, _METRIC_KW_RATIO),
+    ("volume", True, _METRIC_KW_VOLUME),
+    ("sales", True, _METRIC_KW_SALES),
+    ("reaction", True, _METRIC_KW_REACTION),
+    ("reaction_target", True, _METRIC_KW_REACTION_TARGET),
+    ("program_event", True, _METRIC_KW_PROGRAM_EVENT),
+    ("click_view", True, _METRIC_KW_CLICK_VIEW),
+    ("purchase_donation", True, _METRIC_KW_PURCHASE_DONATION),
+    ("conversion_word", True, _METRIC_KW_CONVERSION_WORD),
+    ("new", True, _METRIC_KW_NEW),
+    ("buyer", True, _METRIC_KW_BUYER),
+    ("acq_axis", False, _METRIC_KW_ACQ_AXIS),
+    ("purchase_intent", False, _METRIC_KW_PURCHASE_INTENT),
+    ("donation_type", False, _METRIC_KW_DONATION_TYPE),
+    ("revenue", False, _METRIC_KW_REVENUE),
+    ("event_list", False, _METRIC_KW_EVENT_LIST),
+    ("donation_click", False, _METRIC_KW_DONATION_CLICK),
+    ("purchase", False, _METRIC_KW_PURCHASE),
+    ("click_term", False, _METRIC_KW_CLICK_TERM),
+    ("item_probe", False, _METRIC_KW_ITEM_PROBE),
+    ("click", False, _METRIC_KW_CLICK),
+    ("menu_area", False, _METRIC_KW_MENU_AREA),
+    ("scroll", False, _METRIC_KW_SCROLL),
+    ("param_probe", False, _METRIC_KW_PARAM_PROBE),
+    ("volume_probe", False, _METRIC_KW_VOLUME_PROBE),
+    ("custom_param", False, _METRIC_KW_CUSTOM_PARAM),
+    ("group_by", False, _METRIC_KW_GROUP_BY),
+    ("country", False, _METRIC_KW_COUNTRY),
+    ("share", False, _METRIC_KW_SHARE),
+    ("conversion_rate", False, _METRIC_KW_CONVERSION_RATE),
+    ("last_week", False, _METRIC_KW_LAST_WEEK),
+    ("prev_week", False, _METRIC_KW_PREV_WEEK),
+    ("user", False, _METRIC_KW_USER),
+    ("purchase_param", False, _METRIC_KW_PARAM | _METRIC_KW_PURCHASE_PARAM_ALIAS),
+    ("purchase_context", False, _METRIC_KW_PURCHASE_CONTEXT),
+    ("donation_name", False, _METRIC_KW_DONATION_NAME),
+    ("program_name", False, _METRIC_KW_PROGRAM_NAME),
+    ("amount_probe", False, _METRIC_KW_AMOUNT_PROBE),
+    ("percent", False, _METRIC_KW_PERCENT),
+    ("new_word", False, _METRIC_KW_NEW_WORD),
+    ("user_count", False, _METRIC_KW_USER_COUNT),
+    ("purchaser", False, _METRIC_KW_PURCHASER),
+    ("acq_path", False, _METRIC_KW_ACQ_PATH),
+    ("buyer_count", False, _METRIC_KW_BUYER_COUNT),
+    ("revenue_cause", False, _METRIC_KW_REVENUE_CAUSE),
+    ("person", False, _METRIC_KW_PERSON),
+    ("list_sep", False, _METRIC_KW_LIST_SEP),
+    ("purchase_count", False, _METRIC_KW_PURCHASE_COUNT),
+    ("buyer_total", False, _METRIC_KW_BUYER_TOTAL),
+    ("list_query", False, _METRIC_KW_LIST_QUERY),
+    ("any_user", False, _METRIC_KW_ANY_USER),
+    ("list_event", False, _METRIC_KW_LIST_EVENT),
+)
+
+# 키워드 flag 뒤에 파생 flag를 이어 붙여 flag마다 비트 하나를 배정 (규칙 조건을 정수 마스크 AND로 판정)
+_METRIC_FLAG_BITS = {
+    name: 1 << i
+    for i, name in enumerate(
+        [name for name, _, _ in _METRIC_KEYWORD_FLAGS] + ["click_count", "donation_entity", "event_token"]
+    )
+}
+
+
+def _flag_mask(flag_bits: Dict[str, int], names) -> int:
+    """flag 이름들 -> 비트 마스크 (없는 이름이면 import 시 KeyError)"""
+    mask = 0
+    for name in names:
+        mask |= flag_bits[name]
+    return mask
+
+
+def _keyword_flag_masks(keyword_flags, flag_bits: Dict[str, int], use_raw: bool) -> Dict[str, int]:
+    """키워드 -> 그 키워드가 켜는 flag 비트 합 (소문자 q / 원문 question 기준을 따로 만든다)"""
+    masks: Dict[str, int] = {}
+    for name, flag_use_raw, group in keyword_flags:
+        if flag_use_raw != use_raw:
+            continue
+        for keyword in group:
+            masks[keyword] = masks.get(keyword, 0) | flag_bits[name]
+    return masks
+
+
+def _hits_flag_mask(q_hits, raw_hits, q_masks: Dict[str, int], raw_masks: Dict[str, int]) -> int:
+    """스캔된 키워드 집합 -> 켜진 flag 비트 합"""
+    have = 0
+    for keyword in q_hits:
+        have |= q_masks.get(keyword, 0)
+    for keyword in raw_hits:
+        have |= raw_masks.get(keyword, 0)
+    return have
+
+
+_METRIC_Q_KEYWORD_MASKS = _keyword_flag_masks(_METRIC_KEYWORD_FLAGS, _METRIC_FLAG_BITS, False)
+_METRIC_RAW_KEYWORD_MASKS = _keyword_flag_masks(_METRIC_KEYWORD_FLAGS, _METRIC_FLAG_BITS, True)
+# 규칙 테이블 밖에서 직접 쓰는 flag 비트
+_MF_DONATION = _METRIC_FLAG_BITS["donation"]
+_MF_RATIO = _METRIC_FLAG_BITS["ratio"]
+_MF_LIST_QUERY = _METRIC_FLAG_BITS["list_query"]
+_MF_ANY_USER = _METRIC_FLAG_BITS["any_user"]
+_MF_LIST_EVENT = _METRIC_FLAG_BITS["list_event"]
+_MF_CLICK_COUNT = _METRIC_FLAG_BITS["click_count"]
+_MF_DONATION_ENTITY = _METRIC_FLAG_BITS["donation_entity"]
+_MF_EVENT_TOKEN = _METRIC_FLAG_BITS["event_token"]
+
+# 지표 이름 -> (scope, priority, concept, category), 규칙마다 GA4_METRICS를 다시 조회하지 않도록 import 시 한 번 계산
+_METRIC_META = {
+    name: (
+        meta.get("scope") or _infer_scope(meta.get("category")),
+        meta.get("priority", 0),
+        meta.get("concept"),
+        meta.get("category"),
+    )
+    for name, meta in GA4_METRICS.items()
+}
+_UNKNOWN_METRIC_META = (_infer_scope(None), 0, None, None)
+# MetricCandidateExtractor 전용 규칙 밖 보정 대상 (호출마다 리터럴을 만들지 않도록 모듈 상수)
+_DONATION_RATIO_METRICS = ("itemRevenue", "grossItemRevenue", "purchaseRevenue")
+_ENTITY_FALLBACK_METRICS = (("itemRevenue", 0.84), ("purchaseRevenue", 0.82), ("transactions", 0.80))
+_LIST_QUERY_USER_METRICS = ("totalUsers", "activeUsers", "newUsers")
+# scope 추론 블록에서 쓰는 item scope 지표 (name, priority, concept, category), _METRIC_META 순서 유지
+_ITEM_SCOPE_METRICS = tuple(
+    (name, priority, concept, category)
+    for name, (scope, priority, concept, category) in _METRIC_META.items()
+    if scope == "item"
+)
+
+
+@dataclass(slots=True)
+class _MetricCandidate:
+    """점수 계산 중에 쓰는 Metric 후보 (반환 직전에 as_dict로 기존 dict 형식으로 변환)"""
+    name: str
+    score: float
+    matched_by: str
+    scope: str
+    priority: int
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "score": self.score,
+            "matched_by": self.matched_by,
+            "scope": self.scope,
+            "priority": self.priority
+        }
+
+
+def _add_metric_candidate(
+    by_name: Dict[str, _MetricCandidate],
+    name: str,
+    score: float,
+    matched_by: str,
+) -> None:
+    """Metric 후보를 이름 -> 후보(by_name)에 추가 (dict 삽입 순서가 곧 후보 순서)"""
+    scope, priority, _, _ = _METRIC_META.get(name, _UNKNOWN_METRIC_META)
+    by_name[name] = _MetricCandidate(name, score, matched_by, scope, priority)
+
+
+@dataclass(frozen=True)
+class _MetricRule:
+    """need flag가 모두 켜지고 forbid flag가 모두 꺼져 있을 때 적용되는 점수 보정 규칙
+
+    boosts: 이미 있는 후보는 max(score)로 올리고 matched_by 갱신, 없으면 추가 (add_only면 추가만)
+    decays: 해당 지표 후보 점수를 decay만큼 낮춤 (0 미만으로는 내려가지 않음)
+    """
+    matched_by: str
+    need: FrozenSet[str]
+    boosts: Tuple[Tuple[str, float], ...] = ()
+    decays: FrozenSet[str] = frozenset()
+    decay: float = 0.0
+    forbid: FrozenSet[str] = frozenset()
+    add_only: bool = False
+    need_mask: int = field(init=False, repr=False, compare=False)
+    forbid_mask: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # frozen dataclass라 object.__setattr__로 flag 이름을 비트 마스크로 미리 변환
+        object.__setattr__(self, "need_mask", _flag_mask(_METRIC_FLAG_BITS, self.need))
+        object.__setattr__(self, "forbid_mask", _flag_mask(_METRIC_FLAG_BITS, self.forbid))
+
+
+# 엔티티 fallback 이전에 적용하는 규칙 (순서대로 적용)
+_METRIC_RULES = (
+    # 후원 관련 "많이/가장/어떤게" 질문은 후원 매출/건수 우선
+    _MetricRule(
+        "donation_volume_rule", frozenset({"donation", "volume"}),
+        (("itemRevenue", 0.94), ("purchaseRevenue", 0.90), ("transactions", 0.88)),
+    ),
+    # 판매/반응 자연어 보강
+    _MetricRule(
+        "sales_semantic_rule", frozenset({"sales"}),
+        (("purchaseRevenue", 0.90), ("itemRevenue", 0.86), ("transactions", 0.84)),
+    ),
+    # 유입 축(소스/매체/채널) + 구매/매출 질문은 구매 기여 지표 우선
+    _MetricRule(
+        "acq_purchase_slot_rule", frozenset({"acq_axis", "purchase_intent"}),
+        (("purchaseRevenue", 0.97), ("totalPurchasers", 0.95), ("transactions", 0.90)),
+    ),
+    # "후원 유형별 매출"은 이벤트 파라미터 기반 매출 집계 우선
+    _MetricRule(
+        "donation_type_revenue_rule", frozenset({"donation_type", "revenue"}),
+        (("purchaseRevenue", 0.96), ("eventCount", 0.86)),
+    ),
+    # 이벤트 종류/목록 질문은 eventCount 우선
+    _MetricRule("event_category_list_rule", frozenset({"event_list"}), (("eventCount", 0.99),)),
+    # purchase vs donation_click 비교는 건수(eventCount) 우선
+    _MetricRule("event_pair_compare_rule", frozenset({"donation_click", "purchase"}), (("eventCount", 0.97),)),
+    # 클릭/이벤트 항목 탐색 질문은 이벤트 카운트 지표 우선
+    _MetricRule(
+        "click_event_rule", frozenset({"click_term", "item_probe"}),
+        (("eventCount", 0.96), ("keyEvents", 0.88), ("totalUsers", 0.80)),
+    ),
+    # 매출 언급이 없으면 금액 지표는 후순위로 낮춤
+    _MetricRule(
+        "click_event_rule", frozenset({"click_term", "item_probe"}),
+        decays=_REVENUE_METRICS, decay=0.25, forbid=frozenset({"revenue"}),
+    ),
+    # "정기후원의 클릭수" 같은 패턴은 donation_click + donation_name(eventCount)로 보정
+    _MetricRule(
+        "donation_entity_click_rule", frozenset({"donation_entity", "click"}),
+        (("eventCount", 0.99), ("keyEvents", 0.90)),
+        forbid=frozenset({"menu_area"}),
+    ),
+    # 스크롤 질의는 scroll 이벤트 카운트 우선
+    _MetricRule(
+        "scroll_rule", frozenset({"scroll"}),
+        (("eventCount", 0.95), ("keyEvents", 0.84), ("scrolledUsers", 0.82)),
+    ),
+    # 이벤트 파라미터 존재/조회 질의는 eventCount로 기본 조회 가능하게 보강
+    _MetricRule("event_token_metric_rule", frozenset({"event_token"}), (("eventCount", 0.97),)),
+    _MetricRule("event_param_probe_rule", frozenset({"event_token", "param_probe"}), (("eventCount", 0.90),)),
+    # 이벤트 클릭 발생량 질의는 eventCount를 강하게 우선
+    _MetricRule(
+        "click_volume_rule", frozenset({"click", "volume_probe"}), (("eventCount", 0.98),),
+        decays=_REVENUE_METRICS_WITH_TOTAL, decay=0.35,
+    ),
+    # 파라미터명이 직접 언급된 질문은 eventCount를 기본 지표로 사용
+    _MetricRule("custom_param_metric_rule", frozenset({"custom_param"}), (("eventCount", 0.90),)),
+    # "클릭수" 질의는 page_view가 아니라 이벤트 카운트를 우선
+    _MetricRule(
+        "click_count_rule", frozenset({"click_count"}), (("eventCount", 0.96),),
+        decays=_PAGE_VIEW_METRICS, decay=0.20,
+    ),
+    # 묶기/그룹 질문은 분해 지표(eventCount) 우선, 매출 지표는 후순위
+    _MetricRule(
+        "group_by_rule", frozenset({"group_by"}), (("eventCount", 0.94),),
+        decays=_REVENUE_METRICS, decay=0.22, forbid=frozenset({"revenue"}),
+    ),
+    _MetricRule(
+        "reaction_semantic_rule", frozenset({"reaction"}),
+        (("keyEvents", 0.84), ("engagementRate", 0.80), ("eventCount", 0.78)),
+    ),
+    # 프로그램/항목 반응 질문은 item 스코프 지표도 함께 후보로 제공
+    _MetricRule(
+        "reaction_item_scope_rule", frozenset({"reaction", "reaction_target"}),
+        (("itemRevenue", 0.86), ("transactions", 0.82), ("itemsViewed", 0.80)),
+    ),
+    # 프로그램 질문은 donation_name(커스텀) 기준 event 스코프도 강화
+    _MetricRule(
+        "reaction_program_event_rule", frozenset({"reaction", "program_event"}),
+        (("eventCount", 0.93), ("keyEvents", 0.90), ("purchaseRevenue", 0.82)),
+    ),
+    # 국가별 비율/구성비 질문은 eventCount 우선
+    _MetricRule(
+        "country_ratio_rule", frozenset({"country", "share"}),
+        (("eventCount", 0.92), ("totalUsers", 0.80)),
+    ),
+    # 클릭-구매 전환 비율
+    _MetricRule(
+        "click_purchase_conversion_rule", frozenset({"click_view", "purchase_donation", "conversion_word"}),
+        (("purchaserRate", 0.97), ("purchaseToViewRate", 0.90)),
+    ),
+    # 일반 전환율 질의는 rate 계열 지표 우선
+    _MetricRule(
+        "generic_conversion_rate_rule", frozenset({"conversion_rate"}),
+        (("sessionKeyEventRate", 0.98), ("purchaserRate", 0.92), ("purchaseToViewRate", 0.90)),
+        decays=frozenset({"keyEvents", "eventCount", "activeUsers"}), decay=0.28,
+    ),
+    # 주간 비교(지난주 vs 그 전주) + 사용자 계열 질문은 activeUsers 우선
+    _MetricRule(
+        "week_compare_users_rule", frozenset({"last_week", "prev_week", "user"}),
+        (("activeUsers", 0.995), ("newUsers", 0.85)),
+        decays=frozenset({"eventCount", "keyEvents", "purchaseRevenue", "itemRevenue"}), decay=0.30,
+    ),
+)
+
+# 엔티티 fallback 이후에 적용하는 규칙 (순서대로 적용)
+_METRIC_LATE_RULES = (
+    # purchase 이벤트 매개변수 조회는 eventCount를 기본 지표로 보강
+    _MetricRule(
+        "purchase_param_rule", frozenset({"purchase_param", "purchase_context"}), (("eventCount", 0.90),),
+        add_only=True,
+    ),
+    # "후원명/도네이션명 + 매출" 질의는 purchaseRevenue를 우선
+    _MetricRule("donation_name_revenue_rule", frozenset({"donation_name", "revenue"}), (("purchaseRevenue", 0.97),)),
+    # 후원 이름/후원명 질의는 donation_name 축 이벤트 지표를 우선
+    _MetricRule(
+        "donation_name_axis_rule", frozenset({"donation_name"}),
+        (("eventCount", 0.94), ("purchaseRevenue", 0.90)),
+    ),
+    # 프로그램/후원명 + "얼마나" 질의는 매출/구매자 지표 우선
+    _MetricRule(
+        "program_amount_rule", frozenset({"program_name", "amount_probe"}),
+        (("purchaseRevenue", 0.96), ("totalPurchasers", 0.90), ("transactions", 0.86)),
+    ),
+    # "신규/처음 구매자/후원자" 보정:
+    # 신규 사용자(newUsers)가 아니라 구매자 계열 지표를 우선한다.
+    _MetricRule(
+        "new_buyer_rule", frozenset({"new", "buyer"}),
+        (("firstTimePurchasers", 0.98), ("totalPurchasers", 0.93), ("transactions", 0.90)),
+        decays=frozenset({"newUsers", "activeUsers"}), decay=0.25,
+    ),
+    # "첫 후원자/첫 구매자 몇 퍼센트"는 비율 지표를 최우선
+    _MetricRule(
+        "first_buyer_rate_rule", frozenset({"new", "buyer", "percent"}),
+        (("firstTimePurchaserRate", 0.99), ("firstTimePurchasers", 0.93), ("totalPurchasers", 0.92)),
+        decays=frozenset({
+            "activeUsers", "newUsers", "purchaseRevenue", "itemRevenue", "purchaserRate", "purchaseToViewRate"
+        }),
+        decay=0.30,
+    ),
+    # "신규 후원자 비율"도 첫 구매자 비율로 정규화
+    _MetricRule(
+        "new_buyer_rate_rule", frozenset({"new_word", "buyer", "percent"}), (("firstTimePurchaserRate", 0.995),),
+        decays=frozenset({"purchaserRate", "purchaseToViewRate"}), decay=0.35,
+    ),
+    # "사용자수 + 구매한 사용자" 복합 질의는 activeUsers + totalPurchasers를 모두 제공
+    _MetricRule(
+        "user_and_purchaser_rule", frozenset({"user_count", "purchaser"}),
+        (("activeUsers", 0.95), ("totalPurchasers", 0.96)),
+        decays=frozenset({"transactions", "itemRevenue", "purchaseRevenue"}), decay=0.25,
+    ),
+    # "채널/소스/매체 + 구매자수" 질의는 구매자 지표 우선 (매출 지표는 후순위)
+    _MetricRule(
+        "acq_buyer_count_rule", frozenset({"acq_path", "buyer_count"}),
+        (("totalPurchasers", 0.99), ("firstTimePurchasers", 0.90)),
+        decays=_REVENUE_METRICS_WITH_TOTAL, decay=0.35,
+    ),
+    # "매출 일으킨 사용자"는 구매자 수 질의로 해석
+    _MetricRule(
+        "revenue_contributor_user_rule", frozenset({"revenue_cause", "person"}),
+        (("totalPurchasers", 0.995), ("firstTimePurchasers", 0.90)),
+        decays=_REVENUE_METRICS, decay=0.35,
+    ),
+    # "구매수 + 전체 구매자" 복합 질의는 transactions + totalPurchasers를 모두 제공
+    _MetricRule(
+        "purchase_count_and_total_purchasers_rule", frozenset({"list_sep", "purchase_count", "buyer_total"}),
+        (("transactions", 0.98), ("totalPurchasers", 0.97)),
+        decays=frozenset({"activeUsers", "newUsers"}), decay=0.20,
+    ),
+)
+
+
+# flag 비트별로 요구하는 규칙 수 (색인 비트 선택 기준)
+_METRIC_RULE_BIT_USES = Counter(
+    _METRIC_FLAG_BITS[name] for rule in _METRIC_RULES + _METRIC_LATE_RULES for name in rule.need
+)
+
+
+def _index_rules_by_bit(rules: Tuple[_MetricRule, ...]) -> Dict[int, Tuple[int, ...]]:
+    """flag 비트 -> 그 비트를 색인 비트로 가진 규칙 위치들
+
+    규칙마다 need 비트 중 가장 적은 규칙이 요구하는 비트 하나로만 색인해
+    켜지지 않은 비트에 걸린 규칙은 아예 보지 않게 한다.
+    """
+    index: Dict[int, List[int]] = {}
+    for pos, rule in enumerate(rules):
+        index_bit = min(
+            (_METRIC_FLAG_BITS[name] for name in rule.need),
+            key=lambda bit: (_METRIC_RULE_BIT_USES[bit], bit),
+        )
+        index.setdefault(index_bit, []).append(pos)
+    return {bit: tuple(positions) for bit, positions in index.items()}
+
+
+_METRIC_RULES_BY_BIT = _index_rules_by_bit(_METRIC_RULES)
+_METRIC_LATE_RULES_BY_BIT = _index_rules_by_bit(_METRIC_LATE_RULES)
+
+
+def _apply_metric_rules(
+    rules: Tuple[_MetricRule, ...],
+    rules_by_bit: Dict[int, Tuple[int, ...]],
+    have: int,
+    by_name: Dict[str, _MetricCandidate],
+) -> None:
+    """켜진 flag 비트(have) 조건을 만족하는 규칙의 boost/decay를 테이블 순서대로 적용"""
+    # 켜진 비트에 색인된 규칙만 모은 뒤 원래 순서로 평가 (규칙 적용 순서가 결과에 영향을 준다)
+    positions = []
+    bits = have
+    while bits:
+        bit = bits & -bits
+        positions.extend(rules_by_bit.get(bit, ()))
+        bits ^= bit
+    positions.sort()
+    for pos in positions:
+        rule = rules[pos]
+        if have & rule.need_mask != rule.need_mask or have & rule.forbid_mask:
+            continue
+        for name, score in rule.boosts:
+            c = by_name.get(name)
+            if c is None:
+                _add_metric_candidate(by_name, name, score, rule.matched_by)
+            elif not rule.add_only:
+                c.score = max(c.score, score)
+                c.matched_by = rule.matched_by
+        for name in rule.decays:
+            c = by_name.get(name)
+            if c is not None:
+                c.score = max(0.0, c.score - rule.decay)
+
+
+
+# _extract_entity_terms_cached: 호출마다 리스트/집합을 새로 만들지 않도록 모듈 상수로 둔다
+_CHANNEL_TOKENS = ("display", "paid", "organic", "direct", "referral", "unassigned", "cross-network")
+_ENTITY_STOP_TERMS = frozenset({
+    "무엇", "어떤", "더", "알", "수", "있어", "있는", "기준", "관련", "정보",
+    "비중", "추이", "원인", "분석", "상세", "매개변수", "파라미터", "항목", "상품", "아이템",
+    "후원 이름", "후원명", "donation_name", "이탈", "이탈율", "이탈률", "활성", "신규", "매출", "수익", "세션", "전환",
+    "클릭", "구매", "구매로", "판매", "프로그램", "국가",
+    "상품별", "아이템별", "제품별", "지난주", "이번주", "지난달", "이번달", "어제", "오늘",
+    "첫후원", "첫구매", "처음후원", "처음구매", "구매한", "사용자수", "사용자 수",
+    "후원자", "구매자", "유형", "타입", "전체"
+})
+_ENTITY_GENERIC_TERMS = frozenset({"top", "ga4", "data", "report"})
+_ENTITY_RANKING_HINTS = ("가장", "상위", "매출", "상품", "사용자")
+_ENTITY_AXIS_NOISE = ("event", "이벤트", "기준", "purchase", "click", "donation_name")
+
+
+# DimensionCandidateExtractor 규칙 키워드 그룹 (하나의 오토마톤으로 질문을 한 번만 스캔)
+_DIM_KW_DONATION = frozenset({"후원", "정기후원", "일시후원"})
+_DIM_KW_RATIO = frozenset({"비중", "구성비", "점유율", "나눠줘", "나눠", "비교"})
+_DIM_KW_DONATION_KIND = frozenset({"후원", "정기", "일시"})
+_DIM_KW_CONVERSION = frozenset({"전환", "비율", "율"})
+_DIM_KW_DONATION_TYPE = frozenset({"후원 유형", "후원유형"})
+_DIM_KW_REVENUE = frozenset({"매출", "수익", "revenue", "금액"})
+_DIM_KW_TYPE = frozenset({"유형", "타입", "종류"})
+_DIM_KW_AXIS = frozenset({"채널", "소스", "매체", "디바이스", "국가", "페이지"})
+_DIM_KW_ITEM_TYPE = frozenset({"상품", "카테고리", "item"})
+_DIM_KW_DONATION_NAME = frozenset({"후원 이름", "후원이름", "후원명", "donation_name", "이름"})
+_DIM_KW_MENU_NAME = frozenset({"menu_name", "menu name", "메뉴명", "메뉴 네임", "메뉴이름"})
+_DIM_KW_ITEM_CATEGORY = frozenset({"상품유형", "상품 유형", "상품 카테고리", "카테고리별 상품", "유형별 상품"})
+_DIM_KW_PRODUCT = frozenset({"상품"})
+_DIM_KW_RANKING = frozenset({"가장", "최고", "최저", "높은", "낮은", "1위", "top", "상위"})
+_DIM_KW_SOURCE = frozenset({"소스", "매체", "source", "medium", "광고"})
+_DIM_KW_CHANNEL = frozenset(_CHANNEL_TOKENS)
+_DIM_KW_DONATION_CLICK_TYPE = frozenset({"후원유형", "후원 유형", "후원명"})
+_DIM_KW_CLICK = frozenset({"클릭", "click"})
+_DIM_KW_DONATION_TOKEN = frozenset({"donation"})
+_DIM_KW_SCROLL = frozenset({"스크롤", "scroll"})
+
+_DIM_RULE_AC = _build_keyword_automaton(frozenset().union(
+    _DIM_KW_DONATION, _DIM_KW_RATIO, _DIM_KW_DONATION_KIND, _DIM_KW_CONVERSION, _DIM_KW_DONATION_TYPE,
+    _DIM_KW_REVENUE, _DIM_KW_TYPE, _DIM_KW_AXIS, _DIM_KW_ITEM_TYPE, _DIM_KW_DONATION_NAME,
+    _DIM_KW_MENU_NAME, _DIM_KW_ITEM_CATEGORY, _DIM_KW_PRODUCT, _DIM_KW_RANKING, _DIM_KW_SOURCE,
+    _DIM_KW_CHANNEL, _DIM_KW_DONATION_CLICK_TYPE, _DIM_KW_CLICK, _DIM_KW_DONATION_TOKEN, _DIM_KW_SCROLL,
+))
+
+# 차원 규칙 flag: (flag 이름, 원문 question 기준 여부, 키워드 그룹), flag마다 비트 하나
+_DIM_KEYWORD_FLAGS = (
+    ("donation", True, _DIM_KW_DONATION),
+    ("ratio", True, _DIM_KW_RATIO),
+    ("donation_kind", True, _DIM_KW_DONATION_KIND),
+    ("conversion", True, _DIM_KW_CONVERSION),
+    ("donation_type", False, _DIM_KW_DONATION_TYPE),
+    ("revenue", False, _DIM_KW_REVENUE),
+    ("type", False, _DIM_KW_TYPE),
+    ("axis", False, _DIM_KW_AXIS),
+    ("item_type", False, _DIM_KW_ITEM_TYPE),
+    ("donation_name", False, _DIM_KW_DONATION_NAME),
+    ("menu_name", False, _DIM_KW_MENU_NAME),
+    ("item_category", False, _DIM_KW_ITEM_CATEGORY),
+    ("product", False, _DIM_KW_PRODUCT),
+    ("ranking", False, _DIM_KW_RANKING),
+    ("source", False, _DIM_KW_SOURCE),
+    ("channel", False, _DIM_KW_CHANNEL),
+    ("donation_click_type", False, _DIM_KW_DONATION_CLICK_TYPE),
+    ("click", False, _DIM_KW_CLICK),
+    ("donation_token", False, _DIM_KW_DONATION_TOKEN),
+    ("scroll", False, _DIM_KW_SCROLL),
+)
+_DIM_FLAG_BITS = {name: 1 << i for i, (name, _, _) in enumerate(_DIM_KEYWORD_FLAGS)}
+_DIM_Q_KEYWORD_MASKS = _keyword_flag_masks(_DIM_KEYWORD_FLAGS, _DIM_FLAG_BITS, False)
+_DIM_RAW_KEYWORD_MASKS = _keyword_flag_masks(_DIM_KEYWORD_FLAGS, _DIM_FLAG_BITS, True)
+
+# 차원 이름 -> (scope, category, priority), 후보를 만들 때마다 GA4_DIMENSIONS를 다시 조회하지 않도록 import 시 한 번 계산
+_DIM_META = {
+    name: (
+        meta.get("scope") or _infer_scope(meta.get("category")),
+        meta.get("category"),
+        meta.get("priority", 0),
+    )
+    for name, meta in GA4_DIMENSIONS.items()
+}
+_UNKNOWN_DIM_META = (_infer_scope(None), None, 0)
+
+
+def _add_dimension_candidate(
+    by_name: Dict[str, Dict[str, Any]],
+    name: str,
+    score: float,
+    matched_by: str,
+) -> None:
+    """Dimension 후보를 이름 -> 후보 dict(by_name)에 추가 (scope/category/priority는 카탈로그 기준, 삽입 순서 = 후보 순서)"""
+    scope, category, priority = _DIM_META.get(name, _UNKNOWN_DIM_META)
+    candidate = {
+        "name": name,
+        "score": score,
+        "matched_by": matched_by,
+        "scope": scope,
+        "category": category,
+        "priority": priority
+    }
+    by_name[name] = candidate
+
+
+@dataclass(frozen=True)
+class _DimensionRule:
+    """need flag가 모두 켜지고 forbid flag가 모두 꺼져 있을 때 adds의 차원을 후보로 추가하는 규칙
+
+    adds: (차원, 점수) 목록, 카탈로그에 있고 아직 후보에 없는 차원만 추가 (기존 후보 점수는 건드리지 않음)
+    """
+    matched_by: str
+    need: FrozenSet[str]
+    adds: Tuple[Tuple[str, float], ...]
+    forbid: FrozenSet[str] = frozenset()
+    need_mask: int = field(init=False, repr=False, compare=False)
+    forbid_mask: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "need_mask", _flag_mask(_DIM_FLAG_BITS, self.need))
+        object.__setattr__(self, "forbid_mask", _flag_mask(_DIM_FLAG_BITS, self.forbid))
+
+
+# 차원 보강 규칙 (순서대로 적용, 먼저 추가된 후보의 점수/matched_by가 유지된다)
+_DIMENSION_RULES = (
+    # 후원 유형 비교는 itemName 차원을 우선 사용
+    _DimensionRule("donation_ratio_rule", frozenset({"donation", "ratio"}), (("itemName", 0.95),)),
+    # 후원 유형 전환 비율 -> 정기후원 여부 차원 우선
+    _DimensionRule(
+        "donation_type_conversion_rule", frozenset({"donation_kind", "conversion"}),
+        (("customEvent:is_regular_donation", 0.95),),
+    ),
+    # 후원유형 매출 질문은 정기후원 여부 차원 우선
+    _DimensionRule(
+        "donation_type_revenue_dim_rule", frozenset({"donation_type", "revenue"}),
+        (("customEvent:is_regular_donation", 0.97), ("customEvent:donation_name", 0.90)),
+    ),
+    # 일반 "유형" 후속 질문은 후원명/상품유형 우선 (Y/N 단독 응답 방지)
+    # 후원명 언급 > 상품/카테고리 언급 > 기본 순으로 하나만 적용되도록 forbid로 배타 처리
+    _DimensionRule(
+        "generic_type_followup_rule", frozenset({"type"}),
+        (("customEvent:donation_name", 0.97), ("itemCategory", 0.93), ("customEvent:is_regular_donation", 0.86)),
+        forbid=frozenset({"axis", "item_type", "donation_name"}),
+    ),
+    _DimensionRule(
+        "generic_type_followup_rule", frozenset({"type", "item_type"}),
+        (("itemCategory", 0.98), ("customEvent:donation_name", 0.90), ("customEvent:is_regular_donation", 0.82)),
+        forbid=frozenset({"axis", "donation_name"}),
+    ),
+    _DimensionRule(
+        "generic_type_followup_rule", frozenset({"type", "donation_name"}),
+        (("customEvent:donation_name", 0.99), ("itemCategory", 0.90), ("customEvent:is_regular_donation", 0.82)),
+        forbid=frozenset({"axis"}),
+    ),
+    # 메뉴명/메뉴 네임 질의는 customEvent:menu_name 우선
+    _DimensionRule("menu_name_rule", frozenset({"menu_name"}), (("customEvent:menu_name", 0.97),)),
+    # 상품유형/상품 카테고리 질의는 itemCategory 우선
+    _DimensionRule("item_category_rule", frozenset({"item_category"}), (("itemCategory", 0.98),)),
+    # 상품 랭킹/최고 매출 질문은 itemName 우선
+    _DimensionRule("item_ranking_rule", frozenset({"product", "ranking"}), (("itemName", 0.99),)),
+    # 소스/매체/광고 유입 질문은 sourceMedium 우선
+    _DimensionRule("source_medium_rule", frozenset({"source"}), (("sourceMedium", 0.97),)),
+    _DimensionRule("channel_token_rule", frozenset({"channel"}), (("defaultChannelGroup", 0.96),)),
+    # 후원유형 + 클릭수는 donation_name 우선
+    _DimensionRule(
+        "donation_click_dim_rule", frozenset({"donation_click_type", "click"}),
+        (("customEvent:donation_name", 0.96),),
+    ),
+    # donation + click 질의는 donation_name 축 우선
+    _DimensionRule(
+        "donation_token_click_dim_rule", frozenset({"donation_token", "click"}),
+        (("customEvent:donation_name", 0.98),),
+    ),
+    # 스크롤 질문은 퍼센트/페이지 차원 보강
+    _DimensionRule(
+        "scroll_dim_rule", frozenset({"scroll"}),
+        (("customEvent:percent_scrolled", 0.95), ("pagePath", 0.88)),
+    ),
+)
+
+
+def _apply_dimension_rules(have: int, by_name: Dict[str, Dict[str, Any]]) -> None:
+    """켜진 flag 비트(have) 조건을 만족하는 차원 규칙을 테이블 순서대로 적용"""
+    for rule in _DIMENSION_RULES:
+        if have & rule.need_mask != rule.need_mask or have & rule.forbid_mask:
+            continue
+        for name, score in rule.adds:
+            if name in _DIM_META and name not in by_name:
+                _add_dimension_candidate(by_name, name, score, rule.matched_by)
+
+
+# ModifierExtractor 키워드/차원 목록 (질문마다 리스트·dict 리터럴을 새로 만들지 않도록 import 시 한 번 생성)
+_CLICK_TERMS = frozenset({"클릭", "눌", "tap", "click"})
+_DONATION_NAME_TOKENS = frozenset({"후원 이름", "후원명", "donation_name"})
+_REVENUE_TOKENS = frozenset({"매출", "수익", "revenue", "금액"})
+_PURCHASE_PARAM_ALIASES = (
+    "is_regular_donation", "country_name", "domestic_children_count",
+    "overseas_children_count", "letter_translation", "donation_name",
+)
+_PURCHASE_PARAM_TERMS = frozenset(("매개변수", "파라미터", "parameter") + _PURCHASE_PARAM_ALIASES)
+_PURCHASE_PARAM_DIMS = ("eventName",) + tuple(f"customEvent:{p}" for p in _PURCHASE_PARAM_ALIASES)
+# 파라미터명 직접 질의: (파라미터, 별칭 집합), 먼저 매칭된 항목이 우선이므로 순서 유지
+_EXPLICIT_PARAM_ALIASES = (
+    ("menu_name", frozenset({"menu_name", "menu name", "메뉴명", "메뉴 네임", "메뉴이름"})),
+    ("button_name", frozenset({"button_name", "버튼명", "버튼 이름"})),
+    ("banner_name", frozenset({"banner_name", "배너명", "배너 이름"})),
+    ("click_button", frozenset({"click_button", "클릭버튼"})),
+    ("click_location", frozenset({"click_location", "클릭위치"})),
+    ("click_section", frozenset({"click_section", "클릭섹션"})),
+    ("click_text", frozenset({"click_text", "클릭텍스트", "클릭 문자열"})),
+    ("content_category", frozenset({"content_category", "콘텐츠카테고리"})),
+    ("content_name", frozenset({"content_name", "콘텐츠명", "콘텐츠이름"})),
+    ("content_type", frozenset({"content_type", "콘텐츠유형", "콘텐츠 타입"})),
+    ("country_name", frozenset({"country_name", "국가명"})),
+    ("detail_category", frozenset({"detail_category", "상세카테고리"})),
+    ("donation_name", frozenset({"donation_name", "후원명", "후원 이름"})),
+    ("event_category", frozenset({"event_category", "event category", "이벤트 카테고리"})),
+    ("event_label", frozenset({"event_label", "event label", "이벤트 라벨"})),
+    ("is_regular_donation", frozenset({"is_regular_donation", "정기후원여부"})),
+    ("letter_translation", frozenset({"letter_translation", "편지번역", "번역여부"})),
+    ("main_category", frozenset({"main_category", "메인카테고리"})),
+    ("payment_type", frozenset({"payment_type", "결제유형", "결제 타입"})),
+    ("percent_scrolled", frozenset({"percent_scrolled", "스크롤비율"})),
+    ("referrer_host", frozenset({"referrer_host", "리퍼러 호스트", "유입호스트"})),
+    ("referrer_pathname", frozenset({"referrer_pathname", "리퍼러 경로", "유입경로"})),
+    ("step", frozenset({"step", "스텝", "단계"})),
+    ("sub_category", frozenset({"sub_category", "서브카테고리"})),
+    ("domestic_children_count", frozenset({"domestic_children_count", "국내아동수"})),
+    ("overseas_children_count", frozenset({"overseas_children_count", "해외아동수"})),
+)
+
+# ModifierExtractor 규칙 키워드 그룹 (모든 그룹을 하나의 오토마톤으로 한 번에 스캔)
+_MOD_KW_TOP1_SUPERLATIVE = frozenset({"가장", "최고", "최저", "높은", "낮은"})
+_MOD_KW_TOPN_ENTITY = frozenset({"상품", "매출", "이벤트", "후원"})
+_MOD_KW_TOTAL = frozenset({"총", "전체", "합계", "total"})
+_MOD_KW_ITEM_BY = frozenset({"상품별", "상품 별", "아이템별", "제품별"})
+_MOD_KW_BREAKDOWN = frozenset({"별", "기준", "따라", "by "})
+_MOD_KW_SHARE = frozenset({"비중", "구성비", "비율", "점유율"})
+_MOD_KW_TREND = frozenset({"추이", "흐름", "일별", "변화"})
+# 한 단어로 확인하는 키워드 (규칙에서 `"..." in hits`로 바로 조회)
+_MOD_KW_TERMS = frozenset({
+    "국가", "해외", "국내", "나눠", "지난달", "이번달", "지난주", "이번주", "그 전주", "전주",
+    "경로", "상품", "유형", "후원", "클릭", "donation", "donation_click", "총 매출", "총매출"
+})
+_MOD_KW_TOTAL_REVENUE = frozenset({"총 매출", "총매출", "전체 매출"})
+_MOD_KW_AMOUNT = frozenset({"매출", "수익", "금액"})
+_MOD_KW_FULL_LIST = frozenset({
+    "전체 항목", "전체 목록", "전체 프로그램", "모든 항목", "전부 보여", "다 보여",
+    "메뉴 전체", "gnb메뉴 전체", "전체 보여줘", "이것 전체", "이거 전체"
+})
+_MOD_KW_GROUP_BY = frozenset({"묶어서", "묶어", "그룹", "group by"})
+_MOD_KW_NAME = frozenset({"name", "이름", "네임"})
+_MOD_KW_EXPLORE = frozenset({"어떤", "무슨", "어디", "가장", "많이", "상위", "top"})
+_MOD_KW_EXPLORE_TARGET = frozenset({"후원", "프로그램", "국가", "채널", "카테고리", "유형"})
+_MOD_KW_MOST = frozenset({"가장", "많이"})
+_MOD_KW_TOPN_WORD = frozenset({"top", "상위"})
+_MOD_KW_SUPERLATIVE = frozenset({"가장", "최고", "최저", "높은", "낮은", "1위"})
+_MOD_KW_TOP1_ENTITY = frozenset({"상품", "매출", "후원"})
+_MOD_KW_WHERE = frozenset({"많이", "어디", "어떤"})
+_MOD_KW_USER_SESSION = frozenset({"사용자", "유저", "세션"})
+_MOD_KW_CONVERSION_RATE = frozenset({"전환율", "conversion rate", "전환 비율"})
+_MOD_KW_ACQ_AXIS = frozenset({"채널", "소스", "매체", "경로", "source", "medium", "광고", "paid", "display"})
+_MOD_KW_SOURCE_AD = frozenset({"소스", "매체", "source", "medium", "광고"})
+_MOD_KW_INFLOW = frozenset({"채널", "소스", "매체", "유입", "경로"})
+_MOD_KW_PURCHASER_COUNT = frozenset({"구매자수", "구매자 수", "구매자", "후원자"})
+_MOD_KW_REVENUE_CAUSED = frozenset({"매출 일으킨", "구매를 일으킨", "구매 일으킨"})
+_MOD_KW_PERSON = frozenset({"사용자", "유저", "사람"})
+_MOD_KW_CHANNEL_PATH = frozenset({"채널", "유입", "경로"})
+_MOD_KW_INFLOW_SOURCE = frozenset({"채널", "소스", "매체", "유입", "경로", "source", "medium"})
+_MOD_KW_PURCHASE_REVENUE = frozenset({"구매", "매출", "수익", "후원"})
+_MOD_KW_SOURCE_MEDIUM = frozenset({"소스", "매체", "source", "medium"})
+_MOD_KW_USER_COUNT = frozenset({"사용자수", "사용자 수", "활성 사용자", "사용자"})
+_MOD_KW_PURCHASER = frozenset({"구매한 사용자", "구매 사용자", "구매자", "후원자", "구매한"})
+_MOD_KW_PURCHASE_COUNT = frozenset({"구매수", "구매 건수", "구매건수", "트랜잭션"})
+_MOD_KW_PURCHASER_TOTAL = frozenset({"전체 구매자", "구매자", "후원자"})
+_MOD_KW_LIST_SEP = frozenset({"와", "과", ","})
+_MOD_KW_TOTAL_AMOUNT = frozenset({"총 후원금액", "총후원금액", "총 매출", "총매출", "후원금액", "후원 금액"})
+_MOD_KW_COMPLETION = frozenset({"완료 건수", "완료건수", "후원 완료", "구매 건수", "구매수", "트랜잭션"})
+_MOD_KW_BUY = frozenset({"구매", "후원"})
+_MOD_KW_PRODUCT_TYPE = frozenset({"상품유형", "상품 유형", "상품 카테고리", "카테고리별 상품"})
+_MOD_KW_ENTITY_AXIS = frozenset({"캠페인", "채널", "소스", "매체", "랜딩", "페이지", "이벤트"})
+_MOD_KW_CAMPAIGN = frozenset({"캠페인"})
+_MOD_KW_CHANNEL = frozenset({"채널"})
+_MOD_KW_SOURCE_MEDIUM_KO = frozenset({"소스", "매체"})
+_MOD_KW_CHANNEL_TOKEN = frozenset(_CHANNEL_TOKENS)
+_MOD_KW_LANDING = frozenset({"랜딩", "페이지"})
+_MOD_KW_EVENT = frozenset({"이벤트"})
+_MOD_KW_BRAND = frozenset({"브랜드"})
+_MOD_KW_DETAIL = frozenset({"매개변수", "파라미터", "상세", "정보", "어떤 것을 더 알 수", "무엇을 더 알 수"})
+_MOD_KW_PROFILE_TARGET = frozenset({"후원", "상품", "아이템", "항목"})
+_MOD_KW_CLICK_TARGET = frozenset({"항목", "무엇", "뭐", "어떤", "많이", "상위"})
+_MOD_KW_CLICK_VOLUME = frozenset({"얼마나", "몇", "건수", "횟수", "일어났"})
+_MOD_KW_MENU_NAME = frozenset({"menu_name", "menu name", "메뉴명", "메뉴 네임", "메뉴이름"})
+_MOD_KW_GROUP_AXIS = frozenset({"묶어서", "묶어", "별", "기준"})
+_MOD_KW_DONATION_CLICK_TYPE = frozenset({"후원유형", "후원 유형", "후원명"})
+_MOD_KW_CLICK_COUNT = frozenset({"클릭수", "클릭", "click"})
+_MOD_KW_CLICK = frozenset({"클릭", "click"})
+_MOD_KW_MENU_AREA = frozenset({"메뉴", "gnb", "lnb", "footer"})
+_MOD_KW_DONATION_TYPE = frozenset({"후원유형", "후원 유형"})
+_MOD_KW_EVENT_LIST = frozenset({"이벤트 종류", "이벤트 목록", "무슨 이벤트", "어떤 이벤트"})
+_MOD_KW_TYPE = frozenset({"유형", "타입", "종류"})
+_MOD_KW_TYPE_AXIS = frozenset({"채널", "소스", "매체", "디바이스", "국가", "페이지"})
+_MOD_KW_DONATION_NAME_ANY = frozenset({"후원 이름", "후원이름", "후원명", "donation_name", "이름"})
+_MOD_KW_ITEM_TYPE = frozenset({"상품", "카테고리", "item"})
+_MOD_KW_FIRST = frozenset({"첫", "최초", "처음", "신규"})
+_MOD_KW_BUYER = frozenset({"후원자", "구매자"})
+_MOD_KW_PERCENT = frozenset({"퍼센트", "percent", "%", "비율", "율"})
+_MOD_KW_SCROLL = frozenset({"스크롤", "scroll"})
+_MOD_KW_PAGE = frozenset({"페이지별", "페이지", "page"})
+_MOD_KW_CORRECTION = frozenset({"말하는", "말한", "그거", "아니", "이벤트"})
+_MOD_KW_PURCHASE = frozenset({"purchase", "구매"})
+_MOD_KW_DONATION_SPLIT = frozenset({"donation_name", "후원명", "name", "구분"})
+_MOD_KW_PURCHASE_DONATION = frozenset({"purchase", "구매", "후원"})
+_MOD_KW_COUNTRY = frozenset({"국가별", "국가", "해외", "국내"})
+_MOD_KW_PROGRAM = frozenset({"프로그램", "노블클럽", "천원의 힘", "donation_name"})
+_MOD_KW_PROGRAM_PURCHASE = frozenset({"매출", "수익", "구매", "purchase", "얼마나", "몇", "후원했", "규모"})
+_MOD_KW_DONATION_NAME = frozenset({"후원 이름", "후원이름", "후원명", "donation_name"})
+_MOD_KW_DONATION_NAME_PURCHASE = frozenset({"매출", "수익", "구매", "얼마나", "몇", "후원했"})
+_MOD_KW_DONATION_KIND = frozenset({"후원 유형", "정기", "일시"})
+_MOD_KW_CONVERSION = frozenset({"전환", "비율", "율"})
+_MOD_KW_CLICK_OR_BUY = frozenset({"클릭", "구매"})
+_MOD_KW_ITEM_SCOPE = frozenset({"상품", "아이템", "제품", "item", "항목"})
+_MOD_KW_USER_SCOPE = frozenset({"사용자", "유저", "user"})
+_MOD_KW_ORDER_DESC = frozenset({"높은", "많은", "큰", "상위", "top"})
+_MOD_KW_ORDER_ASC = frozenset({"낮은", "적은", "작은", "하위", "bottom"})
+_MOD_KW_AMOUNT_OR_COUNT = frozenset({
+    "금액", "매출", "수익", "완료", "완료건수", "완료 건수",
+    "건수", "횟수", "구매수", "트랜잭션", "transaction"
+})
+
+_MODIFIER_RULE_AC = _build_keyword_automaton(frozenset().union(
+    _CLICK_TERMS, _DONATION_NAME_TOKENS, _REVENUE_TOKENS, _PURCHASE_PARAM_TERMS, _MOD_KW_AMOUNT_OR_COUNT,
+    _MOD_KW_TOP1_SUPERLATIVE, _MOD_KW_TOPN_ENTITY, _MOD_KW_TOTAL, _MOD_KW_ITEM_BY, _MOD_KW_BREAKDOWN,
+    _MOD_KW_SHARE, _MOD_KW_TREND, _MOD_KW_TERMS,
+    *(aliases for _, aliases in _EXPLICIT_PARAM_ALIASES),
+    _MOD_KW_TOTAL_REVENUE, _MOD_KW_AMOUNT, _MOD_KW_FULL_LIST, _MOD_KW_GROUP_BY, _MOD_KW_NAME, _MOD_KW_EXPLORE,
+    _MOD_KW_EXPLORE_TARGET, _MOD_KW_MOST, _MOD_KW_TOPN_WORD, _MOD_KW_SUPERLATIVE, _MOD_KW_TOP1_ENTITY,
+    _MOD_KW_WHERE, _MOD_KW_USER_SESSION, _MOD_KW_CONVERSION_RATE, _MOD_KW_ACQ_AXIS, _MOD_KW_SOURCE_AD,
+    _MOD_KW_INFLOW, _MOD_KW_PURCHASER_COUNT, _MOD_KW_REVENUE_CAUSED, _MOD_KW_PERSON, _MOD_KW_CHANNEL_PATH,
+    _MOD_KW_INFLOW_SOURCE, _MOD_KW_PURCHASE_REVENUE, _MOD_KW_SOURCE_MEDIUM, _MOD_KW_USER_COUNT,
+    _MOD_KW_PURCHASER, _MOD_KW_PURCHASE_COUNT, _MOD_KW_PURCHASER_TOTAL, _MOD_KW_LIST_SEP,
+    _MOD_KW_TOTAL_AMOUNT, _MOD_KW_COMPLETION, _MOD_KW_BUY, _MOD_KW_PRODUCT_TYPE, _MOD_KW_ENTITY_AXIS,
+    _MOD_KW_CAMPAIGN, _MOD_KW_CHANNEL, _MOD_KW_SOURCE_MEDIUM_KO, _MOD_KW_CHANNEL_TOKEN, _MOD_KW_LANDING,
+    _MOD_KW_EVENT, _MOD_KW_BRAND, _MOD_KW_DETAIL, _MOD_KW_PROFILE_TARGET, _MOD_KW_CLICK_TARGET,
+    _MOD_KW_CLICK_VOLUME, _MOD_KW_MENU_NAME, _MOD_KW_GROUP_AXIS, _MOD_KW_DONATION_CLICK_TYPE,
+    _MOD_KW_CLICK_COUNT, _MOD_KW_CLICK, _MOD_KW_MENU_AREA, _MOD_KW_DONATION_TYPE, _MOD_KW_EVENT_LIST,
+    _MOD_KW_TYPE, _MOD_KW_TYPE_AXIS, _MOD_KW_DONATION_NAME_ANY, _MOD_KW_ITEM_TYPE, _MOD_KW_FIRST,
+    _MOD_KW_BUYER, _MOD_KW_PERCENT, _MOD_KW_SCROLL, _MOD_KW_PAGE, _MOD_KW_CORRECTION, _MOD_KW_PURCHASE,
+    _MOD_KW_DONATION_SPLIT, _MOD_KW_PURCHASE_DONATION, _MOD_KW_COUNTRY, _MOD_KW_PROGRAM,
+    _MOD_KW_PROGRAM_PURCHASE, _MOD_KW_DONATION_NAME, _MOD_KW_DONATION_NAME_PURCHASE, _MOD_KW_DONATION_KIND,
+    _MOD_KW_CONVERSION, _MOD_KW_CLICK_OR_BUY, _MOD_KW_ITEM_SCOPE, _MOD_KW_USER_SCOPE, _MOD_KW_ORDER_DESC,
+    _MOD_KW_ORDER_ASC,
+))
+
+
+
+def _clean_entity_term(term: str) -> str:
+    t = _WS_RE.sub(" ", term).strip()
+    # "X별 ..." 구문은 차원 지정 표현으로 간주하여 엔티티에서 제거
+    t = _BY_SUFFIX_RE.sub("", t).strip()
+    # ranking/집계형 문장 정리
+    t = _RANK_PREFIX_RE.sub("", t).strip()
+    t = _RANK_TOKEN_RE.sub("", t).strip()
+    # 의미 없는 접미어/조사를 반복 제거
+    while True:
+        prev = t
+        t = _TRAILING_NOISE_RE.sub("", t).strip()
+        if t == prev:
+            break
+    t = _QUESTION_PREFIX_RE.sub("", t).strip()
+    return t
+
+
+@lru_cache(maxsize=2048)
+def _extract_entity_terms_cached(question: str) -> Tuple[str, ...]:
     q = (question or "").strip()
     if not q:
-        return []
+        return ()
 
+    # 각 패턴은 고정 문자열(따옴표, 접미어, 와/과 등)이 있어야만 매칭되므로
+    # 해당 문자열이 없으면 백트래킹이 많은 정규식 스캔 자체를 건너뛴다
     candidates = []
     # 따옴표 패턴: "브랜드A", 'Campaign X'
-    candidates.extend(re.findall(r"[\"']([^\"']{2,40})[\"']", q))
+    if '"' in q or "'" in q:
+        candidates.extend(_QUOTED_RE.findall(q))
     # "X에 대해/관련/기준/만/비중/추이/원인/정보"
-    candidates.extend(re.findall(r"([가-힣A-Za-z0-9_\-/\[\] ]{2,40})\s*(?:에\s*대해|에\s*대해서|관련|기준|만|비중|추이|원인|정보)", q))
+    if _ENTITY_SUFFIX_GATE_RE.search(q):
+        candidates.extend(_ENTITY_SUFFIX_RE.findall(q))
     # "A와 B", "A과 B"
-    candidates.extend(re.findall(r"([가-힣A-Za-z0-9_\-/\[\]]{2,30})\s*[와과]\s*([가-힣A-Za-z0-9_\-/\[\]]{2,30})", q))
+    if "와" in q or "과" in q:
+        candidates.extend(_AND_RE.findall(q))
     # "A, B 같은 ..."
-    candidates.extend(re.findall(r"([가-힣A-Za-z0-9_\-/\[\] ]{2,30})\s*,\s*([가-힣A-Za-z0-9_\-/\[\] ]{2,30})\s*같은", q))
+    if "," in q and "같은" in q:
+        candidates.extend(_COMMA_LIKE_RE.findall(q))
     # "X 국가별"
-    candidates.extend(re.findall(r"([가-힣A-Za-z0-9_\-/\[\] ]{2,40})\s*국가별", q))
+    if "국가별" in q:
+        candidates.extend(_COUNTRY_RE.findall(q))
     # "X의 ..." 패턴 (예: display의 소스 매체)
-    candidates.extend(re.findall(r"([가-힣A-Za-z0-9_\-/\[\]]{2,40})\s*의\s*", q))
+    if "의" in q:
+        candidates.extend(_OF_RE.findall(q))
     flat = []
     for c in candidates:
         if isinstance(c, tuple):
@@ -107,71 +1322,57 @@ def _extract_entity_terms(question: str) -> List[str]:
             flat.append(c)
 
     # 기존 후원 패턴은 유지
-    flat.extend(re.findall(r"([가-힣A-Za-z0-9_]+후원)", q))
+    if "후원" in q:
+        flat.extend(_DONATION_RE.findall(q))
     # 채널 토큰 직접 추출
-    for token in ["display", "paid", "organic", "direct", "referral", "unassigned", "cross-network"]:
-        if token in q.lower():
+    q_lower = q.lower()
+    for token in _CHANNEL_TOKENS:
+        if token in q_lower:
             flat.append(token)
 
-    stop = {
-        "무엇", "어떤", "더", "알", "수", "있어", "있는", "기준", "관련", "정보",
-        "비중", "추이", "원인", "분석", "상세", "매개변수", "파라미터", "항목", "상품", "아이템",
-        "후원 이름", "후원명", "donation_name", "이탈", "이탈율", "이탈률", "활성", "신규", "매출", "수익", "세션", "전환",
-        "클릭", "구매", "구매로", "판매", "프로그램", "국가",
-        "상품별", "아이템별", "제품별", "지난주", "이번주", "지난달", "이번달", "어제", "오늘",
-        "첫후원", "첫구매", "처음후원", "처음구매", "구매한", "사용자수", "사용자 수",
-        "후원자", "구매자", "유형", "타입", "전체"
-    }
     uniq = []
     seen = set()
 
-    def _clean_term(term: str) -> str:
-        t = re.sub(r"\s+", " ", term).strip()
-        # "X별 ..." 구문은 차원 지정 표현으로 간주하여 엔티티에서 제거
-        t = re.sub(r"[A-Za-z0-9_가-힣]+\s*별.*$", "", t).strip()
-        # ranking/집계형 문장 정리
-        t = re.sub(r"^(가장|최고|최저|상위|하위)\s*", "", t).strip()
-        t = re.sub(r"(top\s*\d+|상위\s*\d+|\d+\s*위|\d+\s*[-~]\s*\d+)\s*", "", t, flags=re.IGNORECASE).strip()
-        # 의미 없는 접미어/조사를 반복 제거
-        while True:
-            prev = t
-            t = re.sub(r"\s*(관련|기준|정보|상세|매출|전환|추이|원인|분석|채널|캠페인)$", "", t).strip()
-            t = re.sub(r"(은|는|이|가|을|를|에|의|중|중에|쪽|쪽에)$", "", t).strip()
-            if t == prev:
-                break
-        t = re.sub(r"^(어떤|무슨|무엇)\s*", "", t).strip()
-        return t
-
     for raw in flat:
-        t = _clean_term(str(raw))
+        t = _clean_entity_term(str(raw))
         if len(t) < 2:
             continue
-        if t in stop:
+        if t in _ENTITY_STOP_TERMS:
             continue
         # 지나치게 일반적인 조각 제외
-        if t.lower() in {"top", "ga4", "data", "report"}:
+        if t.lower() in _ENTITY_GENERIC_TERMS:
             continue
-        if len(t.split()) >= 3 and any(k in t for k in ["가장", "상위", "매출", "상품", "사용자"]):
+        if len(t.split()) >= 3 and any(k in t for k in _ENTITY_RANKING_HINTS):
             continue
         # 조건/축 표현 오탐 제거
-        if any(noise in t.lower() for noise in ["event", "이벤트", "기준", "purchase", "click", "donation_name"]):
+        if any(noise in t.lower() for noise in _ENTITY_AXIS_NOISE):
             continue
         key = t.lower()
         if key in seen:
             continue
         seen.add(key)
         uniq.append(t)
-    return uniq[:4]
+    return tuple(uniq[:4])
 
 
+def _extract_entity_terms(question: str) -> List[str]:
+    """엔티티 후보 추출 (같은 질문은 캐시된 결과의 사본을 반환)"""
+    return list(_extract_entity_terms_cached(question))
+
+
+@lru_cache(maxsize=2048)
 def _extract_event_name_token(question: str) -> str:
+    # Metric/Dimension 추출기가 같은 질문으로 각각 호출하므로 결과(str)를 캐시해 공유
     q = (question or "").strip()
     if not q:
         return ""
-    q_lower = q.lower()
+    q_lower = _lower_question(q)
+    # 아래 패턴은 모두 영문/숫자 토큰이 필요하므로 한글만 있는 질문은 바로 반환
+    if not _ASCII_ALNUM_RE.search(q_lower):
+        return ""
 
     # snake_case / event-like token (e.g., gnb_click)
-    tokens = re.findall(r"[a-z][a-z0-9]*(?:_[a-z0-9]+)+", q_lower)
+    tokens = _SNAKE_RE.findall(q_lower)
     if tokens:
         token = tokens[0]
         if token in KNOWN_CUSTOM_PARAM_TOKENS:
@@ -179,12 +1380,12 @@ def _extract_event_name_token(question: str) -> str:
         return token
 
     # "gnb클릭", "menu 클릭" -> gnb_click / menu_click
-    m = re.search(r"\b([a-z0-9]+)\s*클릭\b", q_lower)
+    m = _CLICK_RE.search(q_lower)
     if m:
         return f"{m.group(1)}_click"
 
     # "이벤트 xxx" where xxx is english-ish token
-    m2 = re.search(r"이벤트\s*([a-z][a-z0-9_\-]{2,40})", q_lower)
+    m2 = _EVENT_RE.search(q_lower)
     if m2:
         token = m2.group(1).replace("-", "_")
         if token in KNOWN_CUSTOM_PARAM_TOKENS:
@@ -203,76 +1404,87 @@ class DateParser:
     
     @staticmethod
     def parse(question, last_state=None, date_context=None):
-        delta_dates = {"start_date": None, "end_date": None, "is_relative_shift": False}
-        q = question.lower()
+        feats = _question_features(question)
+
+        # 1. Relative Shift (직전 상태 기준이라 캐시하지 않음, 지난주 vs 전주 비교는 아래 0)이 우선)
+        if not feats.week_compare and date_context and feats.relative_shift:
+            ls_start_s = last_state.get("start_date") if last_state else None
+            ls_end_s = last_state.get("end_date") if ls_start_s else None
+            if ls_start_s and ls_end_s:
+                try:
+                    delta_dates = {
+                        "start_date": (date.fromisoformat(ls_start_s) - timedelta(days=7)).isoformat(),
+                        "end_date": (date.fromisoformat(ls_end_s) - timedelta(days=7)).isoformat(),
+                        "is_relative_shift": True,
+                    }
+                    logging.info(f"[DateParser] Relative shift: {delta_dates['start_date']} ~ {delta_dates['end_date']}")
+                    return delta_dates
+                except Exception as e:
+                    logging.error(f"[DateParser] Relative shift error: {e}")
+
+        # 나머지는 질문과 오늘 날짜만의 함수라 (question, 오늘 ordinal) 키로 캐시 (자정이 지나면 자연히 새 키)
+        s_date, e_date, windows = DateParser._parse_for_day(question, date.today().toordinal())
+        delta_dates = {"start_date": s_date, "end_date": e_date, "is_relative_shift": False}
+        if windows:
+            delta_dates["compare_windows"] = [
+                {"label": label, "start_date": w_start, "end_date": w_end}
+                for label, w_start, w_end in windows
+            ]
+        return delta_dates
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _parse_for_day(question: str, today_ordinal: int) -> Tuple[Optional[str], Optional[str], Tuple[Tuple[str, str, str], ...]]:
+        """(start_date, end_date, compare_windows) - 호출부가 매번 새 dict로 감싸므로 캐시 값은 불변 tuple"""
+        today = date.fromordinal(today_ordinal)
+        feats = _question_features(question)
+        found = feats.periods
 
         # 0) 지난주 vs 전주 자동 기간 계산 (동일 길이 직전 구간 포함)
-        if "지난주" in q and ("전주" in q or "그 전주" in q):
-            today = date.today()
+        if feats.week_compare:
             this_monday = today - timedelta(days=today.weekday())
             last_week_start = this_monday - timedelta(days=7)
             last_week_end = last_week_start + timedelta(days=6)
             prev_week_start = last_week_start - timedelta(days=7)
             prev_week_end = last_week_end - timedelta(days=7)
-            delta_dates["start_date"] = prev_week_start.strftime("%Y-%m-%d")
-            delta_dates["end_date"] = last_week_end.strftime("%Y-%m-%d")
-            delta_dates["compare_windows"] = [
-                {"label": "prev_week", "start_date": prev_week_start.strftime("%Y-%m-%d"), "end_date": prev_week_end.strftime("%Y-%m-%d")},
-                {"label": "last_week", "start_date": last_week_start.strftime("%Y-%m-%d"), "end_date": last_week_end.strftime("%Y-%m-%d")},
-            ]
-            return delta_dates
-        
-        # 1. Relative Shift
-        if date_context and ("그 전주" in q or ("전주" in q and "지난주" not in q and "이번주" not in q)):
-            if last_state and last_state.get("start_date") and last_state.get("end_date"):
-                try:
-                    ls_start = datetime.strptime(last_state["start_date"], "%Y-%m-%d")
-                    ls_end = datetime.strptime(last_state["end_date"], "%Y-%m-%d")
-                    
-                    delta_dates["start_date"] = (ls_start - timedelta(days=7)).strftime("%Y-%m-%d")
-                    delta_dates["end_date"] = (ls_end - timedelta(days=7)).strftime("%Y-%m-%d")
-                    delta_dates["is_relative_shift"] = True
-                    logging.info(f"[DateParser] Relative shift: {delta_dates['start_date']} ~ {delta_dates['end_date']}")
-                    return delta_dates
-                except Exception as e:
-                    logging.error(f"[DateParser] Relative shift error: {e}")
+            return prev_week_start.isoformat(), last_week_end.isoformat(), (
+                ("prev_week", prev_week_start.isoformat(), prev_week_end.isoformat()),
+                ("last_week", last_week_start.isoformat(), last_week_end.isoformat()),
+            )
 
         # 2. Period phrases
-        period_phrases = []
-        if "지난주" in q: period_phrases.append("지난주")
-        if "이번주" in q: period_phrases.append("이번주")
-        if "지난달" in q: period_phrases.append("지난달")
-        if "이번달" in q: period_phrases.append("이번달")
-        if "어제" in q: period_phrases.append("어제")
-        if "오늘" in q: period_phrases.append("오늘")
-
-        if ("지난달" in q and "이번달" in q):
+        if ("지난달" in found and "이번달" in found):
             # 비교 질의: 지난달 1일 ~ 오늘 (yearMonth 분해와 조합)
-            today = date.today()
             first_this_month = today.replace(day=1)
             last_month_end = first_this_month - timedelta(days=1)
             last_month_start = last_month_end.replace(day=1)
-            delta_dates["start_date"] = last_month_start.strftime("%Y-%m-%d")
-            delta_dates["end_date"] = today.strftime("%Y-%m-%d")
-            return delta_dates
+            return last_month_start.isoformat(), today.isoformat(), ()
 
-        if period_phrases:
-            phrase = period_phrases[0]
-            s_date, e_date = DateParser._phrase_to_range(phrase)
-            delta_dates["start_date"] = s_date
-            delta_dates["end_date"] = e_date
-            return delta_dates
+        # 질문 내 위치가 아니라 아래 우선순위로 첫 번째로 걸리는 표현을 대표 기간으로 고른다
+        for phrase in _PERIOD_PRIORITY:
+            if phrase in found:
+                s_date, e_date = DateParser._phrase_to_range(phrase, today)
+                return s_date, e_date, ()
 
         # 3. Explicit dates
-        s, e = parse_dates(question)
+        # 숫자나 주/달/어제/오늘 표현이 없으면 parse_dates는 기본 범위(최근 7일)만 반환하므로 바로 계산
+        if _DATE_HINT_RE.search(question) is None:
+            return (today - timedelta(days=7)).isoformat(), today.isoformat(), ()
+        s, e = parse_dates(question, now=datetime.combine(today, datetime.min.time()))
         if s and e:
-            delta_dates["start_date"], delta_dates["end_date"] = s, e
+            return s, e, ()
+        return None, None, ()
 
-        return delta_dates
+    @staticmethod
+    def _phrase_to_range(phrase, today=None):
+        today = today or date.today()
+        return DateParser._phrase_range_for_day(phrase, today.toordinal())
 
     @staticmethod
-    def _phrase_to_range(phrase):
-        today = date.today()
+    @lru_cache(maxsize=64)
+    def _phrase_range_for_day(phrase: str, today_ordinal: int) -> Tuple[str, str]:
+        """기간 표현 -> (시작일, 종료일). 하루 동안 결과가 같으므로 (표현, 오늘 ordinal) 키로 캐시"""
+        today = date.fromordinal(today_ordinal)
         if phrase == "오늘": s = e = today
         elif phrase == "어제": s = e = today - timedelta(days=1)
         elif phrase == "지난주":
@@ -291,7 +1503,7 @@ class DateParser:
         else:
             s = today - timedelta(days=7)
             e = today
-        return s.strftime("%Y-%m-%d"), e.strftime("%Y-%m-%d")
+        return s.isoformat(), e.isoformat()
 
 
 # =============================================================================
@@ -314,80 +1526,47 @@ class IntentClassifier:
     
     @staticmethod
     def classify(question: str) -> str:
-        q = question.lower()
-        if ("지난주" in q and ("그 전주" in q or "전주" in q)):
-            return "comparison"
-        if ("지난주" in q and ("그 전주" in q or "전주" in q)) and any(k in q for k in ["사용자", "유저", "세션"]):
-            return "comparison"
-        
-        # 1. Category List (최우선)
-        if ("종류" in q and any(k in q for k in ["이벤트", "event", "목록"])) or "무슨 이벤트" in q or "어떤 이벤트" in q:
-            return "category_list"
-        
-        # 2. TopN (명시적 숫자)
-        if re.search(r'(top\s*\d+|상위\s*\d+|\d+\s*위|1\s*[-~]\s*\d+|\d+개)', q):
-            return "topn"
-        if any(k in q for k in ["가장", "최고", "최저", "높은", "낮은"]) and any(k in q for k in ["상품", "매출", "이벤트", "후원"]):
-            return "topn"
-
-        # 2.1 전체 항목/목록 후속 조회는 breakdown
-        if any(k in q for k in ["전체 항목", "전체 목록", "전체 프로그램", "모든 항목", "전부 보여", "다 보여", "전체 보여", "전체 보여줘", "이것 전체", "이거 전체"]):
-            return "breakdown"
-
-        # 2.5 비중/구성비/비율 -> breakdown
-        if any(k in q for k in ["비중", "구성비", "비율", "점유율"]):
-            return "breakdown"
-
-        # 2.55 비교형 자연어 ("A와 B는 어때?")
-        if any(k in q for k in ["어때", "어떤게", "무엇이"]) and any(k in q for k in ["와", "과", "중"]):
-            return "breakdown"
-        if any(k in q for k in ["유형", "타입", "종류"]) and any(k in q for k in ["어떤", "많이", "가장", "상위"]):
-            return "breakdown"
-
-        # 2.6 탐색형 상세질문 -> breakdown
-        if any(k in q for k in ["어떤 것을 더 알 수", "무엇을 더 알 수", "상세", "정보", "매개변수", "파라미터"]):
-            return "breakdown"
-
-        # donation_click / donation_name 클릭 분포 질문은 breakdown 우선
-        if any(k in q for k in ["donation_click", "donation_name"]) and any(k in q for k in ["클릭", "click", "주로 어떤", "순위", "많이"]):
-            return "breakdown"
-        if ("donation" in q and any(k in q for k in ["클릭", "click"])) and any(k in q for k in ["어떤", "주로", "순위", "top", "상위"]):
-            return "breakdown"
-        
-        # 3. Trend
-        if any(k in q for k in ["추이", "흐름", "일별", "변화", "trend", "daily"]):
-            return "trend"
-        
-        # 4. Comparison
-        if any(k in q for k in ["전주 대비", "비교", "차이", "증감", "compare", "vs"]):
-            return "comparison"
-        if q.strip() in ["비교", "비교해", "비교해서", "대비", "증감"]:
+        # 후속 질문 칩처럼 한 단어로 들어오는 질문은 dict 조회로 바로 반환
+        intent = _SHORT_Q_MAP.get(question.strip())
+        if intent is not None:
+            return intent
+        return IntentClassifier._classify_cached(question)
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _classify_cached(question: str) -> str:
+        feats = _question_features(question)
+        if feats.week_compare:
             return "comparison"
-        
-        # 5. Breakdown
-        if any(k in q for k in ["별", "기준", "따라", "by "]):
-            return "breakdown"
-
-        # 5.1 차원 축(채널/소스/매체 등) 언급은 breakdown
-        if any(k in q for k in ["채널", "소스", "매체", "디바이스", "기기", "랜딩", "국가", "카테고리", "유형", "타입", "종류", "메뉴명", "후원명", "광고", "paid", "display"]):
-            return "breakdown"
-        if len(q.strip()) <= 20 and any(k in q for k in ["name", "이름", "네임"]):
-            return "breakdown"
-        
-        # 6. Multi-metric (여러 지표 언급)
-        if any(k in q for k in ["와", "과", ","]) and any(k in q for k in ["사용자", "유저"]) and any(k in q for k in ["구매한", "구매자", "후원자", "구매"]):
-            return "metric_multi"
-        if any(k in q for k in ["와", "과", ","]) and any(k in q for k in ["구매수", "구매 건수", "구매건수", "트랜잭션"]) and any(k in q for k in ["전체 구매자", "구매자", "후원자"]):
-            return "metric_multi"
-        metric_count = sum(1 for m_meta in GA4_METRICS.values() 
-                          if m_meta.get("ui_name", "").lower() in q)
-        if metric_count > 1:
+
+        hits = feats.hits
+        for groups, intent in _INTENT_RULES:
+            for group in groups:
+                if hits.isdisjoint(group):
+                    break
+            else:
+                return intent
+
+        # 여러 지표 언급 (ui_name 스캔은 비용이 커서 규칙 테이블 이후에만 수행)
+        if _count_metric_mentions(feats.q) > 1:
             return "metric_multi"
         
         # Default
         return "metric_single"
 
 
+# 한 단어 질문 -> intent. 값은 규칙 테이블을 그대로 돌려 채우므로 classify 결과와 항상 같다
+_SHORT_Q_MAP: Dict[str, str] = {}
+_SHORT_Q_MAP.update(
+    (word, IntentClassifier._classify_cached(word))
+    for word in (
+        "비교", "비교해", "비교해서", "대비", "증감", "차이",
+        "추이", "흐름", "일별", "변화", "trend", "daily",
+        "비중", "비율", "상세", "전체", "채널", "소스", "매체", "국가", "디바이스",
+    )
+)
+
+
 # =============================================================================
 # Metric Candidate Extractor
 # =============================================================================
@@ -415,944 +1594,134 @@ class MetricCandidateExtractor:
         Returns:
             후보 리스트 (score 높은 순 정렬)
         """
-        q = question.lower()
-        candidates = []
-        seen = set()  # 🔥 중복 방지용
-        is_ranking_query = bool(re.search(r'(top\s*\d+|상위\s*\d+|\d+위|1-\d+|\d+개)', q))
+        # semantic 결과는 인덱스 재구성으로 바뀔 수 있어 매번 조회하고,
+        # 결과 (name, confidence)를 캐시 키에 포함한다. 호출자가 후보를 수정하므로 사본을 반환.
+        sem_matches = ()
+        if semantic:
+            sem_matches = tuple(
+                (sem.get("name"), sem.get("confidence", 0)) for sem in semantic.match_metric(question)
+            )
+        return [dict(c) for c in MetricCandidateExtractor._extract_cached(question, sem_matches)]
+
+    @staticmethod
+    @lru_cache(maxsize=2048)
+    def _extract_cached(question: str, sem_matches: Tuple[Tuple[str, float], ...]) -> Tuple[Dict[str, Any], ...]:
+        """질문 + semantic 매칭 결과에서 Metric 후보 추출"""
+        q = _lower_question(question)
+        # 🔥 이름 -> 후보 하나로 중복 방지와 갱신을 함께 처리 (삽입 순서 = 기존 후보 리스트 순서)
+        by_name: Dict[str, _MetricCandidate] = {}
+        is_ranking_query = bool(_RANKING_RE.search(q))
+        # 규칙 키워드는 오토마톤 한 번의 스캔으로 수집 (일부 규칙은 원문 question 기준)
+        q_hits = _keyword_hits(_METRIC_RULE_AC, q)
+        raw_hits = _keyword_hits(_METRIC_RULE_AC, question)
+        # 규칙 조건 flag는 여기서 한 번만 평가해 비트 마스크(have)로 모으고 아래 규칙 테이블이 재사용
+        have = _hits_flag_mask(q_hits, raw_hits, _METRIC_Q_KEYWORD_MASKS, _METRIC_RAW_KEYWORD_MASKS)
+        if "클릭수" in q_hits or ("클릭" in q_hits and not q_hits.isdisjoint(_METRIC_KW_COUNT)):
+            have |= _MF_CLICK_COUNT
+        if _DONATION_ENTITY_RE.search(question):
+            have |= _MF_DONATION_ENTITY
+        # 이벤트 토큰이 없어도 "후원 + 클릭"이면 donation_click 이벤트 질의로 본다
+        if _extract_event_name_token(question) or ("후원" in q_hits and "클릭" in q_hits):
+            have |= _MF_EVENT_TOKEN
         
-        # 1. Explicit matching (substring)
-        for metric_name, meta in GA4_METRICS.items():
-            score = MetricCandidateExtractor._calculate_explicit_score(q, metric_name, meta)
+        # 1. Explicit matching (Aho-Corasick 단일 스캔)
+        explicit_scores = _explicit_scores(_METRIC_AC, q)
+        for metric_name in sorted(explicit_scores, key=_METRIC_ORDER.__getitem__):
+            score = explicit_scores[metric_name]
             
             if score > 0:
-                scope = meta.get("scope") or MetricCandidateExtractor._infer_scope_from_category(
-                    meta.get("category")
-                )
-                
-                candidates.append({
-                    "name": metric_name,
-                    "score": score,
-                    "matched_by": "explicit",
-                    "scope": scope,
-                    "priority": meta.get("priority", 0)
-                })
-                seen.add(metric_name)
+                _add_metric_candidate(by_name, metric_name, score, "explicit")
         
         # 2. Semantic matching
-        if semantic:
-            sem_candidates = semantic.match_metric(question)
-            for sem in sem_candidates:
-                name = sem.get("name")
-                confidence = sem.get("confidence", 0)
-                
-                # 이미 explicit으로 찾은 것은 제외
-                if name in seen:
-                    continue
-                
-                if confidence >= 0.25:  # 최소 임계값
-                    meta = GA4_METRICS.get(name, {})
-                    scope = meta.get("scope") or MetricCandidateExtractor._infer_scope_from_category(
-                        meta.get("category")
-                    )
-                    
-                    candidates.append({
-                        "name": name,
-                        "score": confidence,
-                        "matched_by": "semantic",
-                        "scope": scope,
-                        "priority": meta.get("priority", 0)
-                    })
-                    seen.add(name)
+        for name, confidence in sem_matches:
+            # 이미 explicit으로 찾은 것은 제외
+            if name in by_name:
+                continue
+            
+            if confidence >= 0.25:  # 최소 임계값
+                _add_metric_candidate(by_name, name, confidence, "semantic")
         
         # 🔥 Boost item-scoped metrics if question contains item keywords
-        item_keywords = ["상품", "아이템", "제품", "상품별", "아이템별", "제품별", "항목", "브랜드"]
-        if any(kw in question for kw in item_keywords):
-            for candidate in candidates:
-                if candidate.get("scope") == "item":
-                    candidate["score"] = min(candidate["score"] + 0.15, 1.0)
-                    logging.info(f"[MetricExtractor] Boosted item-scoped metric: {candidate['name']} -> {candidate['score']:.2f}")
+        if _ITEM_KW_RE.search(question):
+            for candidate in by_name.values():
+                if candidate.scope == "item":
+                    candidate.score = min(candidate.score + 0.15, 1.0)
+                    logging.info("[MetricExtractor] Boosted item-scoped metric: %s -> %.2f", candidate.name, candidate.score)
 
         # TopN + 항목 류 질문에서는 item scope를 추가 가중
-        if is_ranking_query and any(kw in question for kw in ["항목", "상품", "아이템", "제품"]):
-            for candidate in candidates:
-                if candidate.get("scope") == "item":
-                    candidate["score"] = min(candidate["score"] + 0.20, 1.0)
-                elif candidate.get("scope") == "event":
-                    candidate["score"] = max(candidate["score"] - 0.08, 0.0)
+        if is_ranking_query and _ITEM_RANK_KW_RE.search(question):
+            for candidate in by_name.values():
+                if candidate.scope == "item":
+                    candidate.score = min(candidate.score + 0.20, 1.0)
+                elif candidate.scope == "event":
+                    candidate.score = max(candidate.score - 0.08, 0.0)
 
         # item 힌트가 있으나 item 후보가 없으면, 컨셉/카테고리 기반으로 item 후보 보강
-        has_item_hint = any(kw in question for kw in ["상품", "아이템", "제품", "항목", "후원", "브랜드"])
-        has_item_candidate = any(c.get("scope") == "item" for c in candidates)
+        has_item_hint = bool(_ITEM_HINT_RE.search(question))
+        has_item_candidate = any(c.scope == "item" for c in by_name.values())
         if has_item_hint and not has_item_candidate:
             top_concept = None
             top_category = None
-            if candidates:
-                top_name = candidates[0]["name"]
-                top_meta = GA4_METRICS.get(top_name, {})
-                top_concept = top_meta.get("concept")
-                top_category = top_meta.get("category")
+            if by_name:
+                top_name = next(iter(by_name))
+                _, _, top_concept, top_category = _METRIC_META.get(top_name, _UNKNOWN_METRIC_META)
 
             inferred = []
-            for m_name, meta in GA4_METRICS.items():
-                m_scope = meta.get("scope") or MetricCandidateExtractor._infer_scope_from_category(meta.get("category"))
-                if m_scope != "item":
-                    continue
-                if top_concept and meta.get("concept") != top_concept:
+            for m_name, m_priority, m_concept, m_category in _ITEM_SCOPE_METRICS:
+                if top_concept and m_concept != top_concept:
                     continue
-                if (not top_concept) and top_category and meta.get("category") != top_category:
+                if (not top_concept) and top_category and m_category != top_category:
                     continue
-                inferred.append((m_name, meta.get("priority", 0)))
+                inferred.append((m_name, m_priority))
 
-            inferred.sort(key=lambda x: x[1], reverse=True)
-            for m_name, pr in inferred[:3]:
-                if m_name in seen:
+            for m_name, pr in nlargest(3, inferred, key=itemgetter(1)):
+                if m_name in by_name:
                     continue
-                candidates.append({
-                    "name": m_name,
-                    "score": min(0.72 + (pr * 0.02), 0.88),
-                    "matched_by": "scope_infer",
-                    "scope": "item",
-                    "priority": pr
-                })
-                seen.add(m_name)
-                logging.info(f"[MetricExtractor] Inferred item metric candidate: {m_name}")
+                _add_metric_candidate(by_name, m_name, min(0.72 + (pr * 0.02), 0.88), "scope_infer")
+                logging.info("[MetricExtractor] Inferred item metric candidate: %s", m_name)
 
         # 후원 유형 비중/구성비 질문은 item 매출 지표를 우선 후보로 추가
-        donation_keywords = ["후원", "정기후원", "일시후원"]
-        ratio_keywords = ["비중", "구성비", "점유율", "나눠줘", "나눠", "비교"]
-        if any(k in question for k in donation_keywords) and any(k in question for k in ratio_keywords):
+        if have & _MF_DONATION and have & _MF_RATIO:
             boosted = []
-            for m_name in ["itemRevenue", "grossItemRevenue", "purchaseRevenue"]:
-                if m_name in seen:
+            for m_name in _DONATION_RATIO_METRICS:
+                if m_name in by_name:
                     continue
-                meta = GA4_METRICS.get(m_name, {})
-                scope = meta.get("scope") or MetricCandidateExtractor._infer_scope_from_category(
-                    meta.get("category")
-                )
-                score = 0.94 if m_name in ["itemRevenue", "grossItemRevenue"] else 0.86
-                candidates.append({
-                    "name": m_name,
-                    "score": score,
-                    "matched_by": "donation_ratio_rule",
-                    "scope": scope,
-                    "priority": meta.get("priority", 0)
-                })
-                seen.add(m_name)
+                score = 0.94 if m_name in _ITEM_REVENUE_METRICS else 0.86
+                _add_metric_candidate(by_name, m_name, score, "donation_ratio_rule")
                 boosted.append(m_name)
             if boosted:
-                logging.info(f"[MetricExtractor] Donation ratio boost: {boosted}")
-
-        # 후원 관련 "많이/가장/어떤게" 질문은 후원 매출/건수 우선
-        if any(k in question for k in donation_keywords) and any(k in question for k in ["많이", "가장", "어떤", "상위", "top"]):
-            prefer = [("itemRevenue", 0.94), ("purchaseRevenue", 0.90), ("transactions", 0.88)]
-            for m_name, sc in prefer:
-                if m_name in seen:
-                    for c in candidates:
-                        if c.get("name") == m_name:
-                            c["score"] = max(c.get("score", 0), sc)
-                            c["matched_by"] = "donation_volume_rule"
-                    continue
-                meta = GA4_METRICS.get(m_name, {})
-                scope = meta.get("scope") or MetricCandidateExtractor._infer_scope_from_category(meta.get("category"))
-                candidates.append({
-                    "name": m_name,
-                    "score": sc,
-                    "matched_by": "donation_volume_rule",
-                    "scope": scope,
-                    "priority": meta.get("priority", 0)
-                })
-                seen.add(m_name)
-
-        # 판매/반응 자연어 보강
-        if any(k in question for k in ["판매", "팔리", "매출", "수익"]):
-            for m_name, sc in [("purchaseRevenue", 0.90), ("itemRevenue", 0.86), ("transactions", 0.84)]:
-                if m_name in seen:
-                    for c in candidates:
-                        if c.get("name") == m_name:
-                            c["score"] = max(c.get("score", 0), sc)
-                            c["matched_by"] = "sales_semantic_rule"
-                    continue
-                meta = GA4_METRICS.get(m_name, {})
-                scope = meta.get("scope") or MetricCandidateExtractor._infer_scope_from_category(meta.get("category"))
-                candidates.append({
-                    "name": m_name,
-                    "score": sc,
-                    "matched_by": "sales_semantic_rule",
-                    "scope": scope,
-                    "priority": meta.get("priority", 0)
-                })
-                seen.add(m_name)
-
-        # 유입 축(소스/매체/채널) + 구매/매출 질문은 구매 기여 지표 우선
-        has_acq_axis = any(k in q for k in ["소스", "매체", "채널", "유입", "source", "medium"])
-        has_purchase_intent = any(k in q for k in ["구매", "매출", "수익", "후원"])
-        if has_acq_axis and has_purchase_intent:
-            for m_name, sc in [("purchaseRevenue", 0.97), ("totalPurchasers", 0.95), ("transactions", 0.90)]:
-                if m_name in seen:
-                    for c in candidates:
-                        if c.get("name") == m_name:
-                            c["score"] = max(c.get("score", 0), sc)
-                            c["matched_by"] = "acq_purchase_slot_rule"
-                    continue
-                meta = GA4_METRICS.get(m_name, {})
-                scope = meta.get("scope") or MetricCandidateExtractor._infer_scope_from_category(meta.get("category"))
-                candidates.append({
-                    "name": m_name,
-                    "score": sc,
-                    "matched_by": "acq_purchase_slot_rule",
-                    "scope": scope,
-                    "priority": meta.get("priority", 0)
-                })
-                seen.add(m_name)
-
-        # "후원 유형별 매출"은 이벤트 파라미터 기반 매출 집계 우선
-        if any(k in q for k in ["후원 유형", "후원유형"]) and any(k in q for k in ["매출", "수익", "금액", "revenue"]):
-            for m_name, sc in [("purchaseRevenue", 0.96), ("eventCount", 0.86)]:
-                if m_name in seen:
-                    for c in candidates:
-                        if c.get("name") == m_name:
-                            c["score"] = max(c.get("score", 0), sc)
-                            c["matched_by"] = "donation_type_revenue_rule"
-                    continue
-                meta = GA4_METRICS.get(m_name, {})
-                scope = meta.get("scope") or MetricCandidateExtractor._infer_scope_from_category(meta.get("category"))
-                candidates.append({
-                    "name": m_name,
-                    "score": sc,
-                    "matched_by": "donation_type_revenue_rule",
-                    "scope": scope,
-                    "priority": meta.get("priority", 0)
-                })
-                seen.add(m_name)
+                logging.info("[MetricExtractor] Donation ratio boost: %s", boosted)
 
-        # 이벤트 종류/목록 질문은 eventCount 우선
-        if any(k in q for k in ["이벤트 종류", "이벤트 목록", "무슨 이벤트", "어떤 이벤트"]):
-            if "eventCount" in seen:
-                for c in candidates:
-                    if c.get("name") == "eventCount":
-                        c["score"] = max(c.get("score", 0), 0.99)
-                        c["matched_by"] = "event_category_list_rule"
-            else:
-                meta = GA4_METRICS.get("eventCount", {})
-                candidates.append({
-                    "name": "eventCount",
-                    "score": 0.99,
-                    "matched_by": "event_category_list_rule",
-                    "scope": meta.get("scope") or MetricCandidateExtractor._infer_scope_from_category(meta.get("category")),
-                    "priority": meta.get("priority", 0)
-                })
-                seen.add("eventCount")
-
-        # purchase vs donation_click 비교는 건수(eventCount) 우선
-        if ("donation_click" in q) and any(k in q for k in ["purchase", "구매"]):
-            if "eventCount" in seen:
-                for c in candidates:
-                    if c.get("name") == "eventCount":
-                        c["score"] = max(c.get("score", 0), 0.97)
-                        c["matched_by"] = "event_pair_compare_rule"
-            else:
-                meta = GA4_METRICS.get("eventCount", {})
-                candidates.append({
-                    "name": "eventCount",
-                    "score": 0.97,
-                    "matched_by": "event_pair_compare_rule",
-                    "scope": meta.get("scope") or MetricCandidateExtractor._infer_scope_from_category(meta.get("category")),
-                    "priority": meta.get("priority", 0)
-                })
-                seen.add("eventCount")
-
-        # 클릭/이벤트 항목 탐색 질문은 이벤트 카운트 지표 우선
-        click_terms = ["클릭", "눌", "tap", "click"]
-        item_probe_terms = ["항목", "무엇", "뭐", "어떤", "많이", "상위"]
-        if any(k in q for k in click_terms) and any(k in q for k in item_probe_terms):
-            for m_name, sc in [("eventCount", 0.96), ("keyEvents", 0.88), ("totalUsers", 0.80)]:
-                if m_name in seen:
-                    for c in candidates:
-                        if c.get("name") == m_name:
-                            c["score"] = max(c.get("score", 0), sc)
-                            c["matched_by"] = "click_event_rule"
-                    continue
-                meta = GA4_METRICS.get(m_name, {})
-                scope = meta.get("scope") or MetricCandidateExtractor._infer_scope_from_category(meta.get("category"))
-                candidates.append({
-                    "name": m_name,
-                    "score": sc,
-                    "matched_by": "click_event_rule",
-                    "scope": scope,
-                    "priority": meta.get("priority", 0)
-                })
-                seen.add(m_name)
-            # 매출 언급이 없으면 금액 지표는 후순위로 낮춤
-            if not any(k in q for k in ["매출", "수익", "금액", "revenue"]):
-                for c in candidates:
-                    if c.get("name") in ["purchaseRevenue", "itemRevenue", "grossItemRevenue"]:
-                        c["score"] = max(0.0, c.get("score", 0) - 0.25)
-
-        # "정기후원의 클릭수" 같은 패턴은 donation_click + donation_name(eventCount)로 보정
-        has_donation_entity = bool(re.search(r"[가-힣A-Za-z0-9_]+후원", question))
-        if has_donation_entity and any(k in q for k in ["클릭수", "클릭", "click"]) and not any(k in q for k in ["메뉴", "gnb", "lnb", "footer"]):
-            for m_name, sc in [("eventCount", 0.99), ("keyEvents", 0.90)]:
-                if m_name in seen:
-                    for c in candidates:
-                        if c.get("name") == m_name:
-                            c["score"] = max(c.get("score", 0), sc)
-                            c["matched_by"] = "donation_entity_click_rule"
-                    continue
-                meta = GA4_METRICS.get(m_name, {})
-                scope = meta.get("scope") or MetricCandidateExtractor._infer_scope_from_category(meta.get("category"))
-                candidates.append({
-                    "name": m_name,
-                    "score": sc,
-                    "matched_by": "donation_entity_click_rule",
-                    "scope": scope,
-                    "priority": meta.get("priority", 0)
-                })
-                seen.add(m_name)
-
-        # 스크롤 질의는 scroll 이벤트 카운트 우선
-        if any(k in q for k in ["스크롤", "scroll"]):
-            for m_name, sc in [("eventCount", 0.95), ("keyEvents", 0.84), ("scrolledUsers", 0.82)]:
-                if m_name in seen:
-                    for c in candidates:
-                        if c.get("name") == m_name:
-                            c["score"] = max(c.get("score", 0), sc)
-                            c["matched_by"] = "scroll_rule"
-                    continue
-                meta = GA4_METRICS.get(m_name, {})
-                if not meta:
-                    continue
-                scope = meta.get("scope") or MetricCandidateExtractor._infer_scope_from_category(meta.get("category"))
-                candidates.append({
-                    "name": m_name,
-                    "score": sc,
-                    "matched_by": "scroll_rule",
-                    "scope": scope,
-                    "priority": meta.get("priority", 0)
-                })
-                seen.add(m_name)
-
-        # 이벤트 파라미터 존재/조회 질의는 eventCount로 기본 조회 가능하게 보강
-        event_token = _extract_event_name_token(question)
-        if ("후원" in q and "클릭" in q) and not event_token:
-            event_token = "donation_click"
-        if event_token:
-            if "eventCount" in seen:
-                for c in candidates:
-                    if c.get("name") == "eventCount":
-                        c["score"] = max(c.get("score", 0), 0.97)
-                        c["matched_by"] = "event_token_metric_rule"
-            else:
-                meta = GA4_METRICS.get("eventCount", {})
-                candidates.append({
-                    "name": "eventCount",
-                    "score": 0.97,
-                    "matched_by": "event_token_metric_rule",
-                    "scope": meta.get("scope") or MetricCandidateExtractor._infer_scope_from_category(meta.get("category")),
-                    "priority": meta.get("priority", 0)
-                })
-                seen.add("eventCount")
-        param_probe_terms = ["파라미터", "매개변수", "네임", "이름", "name", "값", "없어", "있어", "menu_name", "menu name", "메뉴명", "메뉴 네임"]
-        if event_token and any(k in q for k in param_probe_terms):
-            if "eventCount" in seen:
-                for c in candidates:
-                    if c.get("name") == "eventCount":
-                        c["score"] = max(c.get("score", 0), 0.90)
-                        c["matched_by"] = "event_param_probe_rule"
-            else:
-                meta = GA4_METRICS.get("eventCount", {})
-                candidates.append({
-                    "name": "eventCount",
-                    "score": 0.90,
-                    "matched_by": "event_param_probe_rule",
-                    "scope": meta.get("scope") or MetricCandidateExtractor._infer_scope_from_category(meta.get("category")),
-                    "priority": meta.get("priority", 0)
-                })
-                seen.add("eventCount")
-
-        # 이벤트 클릭 발생량 질의는 eventCount를 강하게 우선
-        if any(k in q for k in ["클릭", "click"]) and any(k in q for k in ["얼마나", "몇", "건수", "횟수", "일어났", "발생"]):
-            if "eventCount" in seen:
-                for c in candidates:
-                    if c.get("name") == "eventCount":
-                        c["score"] = max(c.get("score", 0), 0.98)
-                        c["matched_by"] = "click_volume_rule"
-            else:
-                meta = GA4_METRICS.get("eventCount", {})
-                candidates.append({
-                    "name": "eventCount",
-                    "score": 0.98,
-                    "matched_by": "click_volume_rule",
-                    "scope": meta.get("scope") or MetricCandidateExtractor._infer_scope_from_category(meta.get("category")),
-                    "priority": meta.get("priority", 0)
-                })
-                seen.add("eventCount")
-            for c in candidates:
-                if c.get("name") in ["purchaseRevenue", "itemRevenue", "grossItemRevenue", "totalRevenue"]:
-                    c["score"] = max(0.0, c.get("score", 0) - 0.35)
-
-        # 파라미터명이 직접 언급된 질문은 eventCount를 기본 지표로 사용
-        if any(tok in q for tok in KNOWN_CUSTOM_PARAM_TOKENS):
-            if "eventCount" in seen:
-                for c in candidates:
-                    if c.get("name") == "eventCount":
-                        c["score"] = max(c.get("score", 0), 0.90)
-                        c["matched_by"] = "custom_param_metric_rule"
-            else:
-                meta = GA4_METRICS.get("eventCount", {})
-                candidates.append({
-                    "name": "eventCount",
-                    "score": 0.90,
-                    "matched_by": "custom_param_metric_rule",
-                    "scope": meta.get("scope") or MetricCandidateExtractor._infer_scope_from_category(meta.get("category")),
-                    "priority": meta.get("priority", 0)
-                })
-                seen.add("eventCount")
-
-        # "클릭수" 질의는 page_view가 아니라 이벤트 카운트를 우선
-        if "클릭수" in q or ("클릭" in q and any(k in q for k in ["수", "개수", "횟수"])):
-            if "eventCount" in seen:
-                for c in candidates:
-                    if c.get("name") == "eventCount":
-                        c["score"] = max(c.get("score", 0), 0.96)
-                        c["matched_by"] = "click_count_rule"
-            else:
-                meta = GA4_METRICS.get("eventCount", {})
-                candidates.append({
-                    "name": "eventCount",
-                    "score": 0.96,
-                    "matched_by": "click_count_rule",
-                    "scope": meta.get("scope") or MetricCandidateExtractor._infer_scope_from_category(meta.get("category")),
-                    "priority": meta.get("priority", 0)
-                })
-                seen.add("eventCount")
-            for c in candidates:
-                if c.get("name") in ["screenPageViews", "views"]:
-                    c["score"] = max(0.0, c.get("score", 0) - 0.20)
-
-        # 묶기/그룹 질문은 분해 지표(eventCount) 우선, 매출 지표는 후순위
-        if any(k in q for k in ["묶어서", "묶어", "group by"]) and not any(k in q for k in ["매출", "수익", "금액", "revenue"]):
-            if "eventCount" in seen:
-                for c in candidates:
-                    if c.get("name") == "eventCount":
-                        c["score"] = max(c.get("score", 0), 0.94)
-                        c["matched_by"] = "group_by_rule"
-            else:
-                meta = GA4_METRICS.get("eventCount", {})
-                candidates.append({
-                    "name": "eventCount",
-                    "score": 0.94,
-                    "matched_by": "group_by_rule",
-                    "scope": meta.get("scope") or MetricCandidateExtractor._infer_scope_from_category(meta.get("category")),
-                    "priority": meta.get("priority", 0)
-                })
-                seen.add("eventCount")
-            for c in candidates:
-                if c.get("name") in ["itemRevenue", "grossItemRevenue", "purchaseRevenue"]:
-                    c["score"] = max(0.0, c.get("score", 0) - 0.22)
-
-        if any(k in question for k in ["반응", "효과", "성과"]):
-            for m_name, sc in [("keyEvents", 0.84), ("engagementRate", 0.80), ("eventCount", 0.78)]:
-                if m_name in seen:
-                    for c in candidates:
-                        if c.get("name") == m_name:
-                            c["score"] = max(c.get("score", 0), sc)
-                            c["matched_by"] = "reaction_semantic_rule"
-                    continue
-                meta = GA4_METRICS.get(m_name, {})
-                scope = meta.get("scope") or MetricCandidateExtractor._infer_scope_from_category(meta.get("category"))
-                candidates.append({
-                    "name": m_name,
-                    "score": sc,
-                    "matched_by": "reaction_semantic_rule",
-                    "scope": scope,
-                    "priority": meta.get("priority", 0)
-                })
-                seen.add(m_name)
-            # 프로그램/항목 반응 질문은 item 스코프 지표도 함께 후보로 제공
-            if any(k in question for k in ["프로그램", "항목", "상품", "후원"]):
-                for m_name, sc in [("itemRevenue", 0.86), ("transactions", 0.82), ("itemsViewed", 0.80)]:
-                    if m_name in seen:
-                        for c in candidates:
-                            if c.get("name") == m_name:
-                                c["score"] = max(c.get("score", 0), sc)
-                                c["matched_by"] = "reaction_item_scope_rule"
-                        continue
-                    meta = GA4_METRICS.get(m_name, {})
-                    scope = meta.get("scope") or MetricCandidateExtractor._infer_scope_from_category(meta.get("category"))
-                    candidates.append({
-                        "name": m_name,
-                        "score": sc,
-                        "matched_by": "reaction_item_scope_rule",
-                        "scope": scope,
-                        "priority": meta.get("priority", 0)
-                    })
-                    seen.add(m_name)
-            # 프로그램 질문은 donation_name(커스텀) 기준 event 스코프도 강화
-            if any(k in question for k in ["프로그램", "노블클럽", "천원의 힘", "donation_name"]):
-                for m_name, sc in [("eventCount", 0.93), ("keyEvents", 0.90), ("purchaseRevenue", 0.82)]:
-                    if m_name in seen:
-                        for c in candidates:
-                            if c.get("name") == m_name:
-                                c["score"] = max(c.get("score", 0), sc)
-                                c["matched_by"] = "reaction_program_event_rule"
-                        continue
-                    meta = GA4_METRICS.get(m_name, {})
-                    scope = meta.get("scope") or MetricCandidateExtractor._infer_scope_from_category(meta.get("category"))
-                    candidates.append({
-                        "name": m_name,
-                        "score": sc,
-                        "matched_by": "reaction_program_event_rule",
-                        "scope": scope,
-                        "priority": meta.get("priority", 0)
-                    })
-                    seen.add(m_name)
-
-        # 국가별 비율/구성비 질문은 eventCount 우선
-        if any(k in q for k in ["국가", "country"]) and any(k in q for k in ["비율", "비중", "구성비", "점유율"]):
-            for m_name, sc in [("eventCount", 0.92), ("totalUsers", 0.80)]:
-                if m_name in seen:
-                    for c in candidates:
-                        if c.get("name") == m_name:
-                            c["score"] = max(c.get("score", 0), sc)
-                            c["matched_by"] = "country_ratio_rule"
-                    continue
-                meta = GA4_METRICS.get(m_name, {})
-                scope = meta.get("scope") or MetricCandidateExtractor._infer_scope_from_category(meta.get("category"))
-                candidates.append({
-                    "name": m_name,
-                    "score": sc,
-                    "matched_by": "country_ratio_rule",
-                    "scope": scope,
-                    "priority": meta.get("priority", 0)
-                })
-                seen.add(m_name)
-
-        # 클릭-구매 전환 비율
-        if any(k in question for k in ["클릭", "조회"]) and any(k in question for k in ["구매", "후원"]) and any(k in question for k in ["전환", "비율", "율"]):
-            for m_name, sc in [("purchaserRate", 0.97), ("purchaseToViewRate", 0.90)]:
-                if m_name in seen:
-                    for c in candidates:
-                        if c.get("name") == m_name:
-                            c["score"] = max(c.get("score", 0), sc)
-                            c["matched_by"] = "click_purchase_conversion_rule"
-                    continue
-                meta = GA4_METRICS.get(m_name, {})
-                scope = meta.get("scope") or MetricCandidateExtractor._infer_scope_from_category(meta.get("category"))
-                candidates.append({
-                    "name": m_name,
-                    "score": sc,
-                    "matched_by": "click_purchase_conversion_rule",
-                    "scope": scope,
-                    "priority": meta.get("priority", 0)
-                })
-                seen.add(m_name)
-
-        # 일반 전환율 질의는 rate 계열 지표 우선
-        if any(k in q for k in ["전환율", "conversion rate", "전환 비율"]):
-            prefer_rates = {"sessionKeyEventRate": 0.98, "purchaserRate": 0.92, "purchaseToViewRate": 0.90}
-            for c in candidates:
-                n = c.get("name")
-                if n in prefer_rates:
-                    c["score"] = max(c.get("score", 0), prefer_rates[n])
-                    c["matched_by"] = "generic_conversion_rate_rule"
-                elif n in {"keyEvents", "eventCount", "activeUsers"}:
-                    c["score"] = max(0.0, c.get("score", 0) - 0.28)
-            for m_name, sc in prefer_rates.items():
-                if m_name in seen:
-                    continue
-                meta = GA4_METRICS.get(m_name, {})
-                scope = meta.get("scope") or MetricCandidateExtractor._infer_scope_from_category(meta.get("category"))
-                candidates.append({
-                    "name": m_name,
-                    "score": sc,
-                    "matched_by": "generic_conversion_rate_rule",
-                    "scope": scope,
-                    "priority": meta.get("priority", 0)
-                })
-                seen.add(m_name)
-
-        # 주간 비교(지난주 vs 그 전주) + 사용자 계열 질문은 activeUsers 우선
-        if ("지난주" in q and ("그 전주" in q or "전주" in q)) and any(k in q for k in ["사용자", "유저"]):
-            prefer = {"activeUsers": 0.995, "newUsers": 0.85}
-            for c in candidates:
-                n = c.get("name")
-                if n in prefer:
-                    c["score"] = max(c.get("score", 0), prefer[n])
-                    c["matched_by"] = "week_compare_users_rule"
-                elif n in {"eventCount", "keyEvents", "purchaseRevenue", "itemRevenue"}:
-                    c["score"] = max(0.0, c.get("score", 0) - 0.30)
-            for m_name, sc in prefer.items():
-                if m_name in seen:
-                    continue
-                meta = GA4_METRICS.get(m_name, {})
-                scope = meta.get("scope") or MetricCandidateExtractor._infer_scope_from_category(meta.get("category"))
-                candidates.append({
-                    "name": m_name,
-                    "score": sc,
-                    "matched_by": "week_compare_users_rule",
-                    "scope": scope,
-                    "priority": meta.get("priority", 0)
-                })
-                seen.add(m_name)
+        _apply_metric_rules(_METRIC_RULES, _METRIC_RULES_BY_BIT, have, by_name)
 
         # 엔티티 비교 질문인데 metric이 비어있을 때 기본 지표 보강
-        has_entities = len(_extract_entity_terms(question)) > 0
-        if has_entities and not candidates:
-            for m_name, sc in [("itemRevenue", 0.84), ("purchaseRevenue", 0.82), ("transactions", 0.80)]:
-                meta = GA4_METRICS.get(m_name, {})
-                scope = meta.get("scope") or MetricCandidateExtractor._infer_scope_from_category(meta.get("category"))
-                candidates.append({
-                    "name": m_name,
-                    "score": sc,
-                    "matched_by": "entity_fallback_metric_rule",
-                    "scope": scope,
-                    "priority": meta.get("priority", 0)
-                })
-                seen.add(m_name)
-
-        # purchase 이벤트 매개변수 조회는 eventCount를 기본 지표로 보강
-        purchase_param_aliases = [
-            "is_regular_donation", "country_name", "domestic_children_count",
-            "overseas_children_count", "letter_translation", "donation_name"
-        ]
-        if (any(k in q for k in ["매개변수", "파라미터", "parameter"]) or any(k in q for k in purchase_param_aliases)) and any(k in q for k in ["purchase", "구매", "후원"]):
-            if "eventCount" not in seen:
-                meta = GA4_METRICS.get("eventCount", {})
-                candidates.append({
-                    "name": "eventCount",
-                    "score": 0.90,
-                    "matched_by": "purchase_param_rule",
-                    "scope": meta.get("scope") or MetricCandidateExtractor._infer_scope_from_category(meta.get("category")),
-                    "priority": meta.get("priority", 0)
-                })
-                seen.add("eventCount")
-
-        # "후원명/도네이션명 + 매출" 질의는 purchaseRevenue를 우선
-        donation_name_tokens = ["후원 이름", "후원명", "donation_name"]
-        revenue_tokens = ["매출", "수익", "revenue", "금액"]
-        if any(k in q for k in donation_name_tokens) and any(k in q for k in revenue_tokens):
-            if "purchaseRevenue" in seen:
-                for c in candidates:
-                    if c.get("name") == "purchaseRevenue":
-                        c["score"] = max(c.get("score", 0), 0.97)
-                        c["matched_by"] = "donation_name_revenue_rule"
-            else:
-                meta = GA4_METRICS.get("purchaseRevenue", {})
-                candidates.append({
-                    "name": "purchaseRevenue",
-                    "score": 0.97,
-                    "matched_by": "donation_name_revenue_rule",
-                    "scope": meta.get("scope") or MetricCandidateExtractor._infer_scope_from_category(meta.get("category")),
-                    "priority": meta.get("priority", 0)
-                })
-                seen.add("purchaseRevenue")
-
-        # 후원 이름/후원명 질의는 donation_name 축 이벤트 지표를 우선
-        if any(k in q for k in donation_name_tokens):
-            for m_name, sc in [("eventCount", 0.94), ("purchaseRevenue", 0.90)]:
-                if m_name in seen:
-                    for c in candidates:
-                        if c.get("name") == m_name:
-                            c["score"] = max(c.get("score", 0), sc)
-                            c["matched_by"] = "donation_name_axis_rule"
-                    continue
-                meta = GA4_METRICS.get(m_name, {})
-                scope = meta.get("scope") or MetricCandidateExtractor._infer_scope_from_category(meta.get("category"))
-                candidates.append({
-                    "name": m_name,
-                    "score": sc,
-                    "matched_by": "donation_name_axis_rule",
-                    "scope": scope,
-                    "priority": meta.get("priority", 0)
-                })
-                seen.add(m_name)
-
-        # 프로그램/후원명 + "얼마나" 질의는 매출/구매자 지표 우선
-        if any(k in q for k in ["프로그램", "노블클럽", "천원의 힘", "그린노블클럽", "추모기부"]) and any(k in q for k in ["얼마나", "몇", "후원했", "규모"]):
-            for m_name, sc in [("purchaseRevenue", 0.96), ("totalPurchasers", 0.90), ("transactions", 0.86)]:
-                if m_name in seen:
-                    for c in candidates:
-                        if c.get("name") == m_name:
-                            c["score"] = max(c.get("score", 0), sc)
-                            c["matched_by"] = "program_amount_rule"
-                    continue
-                meta = GA4_METRICS.get(m_name, {})
-                scope = meta.get("scope") or MetricCandidateExtractor._infer_scope_from_category(meta.get("category"))
-                candidates.append({
-                    "name": m_name,
-                    "score": sc,
-                    "matched_by": "program_amount_rule",
-                    "scope": scope,
-                    "priority": meta.get("priority", 0)
-                })
-                seen.add(m_name)
-
-        # "신규/처음 구매자/후원자" 보정:
-        # 신규 사용자(newUsers)가 아니라 구매자 계열 지표를 우선한다.
-        has_new = any(k in question for k in ["신규", "새로운", "최초", "첫", "처음"])
-        has_buyer = any(k in question for k in ["구매자", "구매", "후원자", "후원"])
-        if has_new and has_buyer:
-            buyer_priority = {
-                "firstTimePurchasers": 0.98,
-                "totalPurchasers": 0.93,
-                "transactions": 0.90
-            }
-            for c in candidates:
-                n = c.get("name")
-                if n in buyer_priority:
-                    c["score"] = max(c.get("score", 0), buyer_priority[n])
-                    c["matched_by"] = "new_buyer_rule"
-                if n == "newUsers":
-                    c["score"] = max(0.0, c.get("score", 0) - 0.25)
-                if n == "activeUsers":
-                    c["score"] = max(0.0, c.get("score", 0) - 0.25)
-            for m_name, sc in buyer_priority.items():
-                if m_name in seen:
-                    continue
-                meta = GA4_METRICS.get(m_name, {})
-                scope = meta.get("scope") or MetricCandidateExtractor._infer_scope_from_category(
-                    meta.get("category")
-                )
-                candidates.append({
-                    "name": m_name,
-                    "score": sc,
-                    "matched_by": "new_buyer_rule",
-                    "scope": scope,
-                    "priority": meta.get("priority", 0)
-                })
-                seen.add(m_name)
-
-        # "첫 후원자/첫 구매자 몇 퍼센트"는 비율 지표를 최우선
-        percent_tokens = ["퍼센트", "percent", "%", "비율", "율"]
-        if has_new and has_buyer and any(k in q for k in percent_tokens):
-            prefer_rate = {
-                "firstTimePurchaserRate": 0.99,
-                "firstTimePurchasers": 0.93,
-                "totalPurchasers": 0.92,
-            }
-            for c in candidates:
-                n = c.get("name")
-                if n in prefer_rate:
-                    c["score"] = max(c.get("score", 0), prefer_rate[n])
-                    c["matched_by"] = "first_buyer_rate_rule"
-                elif n in {"activeUsers", "newUsers", "purchaseRevenue", "itemRevenue", "purchaserRate", "purchaseToViewRate"}:
-                    c["score"] = max(0.0, c.get("score", 0) - 0.30)
-            for m_name, sc in prefer_rate.items():
-                if m_name in seen:
-                    continue
-                meta = GA4_METRICS.get(m_name, {})
-                scope = meta.get("scope") or MetricCandidateExtractor._infer_scope_from_category(meta.get("category"))
-                candidates.append({
-                    "name": m_name,
-                    "score": sc,
-                    "matched_by": "first_buyer_rate_rule",
-                    "scope": scope,
-                    "priority": meta.get("priority", 0)
-                })
-                seen.add(m_name)
-
-        # "신규 후원자 비율"도 첫 구매자 비율로 정규화
-        if ("신규" in q) and has_buyer and any(k in q for k in percent_tokens):
-            for c in candidates:
-                n = c.get("name")
-                if n == "firstTimePurchaserRate":
-                    c["score"] = max(c.get("score", 0), 0.995)
-                    c["matched_by"] = "new_buyer_rate_rule"
-                elif n in {"purchaserRate", "purchaseToViewRate"}:
-                    c["score"] = max(0.0, c.get("score", 0) - 0.35)
-            if "firstTimePurchaserRate" not in seen:
-                meta = GA4_METRICS.get("firstTimePurchaserRate", {})
-                scope = meta.get("scope") or MetricCandidateExtractor._infer_scope_from_category(meta.get("category"))
-                candidates.append({
-                    "name": "firstTimePurchaserRate",
-                    "score": 0.995,
-                    "matched_by": "new_buyer_rate_rule",
-                    "scope": scope,
-                    "priority": meta.get("priority", 0)
-                })
-                seen.add("firstTimePurchaserRate")
-
-        # "사용자수 + 구매한 사용자" 복합 질의는 activeUsers + totalPurchasers를 모두 제공
-        if any(k in q for k in ["사용자수", "사용자 수", "활성 사용자", "사용자"]) and any(k in q for k in ["구매한 사용자", "구매 사용자", "구매자", "후원자", "구매한"]):
-            pair_priority = {"activeUsers": 0.95, "totalPurchasers": 0.96}
-            for c in candidates:
-                n = c.get("name")
-                if n in pair_priority:
-                    c["score"] = max(c.get("score", 0), pair_priority[n])
-                    c["matched_by"] = "user_and_purchaser_rule"
-                elif n in {"transactions", "itemRevenue", "purchaseRevenue"}:
-                    c["score"] = max(0.0, c.get("score", 0) - 0.25)
-            for m_name, sc in pair_priority.items():
-                if m_name in seen:
-                    continue
-                meta = GA4_METRICS.get(m_name, {})
-                scope = meta.get("scope") or MetricCandidateExtractor._infer_scope_from_category(meta.get("category"))
-                candidates.append({
-                    "name": m_name,
-                    "score": sc,
-                    "matched_by": "user_and_purchaser_rule",
-                    "scope": scope,
-                    "priority": meta.get("priority", 0)
-                })
-                seen.add(m_name)
-
-        # "채널/소스/매체 + 구매자수" 질의는 구매자 지표 우선 (매출 지표는 후순위)
-        if any(k in q for k in ["채널", "소스", "매체", "유입", "경로"]) and any(k in q for k in ["구매자수", "구매자 수", "구매자", "후원자"]):
-            prefer_buyers = {"totalPurchasers": 0.99, "firstTimePurchasers": 0.90}
-            for c in candidates:
-                n = c.get("name")
-                if n in prefer_buyers:
-                    c["score"] = max(c.get("score", 0), prefer_buyers[n])
-                    c["matched_by"] = "acq_buyer_count_rule"
-                elif n in {"purchaseRevenue", "itemRevenue", "grossItemRevenue", "totalRevenue"}:
-                    c["score"] = max(0.0, c.get("score", 0) - 0.35)
-            for m_name, sc in prefer_buyers.items():
-                if m_name in seen:
-                    continue
-                meta = GA4_METRICS.get(m_name, {})
-                scope = meta.get("scope") or MetricCandidateExtractor._infer_scope_from_category(meta.get("category"))
-                candidates.append({
-                    "name": m_name,
-                    "score": sc,
-                    "matched_by": "acq_buyer_count_rule",
-                    "scope": scope,
-                    "priority": meta.get("priority", 0)
-                })
-                seen.add(m_name)
-
-        # "매출 일으킨 사용자"는 구매자 수 질의로 해석
-        if any(k in q for k in ["매출 일으킨", "구매를 일으킨", "구매 일으킨"]) and any(k in q for k in ["사용자", "유저", "사람"]):
-            prefer_buyers = {"totalPurchasers": 0.995, "firstTimePurchasers": 0.90}
-            for c in candidates:
-                n = c.get("name")
-                if n in prefer_buyers:
-                    c["score"] = max(c.get("score", 0), prefer_buyers[n])
-                    c["matched_by"] = "revenue_contributor_user_rule"
-                elif n in {"purchaseRevenue", "itemRevenue", "grossItemRevenue"}:
-                    c["score"] = max(0.0, c.get("score", 0) - 0.35)
-            for m_name, sc in prefer_buyers.items():
-                if m_name in seen:
-                    continue
-                meta = GA4_METRICS.get(m_name, {})
-                scope = meta.get("scope") or MetricCandidateExtractor._infer_scope_from_category(meta.get("category"))
-                candidates.append({
-                    "name": m_name,
-                    "score": sc,
-                    "matched_by": "revenue_contributor_user_rule",
-                    "scope": scope,
-                    "priority": meta.get("priority", 0)
-                })
-                seen.add(m_name)
-
-        # "구매수 + 전체 구매자" 복합 질의는 transactions + totalPurchasers를 모두 제공
-        if any(k in q for k in ["와", "과", ","]) and any(k in q for k in ["구매수", "구매 건수", "구매건수", "트랜잭션"]) and any(k in q for k in ["전체 구매자", "구매자", "후원자"]):
-            pair_priority = {"transactions": 0.98, "totalPurchasers": 0.97}
-            for c in candidates:
-                n = c.get("name")
-                if n in pair_priority:
-                    c["score"] = max(c.get("score", 0), pair_priority[n])
-                    c["matched_by"] = "purchase_count_and_total_purchasers_rule"
-                elif n in {"activeUsers", "newUsers"}:
-                    c["score"] = max(0.0, c.get("score", 0) - 0.20)
-            for m_name, sc in pair_priority.items():
-                if m_name in seen:
-                    continue
-                meta = GA4_METRICS.get(m_name, {})
-                scope = meta.get("scope") or MetricCandidateExtractor._infer_scope_from_category(meta.get("category"))
-                candidates.append({
-                    "name": m_name,
-                    "score": sc,
-                    "matched_by": "purchase_count_and_total_purchasers_rule",
-                    "scope": scope,
-                    "priority": meta.get("priority", 0)
-                })
-                seen.add(m_name)
+        # 후보가 이미 있으면 엔티티 추출은 필요 없으므로 먼저 검사 (캐시된 튜플을 그대로 사용)
+        if not by_name and _extract_entity_terms_cached(question):
+            for m_name, sc in _ENTITY_FALLBACK_METRICS:
+                _add_metric_candidate(by_name, m_name, sc, "entity_fallback_metric_rule")
 
-        # "전체 항목/프로그램/메뉴" 질문에서 totalUsers 계열 과매칭 억제
-        list_query_terms = [
-            "전체 항목", "전체 목록", "전체 프로그램", "프로그램 전체",
-            "메뉴 전체", "전체 보여", "전부 보여", "다 보여"
-        ]
-        if any(t in q for t in list_query_terms) and not any(t in q for t in ["사용자", "유저", "user"]):
-            for c in candidates:
-                if c.get("name") in {"totalUsers", "activeUsers", "newUsers"}:
-                    c["score"] = 0.0
-            if any(k in q for k in ["클릭", "click", "메뉴", "프로그램", "이벤트"]) and "eventCount" not in seen:
-                meta = GA4_METRICS.get("eventCount", {})
-                candidates.append({
-                    "name": "eventCount",
-                    "score": 0.88,
-                    "matched_by": "list_query_event_bias_rule",
-                    "scope": meta.get("scope") or MetricCandidateExtractor._infer_scope_from_category(meta.get("category")),
-                    "priority": meta.get("priority", 0)
-                })
-                seen.add("eventCount")
+        _apply_metric_rules(_METRIC_LATE_RULES, _METRIC_LATE_RULES_BY_BIT, have, by_name)
 
-        candidates = [c for c in candidates if c.get("score", 0) > 0]
+        # "전체 항목/프로그램/메뉴" 질문에서 totalUsers 계열 과매칭 억제
+        if have & _MF_LIST_QUERY and not have & _MF_ANY_USER:
+            for m_name in _LIST_QUERY_USER_METRICS:
+                c = by_name.get(m_name)
+                if c is not None:
+                    c.score = 0.0
+            if have & _MF_LIST_EVENT and "eventCount" not in by_name:
+                _add_metric_candidate(by_name, "eventCount", 0.88, "list_query_event_bias_rule")
+
+        candidates = [c for c in by_name.values() if c.score > 0]
         
-        # Score 기준 정렬
-        candidates.sort(key=lambda x: x["score"], reverse=True)
+        # Score 기준 정렬 (전체 후보를 반환하므로 top-K 힙 대신 C 레벨 key로 안정 정렬)
+        candidates.sort(key=_METRIC_SCORE_ATTR, reverse=True)
         
-        logging.info(f"[MetricExtractor] Found {len(candidates)} candidates")
+        # 로그 메시지는 %-인자로 넘겨 INFO가 꺼져 있으면 포맷팅 자체를 건너뛴다
+        logging.info("[MetricExtractor] Found %d candidates", len(candidates))
         for c in candidates[:5]:  # Log top 5
-            logging.info(f"  - {c['name']}: {c['score']:.2f} ({c['matched_by']})")
-        
-        return candidates
-    
-    @staticmethod
-    def _calculate_explicit_score(q: str, metric_name: str, meta: Dict) -> float:
-        """명시적 매칭 점수 계산 (0~1)"""
-        score = 0.0
-        q_norm = _normalize_text(q)
-        
-        # API key 매칭
-        if metric_name.lower() in q:
-            score = max(score, 0.85)
-        if _normalize_text(metric_name) in q_norm:
-            score = max(score, 0.85)
-        
-        # UI name 매칭
-        ui_name = meta.get("ui_name", "").lower()
-        if ui_name and not _is_too_short_term(ui_name) and ui_name in q:
-            score = max(score, 0.95)
-        if ui_name and not _is_too_short_term(ui_name) and _normalize_text(ui_name) in q_norm:
-            score = max(score, 0.95)
+            logging.info("  - %s: %.2f (%s)", c.name, c.score, c.matched_by)
         
-        # Alias 매칭
-        for alias in meta.get("aliases", []):
-            if _is_too_short_term(alias):
-                continue
-            if alias.lower() in q:
-                score = max(score, 0.90)
-            if _normalize_text(alias) in q_norm:
-                score = max(score, 0.90)
-        
-        # kr_semantics 매칭 (약한 매칭)
-        for sem in meta.get("kr_semantics", []):
-            if _is_too_short_term(sem):
-                continue
-            if sem.lower() in q:
-                score = max(score, 0.70)
-            if _normalize_text(sem) in q_norm:
-                score = max(score, 0.70)
-        
-        return score
-    
-    @staticmethod
-    def _infer_scope_from_category(category: str) -> str:
-        """Category에서 scope 추론"""
-        CATEGORY_TO_SCOPE = {
-            "ecommerce": "item",
-            "time": "event",
-            "event": "event",
-            "page": "event",
-            "device": "event",
-            "geo": "event",
-            "traffic": "event",
-            "user": "event",
-            "ads": "event",
-        }
-        return CATEGORY_TO_SCOPE.get(category, "event")
+        return tuple(c.as_dict() for c in candidates)
 
 
 # =============================================================================
@@ -1373,271 +1742,59 @@ class DimensionCandidateExtractor:
     @staticmethod
     def extract(question: str, semantic=None) -> List[Dict[str, Any]]:
         """질문에서 Dimension 후보 추출"""
-        q = question.lower()
-        candidates = []
-        
-        # 1. Explicit matching
-        for dim_name, meta in GA4_DIMENSIONS.items():
-            score = DimensionCandidateExtractor._calculate_explicit_score(q, dim_name, meta)
-            
-            if score > 0:
-                scope = meta.get("scope") or DimensionCandidateExtractor._infer_scope_from_category(
-                    meta.get("category")
-                )
-                
-                candidates.append({
-                    "name": dim_name,
-                    "score": score,
-                    "matched_by": "explicit",
-                    "scope": scope,
-                    "category": meta.get("category"),
-                    "priority": meta.get("priority", 0)
-                })
-        
-        # 2. Semantic matching
+        # MetricCandidateExtractor와 같이 semantic 결과 (name, confidence)를 캐시 키에 포함하고,
+        # 호출자(pipeline 등)가 후보를 수정하므로 사본을 반환
+        sem_matches = ()
         if semantic:
-            sem_candidates = semantic.match_dimension(question)
-            for sem in sem_candidates:
-                name = sem.get("name")
-                confidence = sem.get("confidence", 0)
-                
-                if any(c["name"] == name for c in candidates):
-                    continue
-                
-                if confidence >= 0.25:
-                    meta = GA4_DIMENSIONS.get(name, {})
-                    scope = meta.get("scope") or DimensionCandidateExtractor._infer_scope_from_category(
-                        meta.get("category")
-                    )
-                    
-                    candidates.append({
-                        "name": name,
-                        "score": confidence,
-                        "matched_by": "semantic",
-                        "scope": scope,
-                        "category": meta.get("category"),
-                        "priority": meta.get("priority", 0)
-                    })
-
-        # 후원 유형 비교는 itemName 차원을 우선 사용
-        donation_keywords = ["후원", "정기후원", "일시후원"]
-        ratio_keywords = ["비중", "구성비", "점유율", "나눠줘", "나눠", "비교"]
-        if any(k in question for k in donation_keywords) and any(k in question for k in ratio_keywords):
-            if not any(c.get("name") == "itemName" for c in candidates):
-                candidates.append({
-                    "name": "itemName",
-                    "score": 0.95,
-                    "matched_by": "donation_ratio_rule",
-                    "scope": "item",
-                    "category": "ecommerce",
-                    "priority": GA4_DIMENSIONS.get("itemName", {}).get("priority", 0)
-                })
-
-        # 후원 유형 전환 비율 -> 정기후원 여부 차원 우선
-        if any(k in question for k in ["후원", "정기", "일시"]) and any(k in question for k in ["전환", "비율", "율"]):
-            if not any(c.get("name") == "customEvent:is_regular_donation" for c in candidates):
-                candidates.append({
-                    "name": "customEvent:is_regular_donation",
-                    "score": 0.95,
-                    "matched_by": "donation_type_conversion_rule",
-                    "scope": "event",
-                    "category": "event",
-                    "priority": GA4_DIMENSIONS.get("customEvent:is_regular_donation", {}).get("priority", 0)
-                })
-
-        # 후원유형 매출 질문은 정기후원 여부 차원 우선
-        if any(k in q for k in ["후원 유형", "후원유형"]) and any(k in q for k in ["매출", "수익", "revenue", "금액"]):
-            if not any(c.get("name") == "customEvent:is_regular_donation" for c in candidates):
-                candidates.append({
-                    "name": "customEvent:is_regular_donation",
-                    "score": 0.97,
-                    "matched_by": "donation_type_revenue_dim_rule",
-                    "scope": "event",
-                    "category": "event",
-                    "priority": GA4_DIMENSIONS.get("customEvent:is_regular_donation", {}).get("priority", 0)
-                })
-            if not any(c.get("name") == "customEvent:donation_name" for c in candidates):
-                candidates.append({
-                    "name": "customEvent:donation_name",
-                    "score": 0.90,
-                    "matched_by": "donation_type_revenue_dim_rule",
-                    "scope": "event",
-                    "category": "event",
-                    "priority": GA4_DIMENSIONS.get("customEvent:donation_name", {}).get("priority", 0)
-                })
-
-        # 일반 "유형" 후속 질문은 후원명/상품유형 우선 (Y/N 단독 응답 방지)
-        if any(k in q for k in ["유형", "타입", "종류"]) and not any(k in q for k in ["채널", "소스", "매체", "디바이스", "국가", "페이지"]):
-            prefer_dims = [("customEvent:donation_name", 0.97), ("itemCategory", 0.93), ("customEvent:is_regular_donation", 0.86)]
-            if any(k in q for k in ["상품", "카테고리", "item"]):
-                prefer_dims = [("itemCategory", 0.98), ("customEvent:donation_name", 0.90), ("customEvent:is_regular_donation", 0.82)]
-            if any(k in q for k in ["후원 이름", "후원이름", "후원명", "donation_name", "이름"]):
-                prefer_dims = [("customEvent:donation_name", 0.99), ("itemCategory", 0.90), ("customEvent:is_regular_donation", 0.82)]
-            for d_name, sc in prefer_dims:
-                if d_name in GA4_DIMENSIONS and not any(c.get("name") == d_name for c in candidates):
-                    meta = GA4_DIMENSIONS.get(d_name, {})
-                    candidates.append({
-                        "name": d_name,
-                        "score": sc,
-                        "matched_by": "generic_type_followup_rule",
-                        "scope": meta.get("scope") or DimensionCandidateExtractor._infer_scope_from_category(meta.get("category")),
-                        "category": meta.get("category"),
-                        "priority": meta.get("priority", 0)
-                    })
-
-        # 메뉴명/메뉴 네임 질의는 customEvent:menu_name 우선
-        if any(k in q for k in ["menu_name", "menu name", "메뉴명", "메뉴 네임", "메뉴이름"]):
-            if not any(c.get("name") == "customEvent:menu_name" for c in candidates):
-                candidates.append({
-                    "name": "customEvent:menu_name",
-                    "score": 0.97,
-                    "matched_by": "menu_name_rule",
-                    "scope": "event",
-                    "category": "event",
-                    "priority": GA4_DIMENSIONS.get("customEvent:menu_name", {}).get("priority", 0)
-                })
-
-        # 상품유형/상품 카테고리 질의는 itemCategory 우선
-        if any(k in q for k in ["상품유형", "상품 유형", "상품 카테고리", "카테고리별 상품", "유형별 상품"]):
-            if not any(c.get("name") == "itemCategory" for c in candidates):
-                candidates.append({
-                    "name": "itemCategory",
-                    "score": 0.98,
-                    "matched_by": "item_category_rule",
-                    "scope": "item",
-                    "category": "ecommerce",
-                    "priority": GA4_DIMENSIONS.get("itemCategory", {}).get("priority", 0)
-                })
-
-        # 상품 랭킹/최고 매출 질문은 itemName 우선
-        if any(k in q for k in ["상품"]) and any(k in q for k in ["가장", "최고", "최저", "높은", "낮은", "1위", "top", "상위"]):
-            if not any(c.get("name") == "itemName" for c in candidates):
-                candidates.append({
-                    "name": "itemName",
-                    "score": 0.99,
-                    "matched_by": "item_ranking_rule",
-                    "scope": "item",
-                    "category": "ecommerce",
-                    "priority": GA4_DIMENSIONS.get("itemName", {}).get("priority", 0)
-                })
-
-        # 소스/매체/광고 유입 질문은 sourceMedium 우선
-        if any(k in q for k in ["소스", "매체", "source", "medium", "광고"]):
-            if not any(c.get("name") == "sourceMedium" for c in candidates):
-                candidates.append({
-                    "name": "sourceMedium",
-                    "score": 0.97,
-                    "matched_by": "source_medium_rule",
-                    "scope": "event",
-                    "category": "traffic",
-                    "priority": GA4_DIMENSIONS.get("sourceMedium", {}).get("priority", 0)
-                })
-        if any(k in q for k in ["paid", "display", "direct", "organic", "referral", "unassigned", "cross-network"]):
-            if not any(c.get("name") == "defaultChannelGroup" for c in candidates):
-                candidates.append({
-                    "name": "defaultChannelGroup",
-                    "score": 0.96,
-                    "matched_by": "channel_token_rule",
-                    "scope": "event",
-                    "category": "traffic",
-                    "priority": GA4_DIMENSIONS.get("defaultChannelGroup", {}).get("priority", 0)
-                })
-
-        # 후원유형 + 클릭수는 donation_name 우선
-        if any(k in q for k in ["후원유형", "후원 유형", "후원명"]) and any(k in q for k in ["클릭", "click"]):
-            if not any(c.get("name") == "customEvent:donation_name" for c in candidates):
-                candidates.append({
-                    "name": "customEvent:donation_name",
-                    "score": 0.96,
-                    "matched_by": "donation_click_dim_rule",
-                    "scope": "event",
-                    "category": "event",
-                    "priority": GA4_DIMENSIONS.get("customEvent:donation_name", {}).get("priority", 0)
-                })
-
-        # donation + click 질의는 donation_name 축 우선
-        if "donation" in q and any(k in q for k in ["클릭", "click"]):
-            if not any(c.get("name") == "customEvent:donation_name" for c in candidates):
-                candidates.append({
-                    "name": "customEvent:donation_name",
-                    "score": 0.98,
-                    "matched_by": "donation_token_click_dim_rule",
-                    "scope": "event",
-                    "category": "event",
-                    "priority": GA4_DIMENSIONS.get("customEvent:donation_name", {}).get("priority", 0)
-                })
+            sem_matches = tuple(
+                (sem.get("name"), sem.get("confidence", 0)) for sem in semantic.match_dimension(question)
+            )
+        return [dict(c) for c in DimensionCandidateExtractor._extract_cached(question, sem_matches)]
 
-        # 스크롤 질문은 퍼센트/페이지 차원 보강
-        if any(k in q for k in ["스크롤", "scroll"]):
-            for d_name, sc in [("customEvent:percent_scrolled", 0.95), ("pagePath", 0.88)]:
-                if d_name in GA4_DIMENSIONS and not any(c.get("name") == d_name for c in candidates):
-                    meta = GA4_DIMENSIONS.get(d_name, {})
-                    candidates.append({
-                        "name": d_name,
-                        "score": sc,
-                        "matched_by": "scroll_dim_rule",
-                        "scope": meta.get("scope") or DimensionCandidateExtractor._infer_scope_from_category(meta.get("category")),
-                        "category": meta.get("category"),
-                        "priority": meta.get("priority", 0)
-                    })
-        
-        candidates.sort(key=lambda x: x["score"], reverse=True)
-        
-        logging.info(f"[DimensionExtractor] Found {len(candidates)} candidates")
-        for c in candidates[:3]:
-            logging.info(f"  - {c['name']}: {c['score']:.2f} ({c['matched_by']})")
-        
-        return candidates
-    
     @staticmethod
-    def _calculate_explicit_score(q: str, dim_name: str, meta: Dict) -> float:
-        """명시적 매칭 점수 계산"""
-        score = 0.0
-        q_norm = _normalize_text(q)
-        
-        if dim_name.lower() in q:
-            score = max(score, 0.85)
-        if _normalize_text(dim_name) in q_norm:
-            score = max(score, 0.85)
-        
-        ui_name = meta.get("ui_name", "").lower()
-        if ui_name and not _is_too_short_term(ui_name) and ui_name in q:
-            score = max(score, 0.95)
-        if ui_name and not _is_too_short_term(ui_name) and _normalize_text(ui_name) in q_norm:
-            score = max(score, 0.95)
+    @lru_cache(maxsize=2048)
+    def _extract_cached(question: str, sem_matches: Tuple[Tuple[str, float], ...]) -> Tuple[Dict[str, Any], ...]:
+        """질문 + semantic 매칭 결과에서 Dimension 후보 추출"""
+        # 이름 -> 후보 dict 하나로 중복 확인과 후보 순서(삽입 순서)를 함께 관리
+        by_name: Dict[str, Dict[str, Any]] = {}
+        have = 0
+        # 공백뿐인 질문은 키워드/명시 매칭이 불가능하므로 스캔을 건너뛰고 semantic 후보만 본다
+        if question.strip():
+            q = _lower_question(question)
+            # 규칙 키워드는 오토마톤 한 번의 스캔으로 수집 (후원 비중/전환 규칙은 원문 question 기준)
+            q_hits = _keyword_hits(_DIM_RULE_AC, q)
+            raw_hits = _keyword_hits(_DIM_RULE_AC, question)
+            # 규칙 조건은 flag 비트 마스크(have)로 한 번에 모아 두고 아래에서 비트 AND로 판정
+            have = _hits_flag_mask(q_hits, raw_hits, _DIM_Q_KEYWORD_MASKS, _DIM_RAW_KEYWORD_MASKS)
+
+            # 1. Explicit matching (Aho-Corasick 단일 스캔)
+            explicit_scores = _explicit_scores(_DIM_AC, q)
+            for dim_name in sorted(explicit_scores, key=_DIM_ORDER.__getitem__):
+                score = explicit_scores[dim_name]
+
+                if score > 0:
+                    _add_dimension_candidate(by_name, dim_name, score, "explicit")
         
-        for alias in meta.get("aliases", []):
-            if _is_too_short_term(alias):
+        # 2. Semantic matching
+        for name, confidence in sem_matches:
+            if name in by_name:
                 continue
-            if alias.lower() in q:
-                score = max(score, 0.90)
-            if _normalize_text(alias) in q_norm:
-                score = max(score, 0.90)
+            
+            if confidence >= 0.25:
+                _add_dimension_candidate(by_name, name, confidence, "semantic")
+
+        # 규칙 키워드가 하나도 없으면 어느 규칙도 적용되지 않으므로 테이블 순회 자체를 건너뛴다
+        if have:
+            _apply_dimension_rules(have, by_name)
         
-        for sem in meta.get("kr_semantics", []):
-            if _is_too_short_term(sem):
-                continue
-            if sem.lower() in q:
-                score = max(score, 0.70)
-            if _normalize_text(sem) in q_norm:
-                score = max(score, 0.70)
+        candidates = sorted(by_name.values(), key=_SCORE_KEY, reverse=True)
         
-        return score
-    
-    @staticmethod
-    def _infer_scope_from_category(category: str) -> str:
-        CATEGORY_TO_SCOPE = {
-            "ecommerce": "item",
-            "time": "event",
-            "event": "event",
-            "page": "event",
-            "device": "event",
-            "geo": "event",
-            "traffic": "event",
-            "user": "event",
-            "ads": "event",
-        }
-        return CATEGORY_TO_SCOPE.get(category, "event")
+        # 로그 메시지는 %-인자로 넘겨 INFO가 꺼져 있으면 포맷팅 자체를 건너뛴다
+        logging.info("[DimensionExtractor] Found %d candidates", len(candidates))
+        for c in candidates[:3]:
+            logging.info("  - %s: %.2f (%s)", c["name"], c["score"], c["matched_by"])
+        
+        return tuple(candidates)
 
 
 # =============================================================================
@@ -1660,16 +1817,21 @@ class ModifierExtractor:
     
     @staticmethod
     def extract(question: str) -> Dict[str, Any]:
+        """질문에서 modifier 추출 (같은 질문은 캐시된 결과의 사본을 반환)"""
+        return copy.deepcopy(ModifierExtractor._extract_cached(question))
+
+    @staticmethod
+    @lru_cache(maxsize=2048)
+    def _extract_cached(question: str) -> Dict[str, Any]:
         """질문에서 modifier 추출"""
-        q = question.lower()
+        q = _lower_question(question)
+        # 규칙에서 쓰는 키워드를 한 번의 오토마톤 스캔으로 모아 두고, 각 규칙은 집합 교차로 판정
+        hits = _keyword_hits(_MODIFIER_RULE_AC, q)
+        domestic_overseas_case = "해외" in hits and "국내" in hits
         modifiers = {}
-        purchase_param_aliases = [
-            "is_regular_donation", "country_name", "domestic_children_count",
-            "overseas_children_count", "letter_translation", "donation_name"
-        ]
         
         # 1. TopN limit
-        limit_match = re.search(r'(top\s*(\d+)|상위\s*(\d+)|(\d+)\s*위|1\s*[-~]\s*(\d+)|(\d+)\s*개)', q)
+        limit_match = _LIMIT_RE.search(q)
         if limit_match:
             # 매칭된 그룹에서 숫자 추출
             nums = [g for g in limit_match.groups() if g and g.isdigit()]
@@ -1677,61 +1839,61 @@ class ModifierExtractor:
                 modifiers["limit"] = int(nums[0])
 
         # "가장/최고/최저"는 Top1로 해석
-        if any(k in q for k in ["가장", "최고", "최저", "높은", "낮은"]) and any(k in q for k in ["상품", "매출", "이벤트", "후원"]):
+        if not hits.isdisjoint(_MOD_KW_TOP1_SUPERLATIVE) and not hits.isdisjoint(_MOD_KW_TOPN_ENTITY):
             modifiers["limit"] = 1
         
         # 2. "총" / "전체" 키워드
-        if any(k in q for k in ["총", "전체", "합계", "total"]):
+        if not hits.isdisjoint(_MOD_KW_TOTAL):
             modifiers["needs_total"] = True
 
         # "총 매출 + 상품별 매출" 복합 질의
-        if any(k in q for k in ["총 매출", "총매출", "전체 매출"]) and any(k in q for k in ["상품별", "상품 별", "아이템별", "제품별"]):
+        if not hits.isdisjoint(_MOD_KW_TOTAL_REVENUE) and not hits.isdisjoint(_MOD_KW_ITEM_BY):
             modifiers["needs_total"] = True
             modifiers["needs_breakdown"] = True
             modifiers["scope_hint"] = ["item"]
 
         # "상품별 매출" 단독 질의도 itemName 분해 강제
-        if any(k in q for k in ["상품별", "상품 별", "아이템별", "제품별"]) and any(k in q for k in ["매출", "수익", "금액"]):
+        if not hits.isdisjoint(_MOD_KW_ITEM_BY) and not hits.isdisjoint(_MOD_KW_AMOUNT):
             modifiers["needs_breakdown"] = True
-            modifiers["needs_total"] = False if "총 매출" not in q and "총매출" not in q else modifiers.get("needs_total", False)
+            modifiers["needs_total"] = False if "총 매출" not in hits and "총매출" not in hits else modifiers.get("needs_total", False)
             modifiers["scope_hint"] = ["item"]
             modifiers["force_dimensions"] = ["itemName"]
             modifiers["entity_field_hint"] = "itemName"
 
         # 2.1 "전체 항목/목록"은 합계가 아니라 전체 breakdown 확장으로 해석
-        if any(k in q for k in ["전체 항목", "전체 목록", "전체 프로그램", "모든 항목", "전부 보여", "다 보여", "메뉴 전체", "gnb메뉴 전체", "전체 보여줘", "이것 전체", "이거 전체"]):
+        if not hits.isdisjoint(_MOD_KW_FULL_LIST):
             modifiers["all_items"] = True
             modifiers["needs_breakdown"] = True
             modifiers["needs_total"] = False
             modifiers.pop("limit", None)
         
         # 3. "~별" / "기준" 키워드
-        if any(k in q for k in ["별", "기준", "따라", "by "]):
+        if not hits.isdisjoint(_MOD_KW_BREAKDOWN):
             modifiers["needs_breakdown"] = True
-        if any(k in q for k in ["묶어서", "묶어", "그룹", "group by"]):
+        if not hits.isdisjoint(_MOD_KW_GROUP_BY):
             modifiers["needs_breakdown"] = True
             modifiers["needs_total"] = False
-        if len(q.strip()) <= 20 and any(k in q for k in ["name", "이름", "네임"]):
+        if len(q.strip()) <= 20 and not hits.isdisjoint(_MOD_KW_NAME):
             modifiers["needs_breakdown"] = True
             modifiers["needs_total"] = False
 
         # 3.1 비교/탐색형 자연어는 breakdown
-        if any(k in q for k in ["어떤", "무슨", "어디", "가장", "많이", "상위", "top"]) and any(k in q for k in ["후원", "프로그램", "국가", "채널", "카테고리", "유형"]):
+        if not hits.isdisjoint(_MOD_KW_EXPLORE) and not hits.isdisjoint(_MOD_KW_EXPLORE_TARGET):
             modifiers["needs_breakdown"] = True
-            if any(k in q for k in ["가장", "많이"]) and not any(k in q for k in ["top", "상위"]):
+            if not hits.isdisjoint(_MOD_KW_MOST) and hits.isdisjoint(_MOD_KW_TOPN_WORD):
                 modifiers["limit"] = 5
-        if any(k in q for k in ["가장", "최고", "최저", "높은", "낮은", "1위"]) and any(k in q for k in ["상품", "매출", "후원"]):
+        if not hits.isdisjoint(_MOD_KW_SUPERLATIVE) and not hits.isdisjoint(_MOD_KW_TOP1_ENTITY):
             modifiers["needs_breakdown"] = True
             modifiers["needs_total"] = True
             modifiers["scope_hint"] = ["item"]
             modifiers["force_dimensions"] = ["itemName"]
             modifiers["entity_field_hint"] = "itemName"
             modifiers["limit"] = 1
-        if "국가" in q and any(k in q for k in ["많이", "어디", "어떤"]):
+        if "국가" in hits and not hits.isdisjoint(_MOD_KW_WHERE):
             modifiers["needs_breakdown"] = True
 
         # 3.15 해외/국내 비교는 국가 기준으로 강제 (국내=South Korea, 해외=기타)
-        if "해외" in q and "국내" in q:
+        if domestic_overseas_case:
             modifiers["needs_breakdown"] = True
             modifiers["force_dimensions"] = ["country"]
             modifiers["scope_hint"] = ["event"]
@@ -1741,21 +1903,22 @@ class ModifierExtractor:
             modifiers.pop("item_name_contains", None)
 
         # 3.5 비중/구성비/비율 요청은 breakdown 강제
-        if any(k in q for k in ["비중", "구성비", "비율", "점유율", "나눠줘", "나눠"]):
+        if not hits.isdisjoint(_MOD_KW_SHARE) or "나눠" in hits:
             modifiers["needs_breakdown"] = True
 
         # 지난달+이번달 / 지난주+이번주 비교 질의는 시간 차원 breakdown 강제
-        if ("지난달" in q and "이번달" in q):
+        if ("지난달" in hits and "이번달" in hits):
             modifiers["needs_breakdown"] = True
             modifiers["needs_total"] = False
             modifiers["scope_hint"] = ["event"]
             modifiers["force_dimensions"] = ["yearMonth"]
-        if ("지난주" in q and "이번주" in q):
+        if ("지난주" in hits and "이번주" in hits):
             modifiers["needs_breakdown"] = True
             modifiers["needs_total"] = False
             modifiers["scope_hint"] = ["event"]
             modifiers["force_dimensions"] = ["week"]
-        if ("지난주" in q and ("그 전주" in q or "전주" in q)) and any(k in q for k in ["사용자", "유저", "세션"]):
+        prev_week_compare = "지난주" in hits and ("그 전주" in hits or "전주" in hits)
+        if prev_week_compare and not hits.isdisjoint(_MOD_KW_USER_SESSION):
             modifiers["needs_trend"] = True
             modifiers["needs_breakdown"] = True
             modifiers["needs_total"] = False
@@ -1765,7 +1928,7 @@ class ModifierExtractor:
             modifiers["force_metrics"] = ["activeUsers"]
 
         # 지난주 vs 전주: dimension 없어도 비교 가능하도록 week 축 자동 부여
-        if ("지난주" in q and ("그 전주" in q or "전주" in q)):
+        if prev_week_compare:
             modifiers["needs_breakdown"] = True
             modifiers["needs_total"] = False
             modifiers["scope_hint"] = ["event"]
@@ -1774,43 +1937,38 @@ class ModifierExtractor:
             modifiers["auto_prev_period_compare"] = True
 
         # 추이 질문은 기본적으로 일별(date) 차원 강제
-        if any(k in q for k in ["추이", "흐름", "일별", "변화"]) and "force_dimensions" not in modifiers:
+        if not hits.isdisjoint(_MOD_KW_TREND) and "force_dimensions" not in modifiers:
             modifiers["needs_trend"] = True
             modifiers["needs_breakdown"] = True
             modifiers["needs_total"] = False
             modifiers["scope_hint"] = ["event"]
             modifiers["force_dimensions"] = ["date"]
         # 일반 전환율 질의: 금액/완료건수 맥락이 없을 때만 기본 rate 지표 강제
-        has_amount_or_count_context = any(
-            k in q for k in [
-                "금액", "매출", "수익", "완료", "완료건수", "완료 건수",
-                "건수", "횟수", "구매수", "트랜잭션", "transaction"
-            ]
-        )
-        if any(k in q for k in ["전환율", "conversion rate", "전환 비율"]) and not has_amount_or_count_context:
+        has_amount_or_count_context = not hits.isdisjoint(_MOD_KW_AMOUNT_OR_COUNT)
+        if not hits.isdisjoint(_MOD_KW_CONVERSION_RATE) and not has_amount_or_count_context:
             modifiers["force_metrics"] = ["sessionKeyEventRate", "purchaserRate", "purchaseToViewRate"]
-        if q.strip() in ["비교", "비교해", "비교해서", "대비", "증감"]:
+        if q.strip() in _SHORT_COMPARE:
             modifiers["needs_breakdown"] = True
             modifiers["needs_total"] = False
 
         # 3.55 채널/소스/매체 축 요청은 breakdown 강제
-        if any(k in q for k in ["채널", "소스", "매체", "경로", "source", "medium", "광고", "paid", "display"]):
+        if not hits.isdisjoint(_MOD_KW_ACQ_AXIS):
             modifiers["needs_breakdown"] = True
             modifiers["scope_hint"] = ["event"]
-            if any(k in q for k in ["소스", "매체", "source", "medium", "광고"]) and "force_dimensions" not in modifiers:
+            if not hits.isdisjoint(_MOD_KW_SOURCE_AD) and "force_dimensions" not in modifiers:
                 modifiers["force_dimensions"] = ["sourceMedium"]
-            elif ("경로" in q) and "force_dimensions" not in modifiers:
+            elif ("경로" in hits) and "force_dimensions" not in modifiers:
                 modifiers["force_dimensions"] = ["defaultChannelGroup"]
 
         # 3.555 채널/소스/매체 + 구매자수 질문은 구매자 지표 강제
-        if any(k in q for k in ["채널", "소스", "매체", "유입", "경로"]) and any(k in q for k in ["구매자수", "구매자 수", "구매자", "후원자"]):
+        if not hits.isdisjoint(_MOD_KW_INFLOW) and not hits.isdisjoint(_MOD_KW_PURCHASER_COUNT):
             modifiers["needs_breakdown"] = True
             modifiers["needs_total"] = False
             modifiers["scope_hint"] = ["event"]
             modifiers["force_metrics"] = ["totalPurchasers"]
 
         # 3.553 "매출 일으킨 사용자"는 채널별 구매자수로 강제
-        if any(k in q for k in ["매출 일으킨", "구매를 일으킨", "구매 일으킨"]) and any(k in q for k in ["사용자", "유저", "사람"]) and any(k in q for k in ["채널", "유입", "경로"]):
+        if not hits.isdisjoint(_MOD_KW_REVENUE_CAUSED) and not hits.isdisjoint(_MOD_KW_PERSON) and not hits.isdisjoint(_MOD_KW_CHANNEL_PATH):
             modifiers["needs_breakdown"] = True
             modifiers["needs_total"] = False
             modifiers["scope_hint"] = ["event"]
@@ -1819,23 +1977,23 @@ class ModifierExtractor:
             modifiers["event_filter"] = "purchase"
 
         # 3.552 유입축 + 구매/매출 질문은 purchase 필터 기반 분해
-        if any(k in q for k in ["채널", "소스", "매체", "유입", "경로", "source", "medium"]) and any(k in q for k in ["구매", "매출", "수익", "후원"]):
+        if not hits.isdisjoint(_MOD_KW_INFLOW_SOURCE) and not hits.isdisjoint(_MOD_KW_PURCHASE_REVENUE):
             modifiers["needs_breakdown"] = True
             modifiers["needs_total"] = False
             modifiers["scope_hint"] = ["event"]
-            if any(k in q for k in ["소스", "매체", "source", "medium"]):
+            if not hits.isdisjoint(_MOD_KW_SOURCE_MEDIUM):
                 modifiers["force_dimensions"] = ["sourceMedium"]
             else:
                 modifiers["force_dimensions"] = ["defaultChannelGroup"]
             modifiers["event_filter"] = "purchase"
 
         # 3.551 사용자수 + 구매자 복합 질의는 2개 지표를 고정
-        if any(k in q for k in ["사용자수", "사용자 수", "활성 사용자", "사용자"]) and any(k in q for k in ["구매한 사용자", "구매 사용자", "구매자", "후원자", "구매한"]):
+        if not hits.isdisjoint(_MOD_KW_USER_COUNT) and not hits.isdisjoint(_MOD_KW_PURCHASER):
             modifiers["scope_hint"] = ["event"]
             modifiers["force_metrics"] = ["activeUsers", "totalPurchasers"]
 
         # 3.551b 구매수 + 전체 구매자 복합 질의
-        if any(k in q for k in ["구매수", "구매 건수", "구매건수", "트랜잭션"]) and any(k in q for k in ["전체 구매자", "구매자", "후원자"]) and any(k in q for k in ["와", "과", ","]):
+        if not hits.isdisjoint(_MOD_KW_PURCHASE_COUNT) and not hits.isdisjoint(_MOD_KW_PURCHASER_TOTAL) and not hits.isdisjoint(_MOD_KW_LIST_SEP):
             modifiers["scope_hint"] = ["event"]
             modifiers["force_metrics"] = ["transactions", "totalPurchasers"]
             modifiers["needs_total"] = True
@@ -1846,9 +2004,9 @@ class ModifierExtractor:
 
         # "총 후원금액 + 후원 완료 건수 + 후원 전환율" 류 복합 질의
         # 전환율은 purchase / donation_click(완료/클릭) 계산으로 별도 블록에서 산출
-        has_conversion = any(k in q for k in ["전환율", "전환 비율", "conversion rate"])
-        has_total_amount = any(k in q for k in ["총 후원금액", "총후원금액", "총 매출", "총매출", "후원금액", "후원 금액"])
-        has_completion = any(k in q for k in ["완료 건수", "완료건수", "후원 완료", "구매 건수", "구매수", "트랜잭션"])
+        has_conversion = not hits.isdisjoint(_MOD_KW_CONVERSION_RATE)
+        has_total_amount = not hits.isdisjoint(_MOD_KW_TOTAL_AMOUNT)
+        has_completion = not hits.isdisjoint(_MOD_KW_COMPLETION)
         if has_conversion and (has_total_amount or has_completion):
             modifiers["scope_hint"] = ["event"]
             modifiers["needs_total"] = True
@@ -1862,7 +2020,7 @@ class ModifierExtractor:
             modifiers.pop("item_name_contains", None)
 
         # "어떤 경로에서 ... 구매를 많이"는 구매자 지표 우선
-        if "경로" in q and any(k in q for k in ["구매", "후원"]) and any(k in q for k in ["사용자", "유저", "사람"]):
+        if "경로" in hits and not hits.isdisjoint(_MOD_KW_BUY) and not hits.isdisjoint(_MOD_KW_PERSON):
             modifiers["scope_hint"] = ["event"]
             modifiers["force_metrics"] = ["totalPurchasers"]
             modifiers["needs_breakdown"] = True
@@ -1871,7 +2029,7 @@ class ModifierExtractor:
                 modifiers["force_dimensions"] = ["defaultChannelGroup"]
             modifiers["event_filter"] = "purchase"
 
-        product_type_query = any(k in q for k in ["상품유형", "상품 유형", "상품 카테고리", "카테고리별 상품"]) or ("상품" in q and "유형" in q)
+        product_type_query = not hits.isdisjoint(_MOD_KW_PRODUCT_TYPE) or ("상품" in hits and "유형" in hits)
         # 3.56 상품유형 질의는 itemCategory 기준 breakdown 강제
         if product_type_query:
             modifiers["needs_breakdown"] = True
@@ -1881,7 +2039,6 @@ class ModifierExtractor:
             modifiers["entity_field_hint"] = "itemCategory"
 
         # 3.6 엔티티 추출: 브랜드/캠페인/상품명/후원명 등 contains 필터
-        domestic_overseas_case = ("해외" in q and "국내" in q)
         entity_terms = _extract_entity_terms(question)
         if entity_terms and not domestic_overseas_case and not modifiers.get("suppress_entity_filters"):
             uniq = []
@@ -1897,52 +2054,51 @@ class ModifierExtractor:
                 modifiers["needs_breakdown"] = True
                 scope_hint = modifiers.get("scope_hint", [])
                 # 질문 어휘로 필드 힌트 추정
-                if any(k in q for k in ["캠페인", "채널", "소스", "매체", "랜딩", "페이지", "이벤트"]):
-                    if any(k in q for k in ["캠페인"]):
+                if not hits.isdisjoint(_MOD_KW_ENTITY_AXIS):
+                    if not hits.isdisjoint(_MOD_KW_CAMPAIGN):
                         modifiers["entity_field_hint"] = "defaultChannelGroup"
-                    elif any(k in q for k in ["채널"]):
+                    elif not hits.isdisjoint(_MOD_KW_CHANNEL):
                         modifiers["entity_field_hint"] = "defaultChannelGroup"
-                    elif any(k in q for k in ["소스", "매체"]):
-                        if any(t in q for t in ["display", "paid", "organic", "direct", "referral", "unassigned", "cross-network"]):
+                    elif not hits.isdisjoint(_MOD_KW_SOURCE_MEDIUM_KO):
+                        if not hits.isdisjoint(_MOD_KW_CHANNEL_TOKEN):
                             modifiers["entity_field_hint"] = "defaultChannelGroup"
                         else:
                             modifiers["entity_field_hint"] = "sourceMedium"
-                    elif any(k in q for k in ["랜딩", "페이지"]):
+                    elif not hits.isdisjoint(_MOD_KW_LANDING):
                         modifiers["entity_field_hint"] = "landingPage"
-                    elif any(k in q for k in ["이벤트"]):
+                    elif not hits.isdisjoint(_MOD_KW_EVENT):
                         modifiers["entity_field_hint"] = "eventName"
                     if "event" not in scope_hint:
                         scope_hint.append("event")
                 else:
                     if "entity_field_hint" not in modifiers:
-                        modifiers["entity_field_hint"] = "itemBrand" if any(k in q for k in ["브랜드"]) else "itemName"
+                        modifiers["entity_field_hint"] = "itemBrand" if not hits.isdisjoint(_MOD_KW_BRAND) else "itemName"
                     if "item" not in scope_hint:
                         scope_hint.append("item")
                 modifiers["scope_hint"] = scope_hint
 
         # source/medium 분석에서 채널 토큰(display/paid/organic...)이 있으면
         # 분해는 sourceMedium으로, 필터는 defaultChannelGroup으로 고정
-        if any(k in q for k in ["소스", "매체", "source", "medium"]) and any(t in q for t in ["display", "paid", "organic", "direct", "referral", "unassigned", "cross-network"]):
+        if not hits.isdisjoint(_MOD_KW_SOURCE_MEDIUM) and not hits.isdisjoint(_MOD_KW_CHANNEL_TOKEN):
             modifiers["needs_breakdown"] = True
             modifiers["scope_hint"] = ["event"]
             modifiers["force_dimensions"] = ["sourceMedium"]
             modifiers["entity_field_hint"] = "defaultChannelGroup"
 
         # 3.7 "매개변수/정보" 요청이면 item 프로파일용 차원 강제
-        if any(k in q for k in ["매개변수", "파라미터", "상세", "정보", "어떤 것을 더 알 수", "무엇을 더 알 수"]):
-            if any(k in q for k in ["후원", "상품", "아이템", "항목"]):
+        if not hits.isdisjoint(_MOD_KW_DETAIL):
+            if not hits.isdisjoint(_MOD_KW_PROFILE_TARGET):
                 modifiers["needs_profile"] = True
                 modifiers["force_dimensions"] = ["itemName", "itemCategory", "itemBrand", "itemVariant"]
 
         # 3.75 이벤트 클릭 항목 탐색 (e.g., gnb_click 어떤 항목 많이?)
         event_token = _extract_event_name_token(question)
-        click_terms = ["클릭", "눌", "tap", "click"]
 
         # 후원 클릭 명시 질의는 donation_click으로 정규화
-        if ("후원" in q and "클릭" in q) and not event_token:
+        if ("후원" in hits and "클릭" in hits) and not event_token:
             event_token = "donation_click"
 
-        if any(k in q for k in click_terms) and any(k in q for k in ["항목", "무엇", "뭐", "어떤", "많이", "상위"]):
+        if not hits.isdisjoint(_CLICK_TERMS) and not hits.isdisjoint(_MOD_KW_CLICK_TARGET):
             modifiers["needs_breakdown"] = True
             modifiers["needs_total"] = False
             modifiers["scope_hint"] = ["event"]
@@ -1958,7 +2114,7 @@ class ModifierExtractor:
                 modifiers["entity_field_hint"] = "linkText"
 
         # 클릭 발생량 질문은 eventCount + eventName 분해
-        if any(k in q for k in click_terms) and any(k in q for k in ["얼마나", "몇", "건수", "횟수", "일어났"]):
+        if not hits.isdisjoint(_CLICK_TERMS) and not hits.isdisjoint(_MOD_KW_CLICK_VOLUME):
             modifiers["needs_breakdown"] = True
             modifiers["needs_total"] = False
             modifiers["scope_hint"] = ["event"]
@@ -1971,7 +2127,7 @@ class ModifierExtractor:
                 modifiers["event_filter"] = event_token
 
         # 3.76 이벤트명 + 메뉴명(파라미터) 조회
-        if event_token and any(k in q for k in ["menu_name", "menu name", "메뉴명", "메뉴 네임", "메뉴이름"]):
+        if event_token and not hits.isdisjoint(_MOD_KW_MENU_NAME):
             modifiers["needs_breakdown"] = True
             modifiers["needs_total"] = False
             modifiers["scope_hint"] = ["event"]
@@ -1984,37 +2140,9 @@ class ModifierExtractor:
             modifiers["entity_field_hint"] = "customEvent:menu_name"
 
         # 3.77 파라미터명 직접 질의 시 해당 customEvent 차원을 최우선으로 고정
-        explicit_param_map = {
-            "menu_name": ["menu_name", "menu name", "메뉴명", "메뉴 네임", "메뉴이름"],
-            "button_name": ["button_name", "버튼명", "버튼 이름"],
-            "banner_name": ["banner_name", "배너명", "배너 이름"],
-            "click_button": ["click_button", "클릭버튼"],
-            "click_location": ["click_location", "클릭위치"],
-            "click_section": ["click_section", "클릭섹션"],
-            "click_text": ["click_text", "클릭텍스트", "클릭 문자열"],
-            "content_category": ["content_category", "콘텐츠카테고리"],
-            "content_name": ["content_name", "콘텐츠명", "콘텐츠이름"],
-            "content_type": ["content_type", "콘텐츠유형", "콘텐츠 타입"],
-            "country_name": ["country_name", "국가명"],
-            "detail_category": ["detail_category", "상세카테고리"],
-            "donation_name": ["donation_name", "후원명", "후원 이름"],
-            "event_category": ["event_category", "event category", "이벤트 카테고리"],
-            "event_label": ["event_label", "event label", "이벤트 라벨"],
-            "is_regular_donation": ["is_regular_donation", "정기후원여부"],
-            "letter_translation": ["letter_translation", "편지번역", "번역여부"],
-            "main_category": ["main_category", "메인카테고리"],
-            "payment_type": ["payment_type", "결제유형", "결제 타입"],
-            "percent_scrolled": ["percent_scrolled", "스크롤비율"],
-            "referrer_host": ["referrer_host", "리퍼러 호스트", "유입호스트"],
-            "referrer_pathname": ["referrer_pathname", "리퍼러 경로", "유입경로"],
-            "step": ["step", "스텝", "단계"],
-            "sub_category": ["sub_category", "서브카테고리"],
-            "domestic_children_count": ["domestic_children_count", "국내아동수"],
-            "overseas_children_count": ["overseas_children_count", "해외아동수"],
-        }
         selected_param = None
-        for param_name, aliases in explicit_param_map.items():
-            if any(a in q for a in aliases):
+        for param_name, aliases in _EXPLICIT_PARAM_ALIASES:
+            if not hits.isdisjoint(aliases):
                 selected_param = param_name
                 break
         if selected_param and not product_type_query:
@@ -2026,12 +2154,12 @@ class ModifierExtractor:
             modifiers["entity_field_hint"] = force_dim if force_dim in GA4_DIMENSIONS else "eventName"
             if event_token:
                 modifiers["event_filter"] = event_token
-            if selected_param in {"donation_name", "menu_name"} and any(k in q for k in ["묶어서", "묶어", "별", "기준"]):
+            if selected_param in {"donation_name", "menu_name"} and not hits.isdisjoint(_MOD_KW_GROUP_AXIS):
                 if force_dim in GA4_DIMENSIONS:
                     modifiers["force_dimensions"] = [force_dim]
 
         # 3.78 후원유형 클릭수는 donation_click 기준으로 분해
-        if any(k in q for k in ["후원유형", "후원 유형", "후원명"]) and any(k in q for k in ["클릭수", "클릭", "click"]) and not any(k in q for k in ["매출", "수익", "금액", "revenue"]):
+        if not hits.isdisjoint(_MOD_KW_DONATION_CLICK_TYPE) and not hits.isdisjoint(_MOD_KW_CLICK_COUNT) and hits.isdisjoint(_REVENUE_TOKENS):
             modifiers["needs_breakdown"] = True
             modifiers["needs_total"] = False
             modifiers["scope_hint"] = ["event"]
@@ -2043,7 +2171,7 @@ class ModifierExtractor:
             modifiers["event_filter"] = "donation_click"
             modifiers["entity_field_hint"] = "customEvent:donation_name"
 
-        if "donation" in q and any(k in q for k in ["클릭", "click"]):
+        if "donation" in hits and not hits.isdisjoint(_MOD_KW_CLICK):
             modifiers["needs_breakdown"] = True
             modifiers["needs_total"] = False
             modifiers["scope_hint"] = ["event"]
@@ -2052,7 +2180,7 @@ class ModifierExtractor:
             modifiers["entity_field_hint"] = "customEvent:donation_name"
 
         # "정기후원의 클릭수" 류 질의도 donation_click 기준으로 강제
-        if re.search(r"[가-힣A-Za-z0-9_]+후원", question) and any(k in q for k in ["클릭수", "클릭", "click"]) and not any(k in q for k in ["메뉴", "gnb", "lnb", "footer"]):
+        if _DONATION_ENTITY_RE.search(question) and not hits.isdisjoint(_MOD_KW_CLICK_COUNT) and hits.isdisjoint(_MOD_KW_MENU_AREA):
             modifiers["needs_breakdown"] = True
             modifiers["needs_total"] = False
             modifiers["scope_hint"] = ["event"]
@@ -2066,7 +2194,7 @@ class ModifierExtractor:
             modifiers["entity_field_hint"] = "customEvent:donation_name"
 
         # 3.78b 후원유형 매출은 purchase + 정기후원여부로 분해
-        if any(k in q for k in ["후원유형", "후원 유형"]) and any(k in q for k in ["매출", "수익", "금액", "revenue"]):
+        if not hits.isdisjoint(_MOD_KW_DONATION_TYPE) and not hits.isdisjoint(_REVENUE_TOKENS):
             modifiers["needs_breakdown"] = True
             modifiers["needs_total"] = False
             modifiers["scope_hint"] = ["event"]
@@ -2075,7 +2203,7 @@ class ModifierExtractor:
             modifiers["entity_field_hint"] = "customEvent:is_regular_donation"
 
         # 이벤트 종류/목록은 eventName 기준으로 강제
-        if any(k in q for k in ["이벤트 종류", "이벤트 목록", "무슨 이벤트", "어떤 이벤트"]):
+        if not hits.isdisjoint(_MOD_KW_EVENT_LIST):
             modifiers["needs_breakdown"] = True
             modifiers["needs_total"] = False
             modifiers["scope_hint"] = ["event"]
@@ -2084,16 +2212,16 @@ class ModifierExtractor:
             modifiers["entity_field_hint"] = "eventName"
 
         # 3.78c 일반 "유형" 후속 질문은 유형 차원 breakdown으로 유도
-        if any(k in q for k in ["유형", "타입", "종류"]) and not any(k in q for k in ["채널", "소스", "매체", "디바이스", "국가", "페이지"]) and "force_dimensions" not in modifiers:
+        if not hits.isdisjoint(_MOD_KW_TYPE) and hits.isdisjoint(_MOD_KW_TYPE_AXIS) and "force_dimensions" not in modifiers:
             modifiers["needs_breakdown"] = True
             modifiers["needs_total"] = False
             modifiers["scope_hint"] = ["event"]
-            if any(k in q for k in ["매출", "수익", "구매", "후원"]):
+            if not hits.isdisjoint(_MOD_KW_PURCHASE_REVENUE):
                 modifiers["event_filter"] = "purchase"
-            if any(k in q for k in ["후원 이름", "후원이름", "후원명", "donation_name", "이름"]) and "customEvent:donation_name" in GA4_DIMENSIONS:
+            if not hits.isdisjoint(_MOD_KW_DONATION_NAME_ANY) and "customEvent:donation_name" in GA4_DIMENSIONS:
                 modifiers["force_dimensions"] = ["customEvent:donation_name"]
                 modifiers["entity_field_hint"] = "customEvent:donation_name"
-            elif any(k in q for k in ["상품", "카테고리", "item"]) and "itemCategory" in GA4_DIMENSIONS:
+            elif not hits.isdisjoint(_MOD_KW_ITEM_TYPE) and "itemCategory" in GA4_DIMENSIONS:
                 modifiers["force_dimensions"] = ["itemCategory"]
                 modifiers["entity_field_hint"] = "itemCategory"
             elif "customEvent:donation_name" in GA4_DIMENSIONS:
@@ -2101,11 +2229,11 @@ class ModifierExtractor:
                 modifiers["entity_field_hint"] = "customEvent:donation_name"
 
         # 3.905 첫 후원자/첫 구매자 비율 질문은 비율 지표 중심
-        if any(k in q for k in ["첫", "최초", "처음", "신규"]) and any(k in q for k in ["후원자", "구매자"]) and any(k in q for k in ["퍼센트", "percent", "%", "비율", "율"]):
+        if not hits.isdisjoint(_MOD_KW_FIRST) and not hits.isdisjoint(_MOD_KW_BUYER) and not hits.isdisjoint(_MOD_KW_PERCENT):
             modifiers["force_metrics"] = ["firstTimePurchaserRate", "firstTimePurchasers", "totalPurchasers"]
 
         # 3.79 scroll 질의: 이벤트/퍼센트(페이지별이면 pagePath 포함)
-        if any(k in q for k in ["스크롤", "scroll"]):
+        if not hits.isdisjoint(_MOD_KW_SCROLL):
             modifiers["needs_breakdown"] = True
             modifiers["needs_total"] = False
             modifiers["scope_hint"] = ["event"]
@@ -2114,7 +2242,7 @@ class ModifierExtractor:
             for d in ["customEvent:percent_scrolled", "eventName"]:
                 if d in GA4_DIMENSIONS and d not in force_dims:
                     force_dims.append(d)
-            if any(k in q for k in ["페이지별", "페이지", "page"]):
+            if not hits.isdisjoint(_MOD_KW_PAGE):
                 for d in ["pagePath"]:
                     if d in GA4_DIMENSIONS and d not in force_dims:
                         force_dims.append(d)
@@ -2122,14 +2250,14 @@ class ModifierExtractor:
             modifiers["entity_field_hint"] = "customEvent:percent_scrolled"
 
         # 3.80 event token 정정 follow-up (예: donation_click말하는건데)
-        if event_token and any(k in q for k in ["말하는", "말한", "그거", "아니", "이벤트"]):
+        if event_token and not hits.isdisjoint(_MOD_KW_CORRECTION):
             modifiers["needs_breakdown"] = True
             modifiers["needs_total"] = False
             modifiers["scope_hint"] = ["event"]
             modifiers["event_filter"] = event_token
 
         # 3.81 purchase vs donation_click 동시 비교 (donation_name 기준)
-        if "donation_click" in q and any(k in q for k in ["purchase", "구매"]) and any(k in q for k in ["donation_name", "후원명", "name", "구분"]):
+        if "donation_click" in hits and not hits.isdisjoint(_MOD_KW_PURCHASE) and not hits.isdisjoint(_MOD_KW_DONATION_SPLIT):
             modifiers["needs_breakdown"] = True
             modifiers["needs_total"] = False
             modifiers["scope_hint"] = ["event"]
@@ -2142,20 +2270,12 @@ class ModifierExtractor:
             modifiers.pop("item_name_contains", None)
 
         # 3.8 purchase 커스텀 파라미터 조회
-        if (not modifiers.get("suppress_purchase_param_rule")) and any(k in q for k in ["purchase", "구매", "후원"]) and any(k in q for k in ["매개변수", "파라미터", "parameter"] + purchase_param_aliases):
+        if (not modifiers.get("suppress_purchase_param_rule")) and not hits.isdisjoint(_MOD_KW_PURCHASE_DONATION) and not hits.isdisjoint(_PURCHASE_PARAM_TERMS):
             modifiers["needs_breakdown"] = True
             modifiers["entity_field_hint"] = "eventName"
             modifiers["event_filter"] = "purchase"
             force_dims = modifiers.get("force_dimensions", [])
-            for d in [
-                "eventName",
-                "customEvent:is_regular_donation",
-                "customEvent:country_name",
-                "customEvent:domestic_children_count",
-                "customEvent:overseas_children_count",
-                "customEvent:letter_translation",
-                "customEvent:donation_name",
-            ]:
+            for d in _PURCHASE_PARAM_DIMS:
                 if d not in force_dims:
                     force_dims.append(d)
             modifiers["force_dimensions"] = force_dims
@@ -2165,7 +2285,7 @@ class ModifierExtractor:
             modifiers["scope_hint"] = scope_hint
 
         # 3.85 국가별 + 엔티티(프로그램/후원명) 질의는 country breakdown + donation_name 필터 우선
-        if any(k in q for k in ["국가별", "국가", "해외", "국내"]) and ("entity_contains" in modifiers or "item_name_contains" in modifiers):
+        if not hits.isdisjoint(_MOD_KW_COUNTRY) and ("entity_contains" in modifiers or "item_name_contains" in modifiers):
             modifiers["needs_breakdown"] = True
             modifiers["scope_hint"] = ["event"]
             force_dims = modifiers.get("force_dimensions", [])
@@ -2177,9 +2297,7 @@ class ModifierExtractor:
                 modifiers["entity_field_hint"] = "customEvent:donation_name"
 
         # 3.9 "어떤 후원 이름으로 매출" -> donation_name x purchaseRevenue
-        donation_name_tokens = ["후원 이름", "후원명", "donation_name"]
-        revenue_tokens = ["매출", "수익", "revenue", "금액"]
-        if (not modifiers.get("event_filters")) and any(k in q for k in donation_name_tokens) and any(k in q for k in revenue_tokens):
+        if (not modifiers.get("event_filters")) and not hits.isdisjoint(_DONATION_NAME_TOKENS) and not hits.isdisjoint(_REVENUE_TOKENS):
             modifiers["needs_breakdown"] = True
             modifiers["event_filter"] = "purchase"
             modifiers["force_dimensions"] = ["customEvent:donation_name"]
@@ -2190,10 +2308,10 @@ class ModifierExtractor:
             modifiers["scope_hint"] = scope_hint
 
         # 3.10 프로그램 명 질문은 donation_name 파라미터 우선
-        if any(k in q for k in ["프로그램", "노블클럽", "천원의 힘", "donation_name"]):
+        if not hits.isdisjoint(_MOD_KW_PROGRAM):
             modifiers["needs_breakdown"] = True
             # 매출/구매 맥락일 때만 purchase 필터를 건다.
-            if (not modifiers.get("event_filters")) and any(k in q for k in ["매출", "수익", "구매", "purchase", "얼마나", "몇", "후원했", "규모"]):
+            if (not modifiers.get("event_filters")) and not hits.isdisjoint(_MOD_KW_PROGRAM_PURCHASE):
                 modifiers["event_filter"] = "purchase"
             force_dims = modifiers.get("force_dimensions", [])
             for d in ["customEvent:donation_name"]:
@@ -2204,17 +2322,17 @@ class ModifierExtractor:
             modifiers["scope_hint"] = ["event"]
 
         # 3.10b 후원 이름/후원명 질문은 donation_name 축 강제
-        if any(k in q for k in ["후원 이름", "후원이름", "후원명", "donation_name"]):
+        if not hits.isdisjoint(_MOD_KW_DONATION_NAME):
             modifiers["needs_breakdown"] = True
             modifiers["needs_total"] = False
             modifiers["scope_hint"] = ["event"]
             modifiers["force_dimensions"] = ["customEvent:donation_name"]
             modifiers["entity_field_hint"] = "customEvent:donation_name"
-            if (not modifiers.get("event_filters")) and any(k in q for k in ["매출", "수익", "구매", "얼마나", "몇", "후원했"]):
+            if (not modifiers.get("event_filters")) and not hits.isdisjoint(_MOD_KW_DONATION_NAME_PURCHASE):
                 modifiers["event_filter"] = "purchase"
 
         # 3.11 후원 유형 전환율(클릭->구매) 질문
-        if any(k in q for k in ["후원 유형", "정기", "일시"]) and any(k in q for k in ["전환", "비율", "율"]) and any(k in q for k in ["클릭", "구매"]):
+        if not hits.isdisjoint(_MOD_KW_DONATION_KIND) and not hits.isdisjoint(_MOD_KW_CONVERSION) and not hits.isdisjoint(_MOD_KW_CLICK_OR_BUY):
             modifiers["needs_breakdown"] = True
             modifiers["scope_hint"] = ["event"]
             force_dims = modifiers.get("force_dimensions", [])
@@ -2226,9 +2344,9 @@ class ModifierExtractor:
         
         # 4. Scope hint
         scope_hints = []
-        if any(k in q for k in ["상품", "아이템", "제품", "item", "항목"]):
+        if not hits.isdisjoint(_MOD_KW_ITEM_SCOPE):
             scope_hints.append("item")
-        if any(k in q for k in ["사용자", "유저", "user"]):
+        if not hits.isdisjoint(_MOD_KW_USER_SCOPE):
             scope_hints.append("user")
         if scope_hints and "scope_hint" not in modifiers:
             modifiers["scope_hint"] = scope_hints
@@ -2238,7 +2356,7 @@ class ModifierExtractor:
             modifiers.pop("prefer_event_scope", None)
 
         # 국내/해외 비교는 항상 국가 기준으로 정규화
-        if "해외" in q and "국내" in q:
+        if domestic_overseas_case:
             modifiers["needs_breakdown"] = True
             modifiers["force_dimensions"] = ["country"]
             modifiers["scope_hint"] = ["event"]
@@ -2247,15 +2365,15 @@ class ModifierExtractor:
             modifiers.pop("item_name_contains", None)
         
         # 5. Order hint
-        if any(k in q for k in ["높은", "많은", "큰", "상위", "top"]):
+        if not hits.isdisjoint(_MOD_KW_ORDER_DESC):
             modifiers["order_hint"] = "desc"
-        elif any(k in q for k in ["낮은", "적은", "작은", "하위", "bottom"]):
+        elif not hits.isdisjoint(_MOD_KW_ORDER_ASC):
             modifiers["order_hint"] = "asc"
 
         # internal flag cleanup
         modifiers.pop("suppress_purchase_param_rule", None)
         
-        logging.info(f"[ModifierExtractor] Extracted: {modifiers}")
+        logging.info("[ModifierExtractor] Extracted: %s", modifiers)
         return modifiers
 
 
@@ -2264,39 +2382,37 @@ class ModifierExtractor:
 # =============================================================================
 
 def _is_drilldown_followup(question: str) -> bool:
-    q = (question or "").lower()
-    tokens = ["더 내려", "세분", "드릴다운", "상세", "깊게", "나눠서", "기준으로", "원인", "이유", "왜"]
-    dim_tokens = ["채널", "소스", "매체", "경로", "국가", "디바이스", "상품", "카테고리", "후원명", "donation_name"]
-    return any(t in q for t in tokens) or any(t in q for t in dim_tokens)
+    q = _lower_question(question or "")
+    return _DRILLDOWN_FOLLOWUP_RE.search(q) is not None
 
 
 def _infer_drilldown_dimension(question: str, last_state: Optional[Dict]) -> Optional[str]:
-    q = (question or "").lower()
-    if any(k in q for k in ["소스/매체", "source/medium"]):
+    q = _lower_question(question or "")
+    if _DRILL_SOURCE_MEDIUM_RE.search(q):
         return "sourceMedium"
-    if any(k in q for k in ["소스", "source"]):
+    if _DRILL_SOURCE_RE.search(q):
         return "source"
-    if any(k in q for k in ["매체", "medium", "경로", "유입"]):
+    if _DRILL_MEDIUM_RE.search(q):
         return "sourceMedium"
     if "채널" in q:
         return "defaultChannelGroup"
-    if any(k in q for k in ["캠페인", "campaign"]):
+    if _DRILL_CAMPAIGN_RE.search(q):
         for cand in ["campaignName", "sessionCampaignName", "firstUserCampaignName", "customEvent:campaign_name"]:
             if cand in GA4_DIMENSIONS:
                 return cand
         return "sourceMedium"
-    if any(k in q for k in ["국가", "country"]):
+    if _DRILL_COUNTRY_RE.search(q):
         return "country"
-    if any(k in q for k in ["디바이스", "기기", "device"]):
+    if _DRILL_DEVICE_RE.search(q):
         return "deviceCategory"
-    if any(k in q for k in ["상품", "카테고리"]):
+    if _DRILL_ITEM_RE.search(q):
         return "itemName"
-    if any(k in q for k in ["후원명", "donation_name"]):
+    if _DRILL_DONATION_NAME_RE.search(q):
         return "customEvent:donation_name"
     # 차원 미지정 드릴다운은 acquisition 계층(channel→source→source/medium→campaign)로 이동
     if last_state and isinstance(last_state.get("dimensions"), list) and last_state.get("dimensions"):
         prev_dim = (last_state["dimensions"][0] or {}).get("name")
-        if any(k in q for k in ["더 내려", "세분", "드릴다운", "상세", "깊게"]):
+        if _DRILL_DEEPER_RE.search(q):
             campaign_dim = None
             for cand in ["campaignName", "sessionCampaignName", "firstUserCampaignName", "customEvent:campaign_name"]:
                 if cand in GA4_DIMENSIONS:
@@ -2315,7 +2431,7 @@ def _infer_drilldown_dimension(question: str, last_state: Optional[Dict]) -> Opt
                     return hierarchy[idx + 1]
             if normalized_prev == "defaultChannelGroup":
                 return "source"
-            if normalized_prev in ["source", "sourceMedium"]:
+            if normalized_prev in ("source", "sourceMedium"):
                 return "sourceMedium"
     return None
 
@@ -2324,6 +2440,10 @@ def _infer_drilldown_dimension(question: str, last_state: Optional[Dict]) -> Opt
 # Main Orchestrator
 # =============================================================================
 
+# Metric/Dimension semantic 매칭 병렬 실행용 (요청마다 스레드를 만들지 않도록 모듈 단위로 유지)
+_EXTRACT_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="candidate-extract")
+
+
 class CandidateExtractor:
     """
     전체 후보 추출 오케스트레이터
@@ -2396,8 +2516,7 @@ class CandidateExtractor:
             metric_name = _resolve_metric_name(raw_metric)
             if not metric_name:
                 continue
-            meta = GA4_METRICS.get(metric_name, {})
-            scope = meta.get("scope") or MetricCandidateExtractor._infer_scope_from_category(meta.get("category"))
+            scope, priority, _, _ = _METRIC_META.get(metric_name, _UNKNOWN_METRIC_META)
             if metric_name in metric_index:
                 idx = metric_index[metric_name]
                 metric_candidates[idx]["score"] = max(metric_candidates[idx].get("score", 0), 0.92)
@@ -2408,7 +2527,7 @@ class CandidateExtractor:
                     "score": 0.92,
                     "matched_by": "local_llm",
                     "scope": scope,
-                    "priority": meta.get("priority", 0)
+                    "priority": priority
                 })
                 metric_index[metric_name] = len(metric_candidates) - 1
 
@@ -2417,8 +2536,7 @@ class CandidateExtractor:
             dim_name = _resolve_dimension_name(raw_dim)
             if not dim_name:
                 continue
-            meta = GA4_DIMENSIONS.get(dim_name, {})
-            scope = meta.get("scope") or DimensionCandidateExtractor._infer_scope_from_category(meta.get("category"))
+            scope, _, priority = _DIM_META.get(dim_name, _UNKNOWN_DIM_META)
             if dim_name in dim_index:
                 idx = dim_index[dim_name]
                 dimension_candidates[idx]["score"] = max(dimension_candidates[idx].get("score", 0), 0.90)
@@ -2429,7 +2547,7 @@ class CandidateExtractor:
                     "score": 0.90,
                     "matched_by": "local_llm",
                     "scope": scope,
-                    "priority": meta.get("priority", 0)
+                    "priority": priority
                 })
                 dim_index[dim_name] = len(dimension_candidates) - 1
 
@@ -2491,6 +2609,13 @@ class CandidateExtractor:
         """
         logging.info(f"[CandidateExtractor] Extracting from: {question}")
         
+        # semantic 매칭(임베딩/벡터 연산)이 있으면 Metric/Dimension 추출을 풀에서 동시에 돌리고
+        # 나머지 단계는 현재 스레드에서 진행한다. semantic이 없으면 스레드 전환 비용이 더 커서 순차 실행.
+        metric_future = dimension_future = None
+        if semantic:
+            metric_future = _EXTRACT_POOL.submit(MetricCandidateExtractor.extract, question, semantic)
+            dimension_future = _EXTRACT_POOL.submit(DimensionCandidateExtractor.extract, question, semantic)
+        
         # 1. Intent
         intent = IntentClassifier.classify(question)
         
@@ -2498,10 +2623,16 @@ class CandidateExtractor:
         date_range = DateParser.parse(question, last_state, date_context)
         
         # 3. Metrics
-        metric_candidates = MetricCandidateExtractor.extract(question, semantic)
+        if metric_future:
+            metric_candidates = metric_future.result()
+        else:
+            metric_candidates = MetricCandidateExtractor.extract(question, semantic)
         
         # 4. Dimensions
-        dimension_candidates = DimensionCandidateExtractor.extract(question, semantic)
+        if dimension_future:
+            dimension_candidates = dimension_future.result()
+        else:
+            dimension_candidates = DimensionCandidateExtractor.extract(question, semantic)
         
         # 5. Modifiers
         modifiers = ModifierExtractor.extract(question)
@@ -2528,7 +2659,7 @@ class CandidateExtractor:
                 intent = "breakdown"
 
             # 원인 분석은 현재 metric/dimension을 유지하고 분해만 추가
-            if any(k in question.lower() for k in ["원인", "이유", "왜", "해석"]):
+            if _CAUSE_RE.search(_lower_question(question)):
                 intent = "breakdown"
                 modifiers["cause_analysis_mode"] = True
                 if not dimension_candidates and isinstance(last_state.get("dimensions"), list):
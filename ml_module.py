@@ -227,21 +227,31 @@ def predict_command(question: str) -> Tuple[Optional[str], Optional[str]]:
 # Date Parsing (Korean-friendly rules, no spacy)
 # =============================================================================
 
+# 요청마다 re 모듈 캐시를 거치지 않도록 import 시 한 번만 컴파일
 _DATE_PATTERNS = [
-    (r'(\d{4})-(\d{2})-(\d{2})', "%Y-%m-%d"),
-    (r'(\d{4})/(\d{2})/(\d{2})', "%Y/%m/%d"),
-    (r'(\d{4})\.(\d{2})\.(\d{2})', "%Y.%m.%d"),
+    (re.compile(r'(\d{4})-(\d{2})-(\d{2})'), "%Y-%m-%d"),
+    (re.compile(r'(\d{4})/(\d{2})/(\d{2})'), "%Y/%m/%d"),
+    (re.compile(r'(\d{4})\.(\d{2})\.(\d{2})'), "%Y.%m.%d"),
 ]
 
+_DATE_RANGE_RE = re.compile(r"(\d{4}[-/.]\d{2}[-/.]\d{2})\s*(~|부터|to)\s*(\d{4}[-/.]\d{2}[-/.]\d{2})")
+
 _RELATIVE_N_DAYS = [
-    (r"지난\s*(\d+)\s*일", "days"),
-    (r"최근\s*(\d+)\s*일", "days"),
-    (r"(\d+)\s*일\s*전", "days_ago"),
-    (r"지난\s*(\d+)\s*주", "weeks"),
-    (r"최근\s*(\d+)\s*주", "weeks"),
-    (r"(\d+)\s*주\s*전", "weeks_ago"),
+    (re.compile(r"지난\s*(\d+)\s*일"), "days"),
+    (re.compile(r"최근\s*(\d+)\s*일"), "days"),
+    (re.compile(r"(\d+)\s*일\s*전"), "days_ago"),
+    (re.compile(r"지난\s*(\d+)\s*주"), "weeks"),
+    (re.compile(r"최근\s*(\d+)\s*주"), "weeks"),
+    (re.compile(r"(\d+)\s*주\s*전"), "weeks_ago"),
 ]
 
+_DIGIT_RE = re.compile(r"\d")
+
+_THIS_WEEK_PHRASES = ("이번 주", "이번주", "이번 주간", "이번주간")
+_LAST_WEEK_PHRASES = ("지난 주", "저번 주", "지난주", "저번주")
+_THIS_MONTH_PHRASES = ("이번 달", "이번달", "이달", "요번달")
+_LAST_MONTH_PHRASES = ("지난 달", "저번달", "지난달")
+
 
 def parse_dates(question: str, now: Optional[datetime] = None) -> Tuple[str, str]:
     """
@@ -257,10 +267,12 @@ def parse_dates(question: str, now: Optional[datetime] = None) -> Tuple[str, str
 
     q = _normalize_text(question)
     today = now.date()
+    # 명시 날짜 / 범위 / N일·주 / legacy 패턴은 모두 숫자가 있어야 걸리므로 숫자가 없으면 건너뜀
+    has_digit = _DIGIT_RE.search(q) is not None
 
     # 1) explicit date
-    for pattern, fmt in _DATE_PATTERNS:
-        match = re.search(pattern, q)
+    for pattern, fmt in (_DATE_PATTERNS if has_digit else ()):
+        match = pattern.search(q)
         if match:
             dt = datetime.strptime(match.group(0), fmt).date()
             start_date = dt.strftime("%Y-%m-%d")
@@ -268,7 +280,7 @@ def parse_dates(question: str, now: Optional[datetime] = None) -> Tuple[str, str
             return start_date, end_date
 
     # 2) "YYYY-MM-DD ~ YYYY-MM-DD" range (확장)
-    range_match = re.search(r"(\d{4}[-/.]\d{2}[-/.]\d{2})\s*(~|부터|to)\s*(\d{4}[-/.]\d{2}[-/.]\d{2})", q)
+    range_match = has_digit and _DATE_RANGE_RE.search(q)
     if range_match:
         left = range_match.group(1).replace(".", "-").replace("/", "-")
         right = range_match.group(3).replace(".", "-").replace("/", "-")
@@ -283,24 +295,24 @@ def parse_dates(question: str, now: Optional[datetime] = None) -> Tuple[str, str
             pass
 
     # 3) relative week/month keywords
-    if any(phrase in q for phrase in ["이번 주", "이번주", "이번 주간", "이번주간"]):
+    if any(phrase in q for phrase in _THIS_WEEK_PHRASES):
         start = (today - timedelta(days=today.weekday()))
         end = today
         return start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")
 
-    if any(phrase in q for phrase in ["지난 주", "저번 주", "지난주", "저번주"]):
+    if any(phrase in q for phrase in _LAST_WEEK_PHRASES):
         # 지난주 월~일
         this_week_start = (today - timedelta(days=today.weekday()))
         last_week_end = this_week_start - timedelta(days=1)
         last_week_start = last_week_end - timedelta(days=6)
         return last_week_start.strftime("%Y-%m-%d"), last_week_end.strftime("%Y-%m-%d")
 
-    if any(phrase in q for phrase in ["이번 달", "이번달", "이달", "요번달"]):
+    if any(phrase in q for phrase in _THIS_MONTH_PHRASES):
         start = today.replace(day=1)
         end = today
         return start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")
 
-    if any(phrase in q for phrase in ["지난 달", "저번달", "지난달"]):
+    if any(phrase in q for phrase in _LAST_MONTH_PHRASES):
         first_of_this_month = today.replace(day=1)
         last_month_last_day = first_of_this_month - timedelta(days=1)
         last_month_first_day = last_month_last_day.replace(day=1)
@@ -315,8 +327,8 @@ def parse_dates(question: str, now: Optional[datetime] = None) -> Tuple[str, str
         return d.strftime("%Y-%m-%d"), d.strftime("%Y-%m-%d")
 
     # 4) N days/weeks patterns
-    for pat, kind in _RELATIVE_N_DAYS:
-        m = re.search(pat, q)
+    for pat, kind in (_RELATIVE_N_DAYS if has_digit else ()):
+        m = pat.search(q)
         if not m:
             continue
         n = int(m.group(1))
@@ -62,7 +62,8 @@ logging.basicConfig(
 )
 logging.getLogger("werkzeug").setLevel(logging.INFO)
 
-UPLOAD_FOLDER = 'uploaded_files'
+# app.py의 _UPLOAD_DIR과 같은 위치 (작업 디렉터리와 무관하게 앱 디렉터리 기준)
+UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.getenv("UPLOAD_FOLDER", "uploaded_files"))
 
 from sqlalchemy import create_engine
 
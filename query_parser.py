@@ -4,6 +4,15 @@ from datetime import date, datetime, timedelta
 from ga4_metadata import GA4_METRICS, GA4_DIMENSIONS
 from ml_module import parse_dates
 
+# 지표 매칭용 소문자 용어 (key, ui_name, aliases) - 요청마다 GA4_METRICS 전체를 다시 소문자화하지 않도록 한 번만 생성
+_METRIC_MATCH_TERMS = tuple(
+    (m_key, m_key.lower(), m_info.get("ui_name", "").lower(), tuple(a.lower() for a in m_info.get("aliases", [])))
+    for m_key, m_info in GA4_METRICS.items()
+)
+
+# category_list 질의에서 이미 지정돼 있으면 기본 지표(eventCount)로 바꾸지 않는 지표
+_EVENT_FALLBACK_METRICS = frozenset({"eventCount", "totalUsers"})
+
 class DateParser:
     """Isolated logic for extracting start_date and end_date from natural language"""
     
@@ -237,6 +246,10 @@ class DimensionParser:
         return []
 
 
+_TREND_KWS = ("추이", "흐름", "일별", "변화", "trend", "daily")
+_COMPARISON_KWS = ("전주 대비", "비교", "차이", "증감", "compare", "vs")
+_BREAKDOWN_KWS = ("별", "기준", "따라", "by ")
+
 
 class IntentClassifier:
     """Classify the intent of the question (v9.0)"""
@@ -251,15 +264,15 @@ class IntentClassifier:
             return "category_list"
 
         # 2. Trend
-        if any(k in q for k in ["추이", "흐름", "일별", "변화", "trend", "daily"]):
+        if any(k in q for k in _TREND_KWS):
             return "trend"
 
         # 3. Comparison
-        if any(k in q for k in ["전주 대비", "비교", "차이", "증감", "compare", "vs"]):
+        if any(k in q for k in _COMPARISON_KWS):
             return "comparison"
 
         # 4. Breakdown (Dimension Force)
-        if any(k in q for k in ["별", "기준", "따라", "by "]):
+        if any(k in q for k in _BREAKDOWN_KWS):
             return "breakdown"
 
         # Default
@@ -312,22 +325,21 @@ class QueryParser:
         found_metrics = []
         q_lower = question.lower()
 
-        for m_key, m_info in GA4_METRICS.items():
+        for m_key, key_lower, ui_lower, aliases_lower in _METRIC_MATCH_TERMS:
 
             # 1. API key 매칭
-            if m_key.lower() in q_lower:
+            if key_lower in q_lower:
                 found_metrics.append(m_key)
                 continue
 
             # 2. UI 이름 매칭
-            ui_name = m_info.get("ui_name", "")
-            if ui_name and ui_name.lower() in q_lower:
+            if ui_lower and ui_lower in q_lower:
                 found_metrics.append(m_key)
                 continue
 
             # 3. alias 매칭
-            for alias in m_info.get("aliases", []):
-                if alias.lower() in q_lower:
+            for alias in aliases_lower:
+                if alias in q_lower:
                     found_metrics.append(m_key)
                     break
 
@@ -500,7 +512,7 @@ class QueryParser:
         # [Rule 1] Category List Intent -> Force Schema
         if intent == "category_list":
             delta["dimensions"] = [{"name": "eventName"}]
-            if not any(m["name"] in ["eventCount", "totalUsers"] for m in delta["metrics"]):
+            if not any(m["name"] in _EVENT_FALLBACK_METRICS for m in delta["metrics"]):
                  delta["metrics"] = [{"name": "eventCount"}] # Default
             # Remove date dimension (handled in engine, but here we explicitly don't add it)
             delta["is_trend_query"] = False 
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Regression checks for uploaded/preprocessed CSV parsing (app._read_csv).
+
+CSV 값이 파서 때문에 바뀌지 않는지 확인한다 (주문/거래 ID, 16진 문자열, 날짜 문자열 등).
+
+Usage:
+  python3 scripts/csv_read_regression.py
+"""
+
+import io
+import math
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from app import _read_csv
+
+
+def _read(text):
+    return _read_csv(io.BytesIO(text.encode("utf-8")))
+
+
+def run():
+    failures = []
+
+    # 1) int64 범위를 넘는 20자리 ID는 float로 손실되지 않고 원문 문자열 유지
+    try:
+        df = _read("order_id,amount\n99999999999999999999,1\n12345678901234567890,2\n")
+        assert df["order_id"].dtype == object, df["order_id"].dtype
+        assert df["order_id"].tolist() == ["99999999999999999999", "12345678901234567890"]
+    except Exception as e:
+        failures.append(f"[big_int_id] {e}")
+
+    # 2) 0x 접두 값은 16진수 정수로 해석하지 않고 문자열 유지
+    try:
+        df = _read("code\n0x10\n0x20\n")
+        assert df["code"].tolist() == ["0x10", "0x20"], df["code"].tolist()
+    except Exception as e:
+        failures.append(f"[hex_string] {e}")
+
+    # 3) 선행 + 부호 정수는 int64
+    try:
+        df = _read("delta\n+5\n+6\n")
+        assert str(df["delta"].dtype) == "int64", df["delta"].dtype
+        assert df["delta"].tolist() == [5, 6]
+    except Exception as e:
+        failures.append(f"[plus_sign_int] {e}")
+
+    # 4) ISO 날짜/시각은 파싱하지 않고 원문 문자열 유지 (filter_rows/JSON 출력 값 보존)
+    try:
+        df = _read("date,ts\n2024-01-01,2024-01-01 10:00:00\n2024-01-02,2024-01-02T11:00:00\n")
+        assert df["date"].tolist() == ["2024-01-01", "2024-01-02"], df["date"].tolist()
+        assert df["ts"].tolist() == ["2024-01-01 10:00:00", "2024-01-02T11:00:00"], df["ts"].tolist()
+        assert df["date"].astype(str).str.contains("2024-01-01", regex=False).tolist() == [True, False]
+    except Exception as e:
+        failures.append(f"[temporal_as_text] {e}")
+
+    # 5) 문자열 컬럼 결측은 None이 아니라 NaN ("None" 문자열로 필터되지 않도록)
+    try:
+        df = _read("name,val\na,1\n,2\n")
+        missing = df["name"].tolist()[1]
+        assert isinstance(missing, float) and math.isnan(missing), repr(missing)
+        assert df["name"].astype(str).tolist() == ["a", "nan"]
+    except Exception as e:
+        failures.append(f"[missing_as_nan] {e}")
+
+    if failures:
+        print("FAIL")
+        for f in failures:
+            print(f)
+        raise SystemExit(1)
+
+    print("PASS: csv read regression checks")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Round-trip checks for the edit_report TOON codec (app._toon_encode / app._toon_decode).
+
+Usage:
+  python3 scripts/toon_codec_regression.py
+"""
+
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from app import _toon_decode, _toon_encode
+
+
+def run():
+    failures = []
+
+    # 1) html 안의 쉼표/큰따옴표/줄바꿈이 인코딩 -> 디코딩 후 그대로 복원
+    try:
+        blocks = [
+            {"id": "b1", "html": "<p>매출, 사용자</p>"},
+            {"id": "b2", "html": '<div class="kpi">"총" 매출</div>'},
+            {"id": "b3", "html": "<ul>\n  <li>a, \"b\"</li>\n</ul>"},
+            {"id": "b4", "html": ""},
+        ]
+        decoded = _toon_decode(_toon_encode(blocks))
+        assert decoded == blocks, decoded
+    except Exception as e:
+        failures.append(f"[round_trip] {e}")
+
+    # 2) 숫자 id는 문자열로 디코딩 (edit_report는 병합 전에 id를 str로 정규화)
+    try:
+        decoded = _toon_decode(_toon_encode([{"id": 7, "html": "<p>x</p>"}]))
+        assert decoded == [{"id": "7", "html": "<p>x</p>"}], decoded
+    except Exception as e:
+        failures.append(f"[numeric_id] {e}")
+
+    # 3) 헤더 앞 공백/개행이 있어도 디코딩
+    try:
+        decoded = _toon_decode("\n  blocks[1]{id,html}:\nb1,<p>y</p>\n")
+        assert decoded == [{"id": "b1", "html": "<p>y</p>"}], decoded
+    except Exception as e:
+        failures.append(f"[leading_whitespace] {e}")
+
+    # 4) LLM이 html 쉼표를 인용하지 않아도 나머지 필드를 합쳐 복원
+    try:
+        decoded = _toon_decode("blocks[1]{id,html}:\nb1,<p>a, b</p>\n")
+        assert decoded == [{"id": "b1", "html": "<p>a, b</p>"}], decoded
+    except Exception as e:
+        failures.append(f"[unquoted_comma] {e}")
+
+    # 5) 헤더 없이 JSON 배열로 답한 경우 JSON으로 처리
+    try:
+        decoded = _toon_decode('[{"id": "b1", "html": "<p>a, \\"b\\"\\n</p>"}]')
+        assert decoded == [{"id": "b1", "html": '<p>a, "b"\n</p>'}], decoded
+    except Exception as e:
+        failures.append(f"[json_fallback] {e}")
+
+    # 6) 헤더도 JSON도 아니면 ValueError
+    try:
+        try:
+            _toon_decode("수정된 블록은 다음과 같습니다.")
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("expected ValueError")
+    except Exception as e:
+        failures.append(f"[invalid_output] {e}")
+
+    if failures:
+        print("FAIL")
+        for f in failures:
+            print(f)
+        raise SystemExit(1)
+
+    print("PASS: toon codec regression checks")
+
+
+if __name__ == "__main__":
+    run()